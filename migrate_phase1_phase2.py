@@ -12,6 +12,7 @@ Usage: python migrate_phase1_phase2.py
 
 import sqlite3
 import sys
+from contextlib import closing
 from pathlib import Path
 
 
@@ -25,34 +26,48 @@ def migrate_database(db_path: Path):
         print(f"Error: Database not found at {db_path}")
         sys.exit(1)
 
-    # Create backup
+    # Create backup (via the backup API so pages still in a WAL file are included)
     backup_path = db_path.parent / f"{db_path.name}.backup"
     print(f"Creating backup at: {backup_path}")
-    import shutil
-    shutil.copy2(db_path, backup_path)
+    with (
+        closing(sqlite3.connect(db_path)) as src,
+        closing(sqlite3.connect(backup_path)) as dst,
+    ):
+        src.backup(dst)
     print("✓ Backup created")
 
-    # Connect to database
-    conn = sqlite3.connect(db_path)
+    # Connect to database. isolation_level=None turns off the sqlite3 module's
+    # implicit transactions (which never cover DDL) so the whole migration can
+    # run in one explicit transaction.
+    conn = sqlite3.connect(db_path, isolation_level=None)
     cursor = conn.cursor()
 
+    # journal_mode can't be changed inside a transaction, so tune first
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")
+
     try:
         # Check if migrations already applied
         cursor.execute("PRAGMA table_info(documents)")
         columns = [row[1] for row in cursor.fetchall()]
 
-        if 'document_type' in columns:
+        if "document_type" in columns:
             print("✓ Migration already applied - document_type column exists")
             return
 
         print("\nApplying migrations...")
+        cursor.execute("BEGIN IMMEDIATE")
 
         # 1. Add document_type to documents table
         print("  1. Adding document_type column to documents table...")
         cursor.execute("""
             ALTER TABLE documents ADD COLUMN document_type TEXT
         """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_documents_document_type ON documents(document_type)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_documents_document_type ON documents(document_type)"
+        )
         print("     ✓ Added document_type column")
 
         # 2. Add family_name and family_side to people table
@@ -83,9 +98,15 @@ def migrate_database(db_path: Path):
                 FOREIGN KEY (document_id) REFERENCES documents(id) ON DELETE CASCADE
             )
         """)
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_person_documents_person_id ON person_documents(person_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_person_documents_document_id ON person_documents(document_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS ix_person_documents_link_type ON person_documents(link_type)")
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_person_documents_person_id ON person_documents(person_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_person_documents_document_id ON person_documents(document_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS ix_person_documents_link_type ON person_documents(link_type)"
+        )
         print("     ✓ Created person_documents table")
 
         # 4. Migrate existing source_document_id relationships to person_documents
@@ -100,13 +121,14 @@ def migrate_database(db_path: Path):
         print(f"     ✓ Migrated {migrated_count} existing relationships")
 
         # Commit changes
-        conn.commit()
+        cursor.execute("COMMIT")
         print("\n✅ Migration completed successfully!")
         print(f"\nBackup saved at: {backup_path}")
         print("You can delete the backup once you've verified everything works.")
 
     except Exception as e:
-        conn.rollback()
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
         print(f"\n❌ Migration failed: {e}")
         print(f"Database has been rolled back. Backup is at: {backup_path}")
         sys.exit(1)
@@ -1,28 +1,68 @@
 """Chat API endpoints for querying genealogy data."""
 
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
 from pathlib import Path
+from typing import Any
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from pydantic import SecretStr
 from quart import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import select
 
 from src.backend.genealogy_ai.config import settings
-from src.backend.genealogy_ai.storage.chroma import ChromaStore
 from src.backend.genealogy_ai.storage.sqlite import Document, GenealogyDatabase
+from src.backend.services.semantic_cache import get_semantic_cache
+from src.backend.services.stores import get_chroma_store, get_db
+
+logger = logging.getLogger(__name__)
 
 chat_bp = Blueprint("chat", __name__)
 
 
+def _sse(event: str, data: dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _lookup_document_ids(db: GenealogyDatabase, sources: set[str]) -> dict[str, int]:
+    """Map each source path to its first document ID in a single query.
+
+    Runs on a plain Core connection, which is returned to the pool before
+    the LLM is called; no ORM session or identity map is needed for two
+    scalar columns.
+    """
+    if not sources:
+        return {}
+
+    with db.engine.connect() as conn:
+        rows = conn.execute(
+            select(Document.id, Document.source)
+            .where(Document.source.in_(sources))
+            .order_by(Document.id)
+        ).all()
+
+    document_ids: dict[str, int] = {}
+    for document_id, source in rows:
+        document_ids.setdefault(source, document_id)
+    return document_ids
+
+
 @chat_bp.route("/api/chat", methods=["POST"])
 async def chat() -> Response | tuple[Response, int]:
     """Ask a question about the genealogy documents.
 
     Expects JSON body with:
         - question: The user's question
+        - stream: Optional; when true, respond with server-sent events instead
+          of JSON: "delta" events carry answer text as it is generated,
+          followed by one "sources" event (or an "error" event)
 
     Returns:
-        JSON response with answer and source citations
+        JSON response with answer and source citations, or an event stream
     """
     try:
         data = await request.get_json()
@@ -31,6 +71,7 @@ async def chat() -> Response | tuple[Response, int]:
             return jsonify({"error": "No question provided"}), 400
 
         question = data["question"]
+        stream = bool(data.get("stream"))
 
         if not question.strip():
             return jsonify({"error": "Question cannot be empty"}), 400
@@ -45,7 +86,22 @@ async def chat() -> Response | tuple[Response, int]:
                 }
             ), 400
 
-        chroma_store = ChromaStore(persist_directory=chroma_dir)
+        # Blocking store calls run in worker threads so the event loop keeps
+        # serving other requests; independent calls run concurrently
+        chroma_store = await asyncio.to_thread(get_chroma_store)
+
+        # Embed the question once, for both the answer cache and retrieval.
+        # Cached answers are dropped whenever the indexed chunks change.
+        query_embedding, index_generation = await asyncio.gather(
+            asyncio.to_thread(chroma_store.embeddings.embed_query, question),
+            asyncio.to_thread(chroma_store.generation),
+        )
+        answer_cache = get_semantic_cache()
+        cached = answer_cache.lookup(query_embedding, index_generation)
+        if cached is not None:
+            if stream:
+                return _event_stream(_replay_answer(cached))
+            return jsonify({"success": True, "question": question, **cached}), 200
 
         # Get API key
         try:
@@ -54,16 +110,18 @@ async def chat() -> Response | tuple[Response, int]:
         except ValueError as e:
             return jsonify({"error": f"OpenAI API key not configured: {e!s}"}), 500
 
-        # Retrieve relevant documents
-        retriever = chroma_store.vectorstore.as_retriever(search_kwargs={"k": 5})
-        relevant_docs = retriever.invoke(question)
+        # Retrieve relevant documents while the database is opened
+        relevant_docs, db = await asyncio.gather(
+            asyncio.to_thread(chroma_store.search_by_vector, query_embedding, k=5),
+            asyncio.to_thread(get_db),
+        )
 
         # Build context from retrieved documents
         context_parts = []
-        for i, doc in enumerate(relevant_docs, 1):
-            source = doc.metadata.get("source", "Unknown")
-            page = doc.metadata.get("page", "")
-            context_parts.append(f"[Source {i}: {source}, Page {page}]\n{doc.page_content}\n")
+        for i, (text, metadata, _) in enumerate(relevant_docs, 1):
+            source = metadata.get("source", "Unknown")
+            page = metadata.get("page", "")
+            context_parts.append(f"[Source {i}: {source}, Page {page}]\n{text}\n")
 
         context = "\n".join(context_parts)
 
@@ -92,56 +150,86 @@ Question: {question}
 Please answer the question based on the context provided above."""
         )
 
-        # Get answer
-        response = llm.invoke([system_message, user_message])
-
-        # Get database connection to look up document IDs
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
-
-        # Extract sources
-        sources = []
-        seen_sources = set()
-
-        for doc in relevant_docs:
-            source = doc.metadata.get("source", "Unknown")
-            page = doc.metadata.get("page", "")
-
-            # Create unique identifier for deduplication
-            source_id = f"{source}:{page}"
-
-            if source_id not in seen_sources:
-                seen_sources.add(source_id)
-
-                # Look up document ID from database
-                document_id = None
-                db_doc = session.query(Document).filter(Document.source == source).first()
-                if db_doc:
-                    document_id = db_doc.id
-
-                sources.append(
-                    {
-                        "source": source,
-                        "page": page,
-                        "document_id": document_id,
-                        "text_preview": doc.page_content[:200] + "..."
-                        if len(doc.page_content) > 200
-                        else doc.page_content,
-                    }
-                )
-
-        return jsonify(
-            {
-                "success": True,
-                "question": question,
-                "answer": response.content,
-                "sources": sources,
+        # Look up document IDs for all retrieved sources in one query
+        retrieved_sources = {metadata.get("source", "Unknown") for _, metadata, _ in relevant_docs}
+        document_ids = await asyncio.to_thread(_lookup_document_ids, db, retrieved_sources)
+
+        # Extract sources, keeping the first chunk seen for each source page
+        unique_sources: dict[tuple[str, Any], dict[str, Any]] = {}
+        for text, metadata, _ in relevant_docs:
+            source = metadata.get("source", "Unknown")
+            page = metadata.get("page", "")
+            if (source, page) in unique_sources:
+                continue
+            unique_sources[(source, page)] = {
+                "source": source,
+                "page": page,
+                "document_id": document_ids.get(source),
+                "text_preview": text[:200] + "..." if len(text) > 200 else text,
             }
-        ), 200
+        sources = list(unique_sources.values())
 
-    except Exception as e:
-        import traceback
+        messages = [system_message, user_message]
+
+        if stream:
+
+            def cache_answer(answer: dict[str, Any]) -> None:
+                answer_cache.add(query_embedding, answer, index_generation)
+
+            return _event_stream(_stream_answer(llm, messages, sources, cache_answer))
 
-        traceback.print_exc()
+        # Get answer
+        response = await llm.ainvoke(messages)
+
+        answer = {"answer": response.content, "sources": sources}
+        answer_cache.add(query_embedding, answer, index_generation)
+
+        return jsonify({"success": True, "question": question, **answer}), 200
+
+    except Exception as e:
+        logger.exception("Failed to process question")
         return jsonify({"error": f"Failed to process question: {e!s}"}), 500
+
+
+def _event_stream(events: AsyncIterator[str]) -> Response:
+    """Wrap an async iterator of formatted events in a streaming response."""
+    response = Response(events, mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.timeout = None  # Generation can outlast the default response timeout
+    return response
+
+
+async def _replay_answer(answer: dict[str, Any]) -> AsyncIterator[str]:
+    """Emit a cached answer in the same event format as a live one."""
+    yield _sse("delta", {"delta": answer["answer"]})
+    yield _sse("sources", {"sources": answer["sources"]})
+
+
+async def _stream_answer(
+    llm: ChatOpenAI,
+    messages: list[BaseMessage],
+    sources: list[dict[str, Any]],
+    on_complete: Callable[[dict[str, Any]], None],
+) -> AsyncIterator[str]:
+    """Stream the LLM's answer as it is generated, then the source citations.
+
+    Args:
+        llm: Chat model to stream from
+        messages: Prompt messages
+        sources: Source citations to send after the answer
+        on_complete: Called with the full answer payload once streaming finishes
+    """
+    parts: list[str] = []
+    try:
+        async for chunk in llm.astream(messages):
+            if chunk.content:
+                parts.append(str(chunk.content))
+                yield _sse("delta", {"delta": chunk.content})
+    except Exception as e:
+        logger.exception("Failed to process question")
+        yield _sse("error", {"error": f"Failed to process question: {e!s}"})
+        return
+
+    answer = {"answer": "".join(parts), "sources": sources}
+    on_complete(answer)
+    yield _sse("sources", {"sources": sources})
@@ -1,15 +1,87 @@
 """Document API endpoints."""
 
+import asyncio
+import hashlib
+import logging
+import os
+from collections.abc import AsyncIterator
 from pathlib import Path
+from typing import Any
 
+import orjson
 from quart import Blueprint, Response, current_app, jsonify, request, send_file
+from sqlalchemy import func, select
 
 from src.backend.genealogy_ai.ingestion.chunking import DocumentChunker, OCRResult
 from src.backend.genealogy_ai.storage.chroma import ChromaStore
 from src.backend.genealogy_ai.storage.sqlite import Document, GenealogyDatabase
+from src.backend.services.semantic_cache import get_semantic_cache
+from src.backend.services.stores import get_chroma_store, get_db
+
+logger = logging.getLogger(__name__)
 
 documents_bp = Blueprint("documents", __name__)
 
+# Pages fetched per round trip when streaming document details
+PAGE_STREAM_BATCH = 100
+
+
+def _normalized_text_hash(text: str) -> str:
+    """Hash OCR text with whitespace collapsed, to detect real edits."""
+    return hashlib.sha256(" ".join(text.split()).encode("utf-8")).hexdigest()
+
+
+async def _stream_pages(
+    db: GenealogyDatabase, details: dict[str, Any], source: str
+) -> AsyncIterator[bytes]:
+    """Yield document details, then each page's OCR text, as NDJSON lines.
+
+    Pages are fetched in batches from a worker thread so memory stays
+    bounded however long the document is.
+
+    Args:
+        db: Database to read pages from
+        details: Document details for the first line
+        source: Source path whose pages to stream
+    """
+    yield orjson.dumps(details) + b"\n"
+
+    with db.session_scope() as session:
+        result = session.execute(
+            select(Document.page, Document.ocr_text)
+            .where(Document.source == source)
+            .order_by(Document.page)
+            .execution_options(yield_per=PAGE_STREAM_BATCH)
+        )
+        while batch := await asyncio.to_thread(result.fetchmany, PAGE_STREAM_BATCH):
+            for page, ocr_text in batch:
+                yield orjson.dumps({"page": page, "ocr_text": ocr_text or ""}) + b"\n"
+
+
+def _reindex_pages(chroma_store: ChromaStore, source_path: Path, pages: dict[int, str]) -> None:
+    """Replace the vector store chunks for some pages of a document.
+
+    Args:
+        chroma_store: Vector store to update
+        source_path: Source document path
+        pages: New OCR text by page number
+    """
+    # Step 1: Delete old chunks for the changed pages
+    chroma_store.delete_by_source(source_path, pages=pages)
+
+    # Step 2: Re-chunk the updated text
+    ocr_results = [
+        OCRResult(source_path=source_path, page_number=page_num, text=text)
+        for page_num, text in pages.items()
+    ]
+
+    # Step 3: Create new chunks
+    chunker = DocumentChunker(chunk_size=1000, chunk_overlap=200)
+    chunks = chunker.chunk_ocr_results(ocr_results)
+
+    # Step 4: Add new chunks to vector database (embedded in bounded batches)
+    chroma_store.add_chunks(chunks)
+
 
 @documents_bp.route("/api/documents", methods=["GET"])
 async def list_documents() -> Response | tuple[Response, int]:
@@ -31,54 +103,64 @@ async def list_documents() -> Response | tuple[Response, int]:
                 }
             )
 
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
-
-        # Query all documents and group by source
-        all_docs = session.query(Document).order_by(Document.created_at.desc()).all()
-
-        # Group pages by source document
-        docs_by_source = {}
-        for doc in all_docs:
-            if doc.source not in docs_by_source:
-                # Extract filename from source path
-                source_path = Path(str(doc.source))
-                filename = source_path.name if source_path.name else str(source_path)
-
-                docs_by_source[doc.source] = {
-                    "source": doc.source,
-                    "filename": filename,
-                    "pages": [],
-                    "created_at": doc.created_at,
-                }
-            docs_by_source[doc.source]["pages"].append(doc.id)
+        db = get_db()
+
+        # Group pages by source document in SQL, without loading OCR text
+        latest_created_at = func.max(Document.created_at)
+        with db.session_scope() as session:
+            # Fingerprint the table with one cheap aggregate; the UI polls this
+            # endpoint, and unchanged lists are answered with 304 Not Modified
+            fingerprint = session.query(
+                func.count(Document.id), func.max(Document.id), latest_created_at
+            ).one()
+            etag = hashlib.blake2b(repr(tuple(fingerprint)).encode(), digest_size=16).hexdigest()
+            if etag in request.if_none_match:
+                not_modified = Response(status=304)
+                not_modified.set_etag(etag)
+                return not_modified
+
+            rows = (
+                session.query(
+                    Document.source,
+                    func.min(Document.id),
+                    func.count(Document.id),
+                    latest_created_at,
+                )
+                .group_by(Document.source)
+                .order_by(latest_created_at.desc())
+                .all()
+            )
 
         # Convert to list format
         documents_list = []
-        for pages_info in docs_by_source.values():
+        for source, first_page_id, page_count, created_at in rows:
+            # Extract filename from source path
+            source_path = Path(str(source))
+            filename = source_path.name if source_path.name else str(source_path)
+
             documents_list.append(
                 {
-                    "id": pages_info["pages"][0],  # Use first page ID as document ID
-                    "filename": pages_info["filename"] or "Unknown",
-                    "file_path": pages_info["source"],
-                    "page_count": len(pages_info["pages"]),
-                    "created_at": pages_info["created_at"],
+                    "id": first_page_id,  # Use first page ID as document ID
+                    "filename": filename or "Unknown",
+                    "file_path": source,
+                    "page_count": page_count,
+                    "created_at": created_at,
                 }
             )
 
-        return jsonify(
+        response = jsonify(
             {
                 "success": True,
                 "count": len(documents_list),
                 "documents": documents_list,
             }
         )
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"  # Always revalidate
+        return response
 
     except Exception as e:
-        # Log the error for debugging
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to fetch documents")
         return jsonify({"error": f"Failed to fetch documents: {e!s}"}), 500
 
 
@@ -98,22 +180,24 @@ async def get_document_file(document_id: int) -> Response | tuple[Response, int]
         if not db_path.exists():
             return jsonify({"error": "Database not found"}), 404
 
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
+        db = get_db()
 
-        # Get the document to find its source file path
-        document = session.query(Document).filter(Document.id == document_id).first()
+        # Get the document's source file path (the only column needed)
+        with db.session_scope() as session:
+            source = session.query(Document.source).filter(Document.id == document_id).scalar()
 
-        if not document:
+        if not source:
             return jsonify({"error": "Document not found"}), 404
 
-        file_path = Path(str(document.source))
+        file_path = Path(str(source))
 
-        # Security check: ensure file is within allowed directories
-        upload_folder = Path(current_app.config.get("UPLOAD_FOLDER", "./uploads"))
-        try:
-            file_path.resolve().relative_to(upload_folder.resolve())
-        except ValueError:
+        # Security check: ensure file is within allowed directories. The
+        # upload folder is resolved once at startup; only the file is resolved
+        # per request.
+        upload_folder = current_app.config.get("UPLOAD_FOLDER_RESOLVED") or os.path.realpath(
+            current_app.config.get("UPLOAD_FOLDER", "./uploads")
+        )
+        if not os.path.realpath(file_path).startswith(upload_folder + os.sep):
             # File is not in upload folder, reject
             return jsonify({"error": "File not found"}), 404
 
@@ -130,18 +214,19 @@ async def get_document_file(document_id: int) -> Response | tuple[Response, int]
         elif suffix == ".txt":
             mimetype = "text/plain"
 
-        # Send the file
+        # Send the file. conditional=True answers Range requests with partial
+        # content and revalidations with 304 Not Modified, so viewers paging
+        # through a large PDF or re-opening a scan don't refetch whole files.
         return await send_file(
             file_path,
             mimetype=mimetype,
             as_attachment=False,  # Display in browser if possible
             attachment_filename=file_path.name,
+            conditional=True,
         )
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to retrieve file")
         return jsonify({"error": f"Failed to retrieve file: {e!s}"}), 500
 
 
@@ -152,8 +237,14 @@ async def get_document_details(document_id: int) -> Response | tuple[Response, i
     Args:
         document_id: ID of the document
 
+    Query parameters:
+        - stream: Optional; when "1" or "true", respond with newline-delimited
+          JSON instead: one line of document details (without "pages"),
+          then one {"page", "ocr_text"} line per page
+
     Returns:
-        JSON response with document details including OCR text from all pages
+        JSON response with document details including OCR text from all pages,
+        or an NDJSON stream
     """
     try:
         db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
@@ -161,32 +252,64 @@ async def get_document_details(document_id: int) -> Response | tuple[Response, i
         if not db_path.exists():
             return jsonify({"error": "Database not found"}), 404
 
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
+        stream = request.args.get("stream", "").lower() in {"1", "true"}
+
+        db = get_db()
+        with db.session_scope() as session:
+            if stream:
+                # Find the source of the requested document, then count its
+                # pages; only the needed columns are loaded, not ORM objects
+                first_doc = (
+                    session.query(Document.source, Document.created_at)
+                    .filter(Document.id == document_id)
+                    .first()
+                )
 
-        # Get all documents with the same source as the requested document
-        first_doc = session.query(Document).filter(Document.id == document_id).first()
+                if not first_doc:
+                    return jsonify({"error": "Document not found"}), 404
 
-        if not first_doc:
+                page_count = (
+                    session.query(func.count(Document.id))
+                    .filter(Document.source == first_doc.source)
+                    .scalar()
+                )
+                details = {
+                    "success": True,
+                    "document_id": document_id,
+                    "filename": Path(str(first_doc.source)).name,
+                    "source": first_doc.source,
+                    "page_count": page_count,
+                    "created_at": first_doc.created_at,
+                }
+                response = Response(
+                    _stream_pages(db, details, str(first_doc.source)),
+                    mimetype="application/x-ndjson",
+                )
+                response.timeout = None  # Long documents can outlast the default timeout
+                return response
+
+            # Fetch every page sharing the requested document's source in one
+            # round trip, resolving the source with a subquery
+            source = select(Document.source).where(Document.id == document_id).scalar_subquery()
+            all_pages = session.execute(
+                select(
+                    Document.id,
+                    Document.page,
+                    Document.ocr_text,
+                    Document.source,
+                    Document.created_at,
+                )
+                .where(Document.source == source)
+                .order_by(Document.page)
+            ).all()
+
+        if not all_pages:
             return jsonify({"error": "Document not found"}), 404
 
-        # Get all pages for this document
-        all_pages = (
-            session.query(Document)
-            .filter(Document.source == first_doc.source)
-            .order_by(Document.page)
-            .all()
-        )
+        first_doc = next(row for row in all_pages if row.id == document_id)
 
         # Build response with all pages
-        pages_data = []
-        for doc in all_pages:
-            pages_data.append(
-                {
-                    "page": doc.page,
-                    "ocr_text": doc.ocr_text or "",
-                }
-            )
+        pages_data = [{"page": row.page, "ocr_text": row.ocr_text or ""} for row in all_pages]
 
         return jsonify(
             {
@@ -201,9 +324,7 @@ async def get_document_details(document_id: int) -> Response | tuple[Response, i
         )
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to retrieve document details")
         return jsonify({"error": f"Failed to retrieve document details: {e!s}"}), 500
 
 
@@ -236,82 +357,64 @@ async def update_document_text(document_id: int) -> Response | tuple[Response, i
         if not db_path.exists():
             return jsonify({"error": "Database not found"}), 404
 
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
-
-        # Get the first document to find the source
-        first_doc = session.query(Document).filter(Document.id == document_id).first()
-
-        if not first_doc:
-            return jsonify({"error": "Document not found"}), 404
-
-        source_path = str(first_doc.source)
-
-        # Get all documents for this source
-        all_docs = (
-            session.query(Document)
-            .filter(Document.source == source_path)
-            .order_by(Document.page)
-            .all()
-        )
-
-        # Create a mapping of page number to document
-        doc_by_page = {doc.page: doc for doc in all_docs}
-
-        # Update each page in the database
-        updated_pages = []
-        for page_data in pages_data:
-            page_num = page_data.get("page")
-            new_text = page_data.get("ocr_text", "")
-
-            if page_num in doc_by_page:
-                doc = doc_by_page[page_num]
-                doc.ocr_text = new_text
-                updated_pages.append(doc)
-
-        # Commit changes to database
-        session.commit()
-
-        # Now update vector embeddings
-        # Step 1: Delete old chunks for this document from ChromaDB
-        chroma_dir = Path(current_app.config.get("CHROMA_DIR", "./chroma_db"))
-
-        if chroma_dir.exists():
-            chroma_store = ChromaStore(persist_directory=chroma_dir)
-
-            # Delete old chunks for this source
-            chroma_store.delete_by_source(Path(source_path))
-
-            # Step 2: Re-chunk the updated text
-            ocr_results = []
-            for doc in updated_pages:
-                ocr_results.append(
-                    OCRResult(
-                        source_path=Path(str(doc.source)),
-                        page_number=doc.page,
-                        text=doc.ocr_text or "",
+        db = get_db()
+        with db.session_scope() as session:
+            # Get the first document to find the source
+            source_path = session.scalar(select(Document.source).where(Document.id == document_id))
+
+            if source_path is None:
+                return jsonify({"error": "Document not found"}), 404
+
+            # Map page number to (document ID, current text) for this source;
+            # only the columns are loaded, no ORM instances are tracked
+            doc_by_page = {
+                page: (doc_id, ocr_text)
+                for doc_id, page, ocr_text in session.execute(
+                    select(Document.id, Document.page, Document.ocr_text).where(
+                        Document.source == source_path
                     )
                 )
+            }
 
-            # Step 3: Create new chunks
-            chunker = DocumentChunker(chunk_size=1000, chunk_overlap=200)
-            chunks = chunker.chunk_ocr_results(ocr_results)
+            # Collect the new text for each page, noting which pages' text
+            # really changed (ignoring whitespace) so only those are re-embedded
+            mappings = []
+            changed_pages: dict[int, str] = {}
+            for page_data in pages_data:
+                page_num = page_data.get("page")
+                new_text = page_data.get("ocr_text", "")
+
+                if page_num in doc_by_page:
+                    doc_id, old_text = doc_by_page[page_num]
+                    if _normalized_text_hash(old_text or "") != _normalized_text_hash(new_text):
+                        changed_pages[page_num] = new_text
+                    mappings.append({"id": doc_id, "ocr_text": new_text})
+
+            # Write all pages with a single executemany UPDATE (committed when
+            # the session scope exits)
+            session.bulk_update_mappings(Document, mappings)  # type: ignore[arg-type]
+
+        # Now update vector embeddings for the changed pages
+        chroma_dir = Path(current_app.config.get("CHROMA_DIR", "./chroma_db"))
 
-            # Step 4: Add new chunks to vector database
-            chroma_store.add_chunks(chunks)
+        if chroma_dir.exists() and changed_pages:
+            # Chunking and embedding are slow and blocking, so run them in a
+            # worker thread to keep the event loop serving other requests
+            chroma_store = await asyncio.to_thread(get_chroma_store)
+            await asyncio.to_thread(_reindex_pages, chroma_store, Path(source_path), changed_pages)
+            get_semantic_cache().clear()
 
         return jsonify(
             {
                 "success": True,
                 "message": "Document text updated and vector embeddings regenerated",
-                "pages_updated": len(updated_pages),
+                "pages_updated": len(mappings),
+                "pages_reembedded": len(changed_pages),
             }
         )
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to update document text")
         return jsonify({"error": f"Failed to update document text: {e!s}"}), 500
 
 
@@ -337,8 +440,7 @@ async def set_document_type(document_id: int) -> Response | tuple[Response, int]
         if not document_type:
             return jsonify({"error": "document_type is required"}), 400
 
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
+        db = get_db()
 
         db.update_document_type(document_id=document_id, document_type=document_type)
 
@@ -352,9 +454,7 @@ async def set_document_type(document_id: int) -> Response | tuple[Response, int]
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to set document type")
         return jsonify({"error": f"Failed to set document type: {e!s}"}), 500
 
 
@@ -374,8 +474,7 @@ async def get_document_people(document_id: int) -> Response | tuple[Response, in
     try:
         link_type = request.args.get("link_type", type=str)
 
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
+        db = get_db()
 
         people = db.get_document_people(document_id=document_id, link_type=link_type)
 
@@ -401,7 +500,5 @@ async def get_document_people(document_id: int) -> Response | tuple[Response, in
         ), 200
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to get document people")
         return jsonify({"error": f"Failed to get document people: {e!s}"}), 500
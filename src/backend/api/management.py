@@ -1,15 +1,29 @@
 """Management API endpoints for database operations."""
 
+import asyncio
+import logging
 from pathlib import Path
 
 from quart import Blueprint, Response, current_app, jsonify
 
-from src.backend.genealogy_ai.storage.chroma import ChromaStore
-from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+from src.backend.genealogy_ai.storage.sqlite import Document
+from src.backend.services.semantic_cache import get_semantic_cache
+from src.backend.services.stores import bump_tree_version, get_chroma_store, get_db
+
+logger = logging.getLogger(__name__)
 
 management_bp = Blueprint("management", __name__)
 
 
+def _delete_vectors(source_path: Path) -> None:
+    """Delete a document's chunks from ChromaDB, logging rather than raising."""
+    try:
+        get_chroma_store().delete_by_source(source_path)
+    except Exception as e:
+        # Log but don't fail if ChromaDB deletion fails
+        logger.warning("Failed to delete %s from ChromaDB: %s", source_path, e)
+
+
 @management_bp.route("/api/documents/<int:document_id>", methods=["DELETE"])
 async def delete_document(document_id: int) -> Response | tuple[Response, int]:
     """Delete a specific document and all its extracted data.
@@ -21,33 +35,22 @@ async def delete_document(document_id: int) -> Response | tuple[Response, int]:
         JSON response with success status
     """
     try:
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-
-        # Get document info before deleting
-        session = db.get_session()
-        try:
-            from src.backend.genealogy_ai.storage.sqlite import Document
-
-            doc = session.query(Document).filter(Document.id == document_id).first()
-            if not doc:
-                return jsonify({"error": "Document not found"}), 404
-
-            source_path = str(doc.source)
-        finally:
-            session.close()
-
-        # Delete from SQLite
-        db.delete_document(document_id)
-
-        # Delete from ChromaDB
-        try:
-            chroma_dir = Path(current_app.config.get("CHROMA_DIR", "./chroma_db"))
-            chroma_store = ChromaStore(persist_directory=chroma_dir)
-            chroma_store.delete_by_source(Path(source_path))
-        except Exception as e:
-            # Log but don't fail if ChromaDB deletion fails
-            print(f"Warning: Failed to delete from ChromaDB: {e}")
+        db = get_db()
+
+        # Get the document's source before deleting
+        with db.session_scope() as session:
+            source_path = session.query(Document.source).filter(Document.id == document_id).scalar()
+
+        if source_path is None:
+            return jsonify({"error": "Document not found"}), 404
+
+        # Delete from SQLite (one transaction) and ChromaDB concurrently
+        await asyncio.gather(
+            asyncio.to_thread(db.delete_document, document_id),
+            asyncio.to_thread(_delete_vectors, Path(str(source_path))),
+        )
+        bump_tree_version()
+        get_semantic_cache().clear()
 
         return jsonify(
             {
@@ -57,9 +60,7 @@ async def delete_document(document_id: int) -> Response | tuple[Response, int]:
         ), 200
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to delete document")
         return jsonify({"error": f"Failed to delete document: {e!s}"}), 500
 
 
@@ -74,14 +75,16 @@ async def reset_database() -> Response | tuple[Response, int]:
     """
     try:
         # Reset SQLite
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-        db.reset_database()
+        db = await asyncio.to_thread(get_db)
+        await asyncio.to_thread(db.reset_database)
+        bump_tree_version()
 
         # Reset ChromaDB
-        chroma_dir = Path(current_app.config.get("CHROMA_DIR", "./chroma_db"))
-        chroma_store = ChromaStore(persist_directory=chroma_dir)
-        chroma_store.reset()
+        # Reset through the shared store so its cached collection handle is
+        # replaced along with the collection (creating it loads the model)
+        chroma_store = await asyncio.to_thread(get_chroma_store)
+        await asyncio.to_thread(chroma_store.reset)
+        get_semantic_cache().clear()
 
         return jsonify(
             {
@@ -91,9 +94,7 @@ async def reset_database() -> Response | tuple[Response, int]:
         ), 200
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to reset database")
         return jsonify({"error": f"Failed to reset database: {e!s}"}), 500
 
 
@@ -1,15 +1,258 @@
 """Family tree API endpoints."""
 
-from pathlib import Path
+import asyncio
+import logging
+from functools import lru_cache
+from types import SimpleNamespace
 from typing import cast
 
 from quart import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import Integer, Subquery, and_, case, func, select, union_all
+from sqlalchemy import cast as sql_cast
+from sqlalchemy.orm import Load, raiseload, selectinload
 
 from src.backend.genealogy_ai.storage.sqlite import Event, GenealogyDatabase, Person, Relationship
+from src.backend.services.stores import bump_tree_version, get_db, get_tree_version
+
+logger = logging.getLogger(__name__)
 
 tree_bp = Blueprint("tree", __name__)
 
 
+def _with_events(*event_types: str) -> Load:
+    """Query option that eager-loads people's events of the given types.
+
+    The events are fetched with one extra SELECT for all people in the
+    result, instead of one query per person.
+    """
+    return selectinload(Person.events.and_(Event.event_type.in_(event_types)))
+
+
+# Any relationship not eager-loaded raises on access instead of issuing one
+# query per row, so serialization loops can't silently regress to N+1
+_NO_LAZY_LOADS = raiseload("*")
+
+
+# Stands in for a missing event, so lookups need no None checks
+_NO_EVENT = SimpleNamespace(date=None, place=None)
+
+
+def _first_event_rows(event_type: str) -> Subquery:
+    """Subquery of each person's events of one type, numbered by ID.
+
+    Join on ``position == 1`` to get every person's first event of that type
+    in the same statement as the people themselves.
+    """
+    return (
+        select(
+            Event.person_id,
+            Event.date,
+            Event.place,
+            func.row_number()
+            .over(partition_by=Event.person_id, order_by=Event.id)
+            .label("position"),
+        )
+        .where(Event.event_type == event_type)
+        .subquery()
+    )
+
+
+async def _tree_data_version(db: GenealogyDatabase) -> tuple[object, ...]:
+    """Return the cache key for the current family tree data.
+
+    The database fingerprint changes with inserts and deletes from any
+    process (the CLI, other server workers); the local version covers this
+    process's in-place updates, which the fingerprint can't see.
+
+    Args:
+        db: Database the tree is read from
+
+    Returns:
+        Database fingerprint and local tree version
+    """
+    fingerprint = await asyncio.to_thread(db.tree_fingerprint)
+    return fingerprint, get_tree_version()
+
+
+def _first_events(person: Person) -> dict[str, Event]:
+    """Map each loaded event type to the person's first (lowest ID) event."""
+    first: dict[str, Event] = {}
+    for event in sorted(person.events, key=lambda e: e.id):
+        first.setdefault(cast(str, event.event_type), event)
+    return first
+
+
+@lru_cache(maxsize=8)
+def _full_tree_json(
+    db: GenealogyDatabase,
+    version: tuple[object, ...],
+    family_name: str | None,
+    family_side: str | None,
+) -> bytes:
+    """Build the serialized response body for the whole family tree.
+
+    The initial tree render asks for everyone, so this path skips the ORM:
+    people come back as flat rows with their first birth and death events
+    joined in, and relationships as plain column tuples. Cached per data
+    version like ``_tree_json``.
+
+    Args:
+        db: Database to read from
+        version: Tree data version (see ``_tree_data_version``); only part of
+            the cache key
+        family_name: Optional family name filter
+        family_side: Optional family side filter
+
+    Returns:
+        JSON body
+    """
+    birth = _first_event_rows("birth")
+    death = _first_event_rows("death")
+    people_query = (
+        select(
+            Person.id,
+            Person.primary_name.label("name"),
+            birth.c.date.label("birth_date"),
+            birth.c.place.label("birth_place"),
+            death.c.date.label("death_date"),
+            death.c.place.label("death_place"),
+            Person.family_name,
+            Person.family_side,
+        )
+        .outerjoin(birth, and_(birth.c.person_id == Person.id, birth.c.position == 1))
+        .outerjoin(death, and_(death.c.person_id == Person.id, death.c.position == 1))
+        .order_by(Person.id)
+    )
+    if family_name:
+        people_query = people_query.where(Person.family_name == family_name)
+    if family_side:
+        people_query = people_query.where(Person.family_side == family_side)
+
+    relationships_query = select(
+        Relationship.id,
+        Relationship.source_person_id.label("source_id"),
+        Relationship.target_person_id.label("target_id"),
+        Relationship.relationship_type.label("type"),
+    ).order_by(Relationship.id)
+
+    with db.session_scope() as session:
+        people_data = [dict(row) for row in session.execute(people_query).mappings()]
+        relationships_data = [dict(row) for row in session.execute(relationships_query).mappings()]
+
+    return current_app.json.dumps(
+        {
+            "success": True,
+            "people": people_data,
+            "relationships": relationships_data,
+        }
+    ).encode()
+
+
+@lru_cache(maxsize=32)
+def _tree_json(
+    db: GenealogyDatabase,
+    version: tuple[object, ...],
+    person_id: int,
+    family_name: str | None,
+    family_side: str | None,
+) -> bytes | None:
+    """Build the serialized tree response body around one person.
+
+    Cached per data version, so repeated requests for an unchanged tree skip
+    both the queries and the JSON encoding.
+
+    Args:
+        db: Database to read from
+        version: Tree data version (see ``_tree_data_version``); only part of
+            the cache key
+        person_id: Person to focus on, with their immediate family
+        family_name: Optional family name filter
+        family_side: Optional family side filter
+
+    Returns:
+        JSON body, or None if the focus person does not exist
+    """
+    with db.session_scope() as session:
+        # Build base query with optional family filters, loading birth and
+        # death events along with the people
+        query = session.query(Person).options(_with_events("birth", "death"), _NO_LAZY_LOADS)
+
+        if family_name:
+            query = query.filter(Person.family_name == family_name)
+
+        if family_side:
+            query = query.filter(Person.family_side == family_side)
+
+        # Get their immediate family (parents, children, spouses)
+        person_ids = {person_id}
+
+        # Get relationships for this person. Each side is matched by its
+        # own indexed lookup; an OR across both columns can't use them.
+        rel_ids = union_all(
+            select(Relationship.id).where(Relationship.source_person_id == person_id),
+            select(Relationship.id).where(
+                Relationship.target_person_id == person_id,
+                Relationship.source_person_id != person_id,
+            ),
+        )
+        # Outer-joined from the person, so the same statement checks they
+        # exist: no rows means no person, a lone None means no relationships
+        rel_rows = (
+            session.query(Relationship)
+            .select_from(Person)
+            .outerjoin(Relationship, Relationship.id.in_(rel_ids))
+            .options(_NO_LAZY_LOADS)
+            .filter(Person.id == person_id)
+            .all()
+        )
+        if not rel_rows:
+            return None
+        rels = [rel for rel in rel_rows if rel is not None]
+
+        for rel in rels:
+            person_ids.add(cast(int, rel.source_person_id))
+            person_ids.add(cast(int, rel.target_person_id))
+
+        people = query.filter(Person.id.in_(person_ids)).all()
+
+        # Build people data from each person's first birth and death events
+        life_events = [
+            (events.get("birth", _NO_EVENT), events.get("death", _NO_EVENT))
+            for events in map(_first_events, people)
+        ]
+        people_data = [
+            {
+                "id": person.id,
+                "name": person.primary_name,
+                "birth_date": birth.date,
+                "birth_place": birth.place,
+                "death_date": death.date,
+                "death_place": death.place,
+                "family_name": person.family_name,
+                "family_side": person.family_side,
+            }
+            for person, (birth, death) in zip(people, life_events, strict=True)
+        ]
+
+        relationships_data = [
+            {
+                "id": rel.id,
+                "source_id": rel.source_person_id,
+                "target_id": rel.target_person_id,
+                "type": rel.relationship_type,
+            }
+            for rel in rels
+        ]
+
+        return current_app.json.dumps(
+            {
+                "success": True,
+                "people": people_data,
+                "relationships": relationships_data,
+            }
+        ).encode()
+
+
 @tree_bp.route("/api/tree", methods=["GET"])
 async def get_tree() -> Response | tuple[Response, int]:
     """Get family tree data (all people and relationships).
@@ -23,114 +266,83 @@ async def get_tree() -> Response | tuple[Response, int]:
         JSON with people and relationships
     """
     try:
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
-
         person_id = request.args.get("person_id", type=int)
         family_name = request.args.get("family_name", type=str)
         family_side = request.args.get("family_side", type=str)
 
-        try:
-            # Build base query with optional family filters
-            query = session.query(Person)
-
-            if family_name:
-                query = query.filter(Person.family_name == family_name)
-
-            if family_side:
-                query = query.filter(Person.family_side == family_side)
-
-            # Get all people or specific person's family
-            if person_id:
-                # Get specific person
-                person = session.query(Person).filter(Person.id == person_id).first()
-                if not person:
-                    return jsonify({"error": "Person not found"}), 404
-
-                # Get their immediate family (parents, children, spouses)
-                person_ids = {person_id}
-
-                # Get relationships for this person
-                rels = (
-                    session.query(Relationship)
-                    .filter(
-                        (Relationship.source_person_id == person_id)
-                        | (Relationship.target_person_id == person_id)
-                    )
-                    .all()
-                )
-
-                for rel in rels:
-                    person_ids.add(cast(int, rel.source_person_id))
-                    person_ids.add(cast(int, rel.target_person_id))
-
-                people = query.filter(Person.id.in_(person_ids)).all()
-            else:
-                # Get all people (with optional family filter)
-                people = query.all()
-
-            # Build people data
-            people_data = []
-            for person in people:
-                # Get events
-                birth_event = (
-                    session.query(Event)
-                    .filter(Event.person_id == person.id, Event.event_type == "birth")
-                    .first()
-                )
-
-                death_event = (
-                    session.query(Event)
-                    .filter(Event.person_id == person.id, Event.event_type == "death")
-                    .first()
-                )
-
-                person_data = {
-                    "id": person.id,
-                    "name": person.primary_name,
-                    "birth_date": birth_event.date if birth_event else None,
-                    "birth_place": birth_event.place if birth_event else None,
-                    "death_date": death_event.date if death_event else None,
-                    "death_place": death_event.place if death_event else None,
-                    "family_name": person.family_name,
-                    "family_side": person.family_side,
-                }
-
-                people_data.append(person_data)
-
-            # Get relationships
-            relationships = rels if person_id else session.query(Relationship).all()
-
-            relationships_data = []
-            for rel in relationships:
-                relationships_data.append(
-                    {
-                        "id": rel.id,
-                        "source_id": rel.source_person_id,
-                        "target_id": rel.target_person_id,
-                        "type": rel.relationship_type,
-                    }
-                )
-
-            return jsonify(
-                {
-                    "success": True,
-                    "people": people_data,
-                    "relationships": relationships_data,
-                }
-            ), 200
+        # Building a response scans whole tables, so keep it off the event loop
+        db = await asyncio.to_thread(get_db)
+        version = await _tree_data_version(db)
+        if not person_id:
+            body = await asyncio.to_thread(_full_tree_json, db, version, family_name, family_side)
+        else:
+            body = await asyncio.to_thread(
+                _tree_json, db, version, person_id, family_name, family_side
+            )
+        if body is None:
+            return jsonify({"error": "Person not found"}), 404
 
-        finally:
-            session.close()
+        return Response(body, status=200, mimetype="application/json")
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to get tree data")
         return jsonify({"error": f"Failed to get tree data: {e!s}"}), 500
 
 
+@lru_cache(maxsize=4)
+def _people_json(db: GenealogyDatabase, version: tuple[object, ...]) -> bytes:
+    """Build the serialized people list response body, cached per data version.
+
+    Args:
+        db: Database to read from
+        version: Tree data version (see ``_tree_data_version``); only part of
+            the cache key
+
+    Returns:
+        JSON body
+    """
+    with db.session_scope() as session:
+        # Each person's first (lowest ID) birth event, joined in once rather
+        # than looked up per person
+        first_birth = _first_event_rows("birth")
+
+        # Year part of the date (the text before the first "-", so "YYYY" and
+        # "YYYY-MM-DD" both work); only an all-digit (ASCII) year counts
+        dash = func.instr(first_birth.c.date, "-")
+        year_part = case(
+            (dash > 0, func.substr(first_birth.c.date, 1, dash - 1)), else_=first_birth.c.date
+        )
+        birth_year = case(
+            (
+                and_(year_part != "", year_part.op("NOT GLOB")("*[^0-9]*")),
+                sql_cast(year_part, Integer),
+            ),
+            else_=None,
+        )
+
+        # Sort by birth year (oldest first, unknown last), then by name, in SQL
+        rows = (
+            session.query(Person.id, Person.primary_name, birth_year)
+            .outerjoin(
+                first_birth,
+                and_(first_birth.c.person_id == Person.id, first_birth.c.position == 1),
+            )
+            .order_by(func.coalesce(birth_year, 9999), Person.primary_name)
+            .all()
+        )
+
+        people_list = [
+            {"id": person_id, "name": name, "birth_year": year} for person_id, name, year in rows
+        ]
+
+        return current_app.json.dumps(
+            {
+                "success": True,
+                "people": people_list,
+            }
+        ).encode()
+
+
 @tree_bp.route("/api/tree/people", methods=["GET"])
 async def list_people() -> Response | tuple[Response, int]:
     """Get a simple list of all people (for selection/search).
@@ -139,59 +351,36 @@ async def list_people() -> Response | tuple[Response, int]:
         JSON with list of people (id, name, birth year)
     """
     try:
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-        session = db.get_session()
-
-        try:
-            people = session.query(Person).all()
-
-            people_list = []
-            for person in people:
-                # Get birth year for sorting
-                birth_event = (
-                    session.query(Event)
-                    .filter(Event.person_id == person.id, Event.event_type == "birth")
-                    .first()
-                )
-
-                birth_year = None
-                date_str = cast(str | None, birth_event.date) if birth_event else None
-                if birth_event and date_str:
-                    # Try to extract year from date string
-                    try:
-                        # Handle various date formats (YYYY, YYYY-MM-DD, etc.)
-                        year_part = date_str.split("-")[0]
-                        birth_year = int(year_part) if year_part.isdigit() else None
-                    except Exception:
-                        birth_year = None
-
-                people_list.append(
-                    {
-                        "id": person.id,
-                        "name": person.primary_name,
-                        "birth_year": birth_year,
-                    }
-                )
+        db = await asyncio.to_thread(get_db)
+        body = await asyncio.to_thread(_people_json, db, await _tree_data_version(db))
+        return Response(body, status=200, mimetype="application/json")
 
-            # Sort by birth year (oldest first), then by name
-            people_list.sort(key=lambda x: (x["birth_year"] or 9999, x["name"]))
+    except Exception as e:
+        logger.exception("Failed to list people")
+        return jsonify({"error": f"Failed to list people: {e!s}"}), 500
 
-            return jsonify(
-                {
-                    "success": True,
-                    "people": people_list,
-                }
-            ), 200
 
-        finally:
-            session.close()
+@lru_cache(maxsize=4)
+def _families_json(db: GenealogyDatabase, version: tuple[object, ...]) -> bytes:
+    """Build the serialized family list response body, cached per data version.
 
-    except Exception as e:
-        import traceback
+    Args:
+        db: Database to read from
+        version: Tree data version (see ``_tree_data_version``); only part of
+            the cache key
 
-        traceback.print_exc()
-        return jsonify({"error": f"Failed to list people: {e!s}"}), 500
+    Returns:
+        JSON body
+    """
+    families = db.get_family_list()
+
+    return current_app.json.dumps(
+        {
+            "success": True,
+            "families": families,
+            "count": len(families),
+        }
+    ).encode()
 
 
 @tree_bp.route("/api/families", methods=["GET"])
@@ -202,23 +391,12 @@ async def get_families() -> Response | tuple[Response, int]:
         JSON with list of families and statistics
     """
     try:
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-
-        families = db.get_family_list()
-
-        return jsonify(
-            {
-                "success": True,
-                "families": families,
-                "count": len(families),
-            }
-        ), 200
+        db = await asyncio.to_thread(get_db)
+        body = await asyncio.to_thread(_families_json, db, await _tree_data_version(db))
+        return Response(body, status=200, mimetype="application/json")
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to list families")
         return jsonify({"error": f"Failed to list families: {e!s}"}), 500
 
 
@@ -247,14 +425,14 @@ async def assign_person_family(person_id: int) -> Response | tuple[Response, int
 
         family_side = data.get("family_side")
 
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
+        db = get_db()
 
         db.update_person_family(
             person_id=person_id,
             family_name=family_name,
             family_side=family_side,
         )
+        bump_tree_version()
 
         return jsonify(
             {
@@ -266,9 +444,7 @@ async def assign_person_family(person_id: int) -> Response | tuple[Response, int
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to assign family")
         return jsonify({"error": f"Failed to assign family: {e!s}"}), 500
 
 
@@ -288,8 +464,7 @@ async def get_person_documents(person_id: int) -> Response | tuple[Response, int
     try:
         link_type = request.args.get("link_type", type=str)
 
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
+        db = get_db()
 
         documents = db.get_person_documents(person_id=person_id, link_type=link_type)
 
@@ -316,23 +491,22 @@ async def get_person_documents(person_id: int) -> Response | tuple[Response, int
         ), 200
 
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to get person documents")
         return jsonify({"error": f"Failed to get person documents: {e!s}"}), 500
 
 
 @tree_bp.route("/api/people/<int:person_id>/documents", methods=["POST"])
 async def link_document_to_person(person_id: int) -> Response | tuple[Response, int]:
-    """Manually link a document to a person.
+    """Manually link one or more documents to a person.
 
     Args:
         person_id: ID of the person
 
     Body:
-        - document_id: Document ID to link (required)
+        - document_id: Document ID, or list of document IDs, to link (required);
+          a list is linked in a single transaction
         - link_type: Type of link (required, e.g., "portrait_of", "mentioned_in")
-        - notes: Optional notes about the link
+        - notes: Optional notes about the link(s)
 
     Returns:
         JSON with success status
@@ -351,29 +525,41 @@ async def link_document_to_person(person_id: int) -> Response | tuple[Response,
         if not link_type:
             return jsonify({"error": "link_type is required"}), 400
 
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
+        db = get_db()
 
-        db.add_person_document_link(
-            person_id=person_id,
-            document_id=document_id,
-            link_type=link_type,
-            notes=notes,
-        )
+        if isinstance(document_id, list):
+            count = db.add_person_document_links_bulk(
+                [
+                    {
+                        "person_id": person_id,
+                        "document_id": doc_id,
+                        "link_type": link_type,
+                        "notes": notes,
+                    }
+                    for doc_id in document_id
+                ]
+            )
+            message = f"{count} documents linked to person {person_id}"
+        else:
+            db.add_person_document_link(
+                person_id=person_id,
+                document_id=document_id,
+                link_type=link_type,
+                notes=notes,
+            )
+            message = f"Document {document_id} linked to person {person_id}"
 
         return jsonify(
             {
                 "success": True,
-                "message": f"Document {document_id} linked to person {person_id}",
+                "message": message,
             }
         ), 201
 
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to link document")
         return jsonify({"error": f"Failed to link document: {e!s}"}), 500
 
 
@@ -391,8 +577,7 @@ async def unlink_document_from_person(
         JSON with success status
     """
     try:
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
+        db = get_db()
 
         db.remove_person_document_link(person_id=person_id, document_id=document_id)
 
@@ -406,7 +591,5 @@ async def unlink_document_from_person(
     except ValueError as e:
         return jsonify({"error": str(e)}), 404
     except Exception as e:
-        import traceback
-
-        traceback.print_exc()
+        logger.exception("Failed to unlink document")
         return jsonify({"error": f"Failed to unlink document: {e!s}"}), 500
@@ -1,19 +1,53 @@
 """File upload API endpoints."""
 
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import AsyncIterator, Iterator, Mapping
+from contextlib import aclosing
+from dataclasses import dataclass
 from pathlib import Path
+from typing import IO, Any
 
 from quart import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import or_, select
 from werkzeug.utils import secure_filename
 
 from src.backend.genealogy_ai.agents.extract_entities import EntityExtractor
 from src.backend.genealogy_ai.agents.reconcile_people import ReconciliationAgent
 from src.backend.genealogy_ai.ingestion.chunking import DocumentChunker
-from src.backend.genealogy_ai.ingestion.ocr import OCRProcessor
-from src.backend.genealogy_ai.storage.chroma import ChromaStore
-from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+from src.backend.genealogy_ai.ingestion.ocr import OCRProcessor, OCRResult
+from src.backend.genealogy_ai.schemas import ExtractionResult
+from src.backend.genealogy_ai.storage.sqlite import Document, GenealogyDatabase
+from src.backend.services.jobs import (
+    COMPLETED,
+    FAILED,
+    PENDING,
+    PROCESSING,
+    create_job,
+    discard_job,
+    get_job,
+    update_job,
+)
+from src.backend.services.semantic_cache import get_semantic_cache
+from src.backend.services.stores import bump_tree_version, get_chroma_store, get_db
+
+logger = logging.getLogger(__name__)
 
 upload_bp = Blueprint("upload", __name__)
 
+# Recognized pages saved to the database per transaction during an upload
+UPLOAD_PAGE_BATCH = 16
+
+# Block size when an upload has to be copied through Python
+UPLOAD_COPY_BUFFER = 1024 * 1024
+
+# Hex digits of the content SHA-256 kept in stored filenames (64 bits)
+CONTENT_TAG_LENGTH = 16
+
 
 def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed.
@@ -24,10 +58,241 @@ def allowed_file(filename: str) -> bool:
     Returns:
         True if file extension is allowed
     """
-    config = current_app.config
-    if not filename:
+    # Same suffix as Path(filename).suffix, without building a Path
+    stem, dot, extension = filename.rpartition(".")
+    if not stem or not dot:
         return False
-    return Path(filename).suffix.lower() in config.get("ALLOWED_EXTENSIONS", set())
+    return f".{extension.lower()}" in current_app.config["ALLOWED_EXTENSIONS"]
+
+
+def _find_upload(db: GenealogyDatabase, content_tag: str) -> list[int]:
+    """Find the pages of an already uploaded file with the given content tag.
+
+    Args:
+        db: Database to search
+        content_tag: Content hash prefix embedded in stored filenames
+
+    Returns:
+        Document IDs of the earliest matching upload, in page order (empty
+        if the content is new)
+    """
+    # Stored names end in "_<tag>" or "_<tag>.<ext>"; "_" is a LIKE wildcard
+    tagged = or_(
+        Document.source.like(f"%\\_{content_tag}", escape="\\"),
+        Document.source.like(f"%\\_{content_tag}.%", escape="\\"),
+    )
+    with db.session_scope() as session:
+        first_source = session.scalar(
+            select(Document.source).where(tagged).order_by(Document.id).limit(1)
+        )
+        if first_source is None:
+            return []
+        return list(
+            session.scalars(
+                select(Document.id).where(Document.source == first_source).order_by(Document.page)
+            )
+        )
+
+
+def _uploads_in_flight() -> dict[str, str]:
+    """Return the app's in-flight upload jobs, keyed by content tag.
+
+    Only touched from the event loop, so checking and reserving a tag with
+    no ``await`` in between is atomic. Reservations are per process.
+    """
+    return current_app.extensions.setdefault("uploads_in_flight", {})
+
+
+def _claim_file(partial_path: Path, destination: Path) -> bool:
+    """Put a fully written upload in place unless the file already exists.
+
+    Args:
+        partial_path: Completely written temporary file
+        destination: Stored upload path
+
+    Returns:
+        True if this call created ``destination`` (and so may delete it)
+    """
+    try:
+        # Unlike a rename, linking fails rather than replacing an existing file
+        os.link(partial_path, destination)
+    except FileExistsError:
+        return False
+    return True
+
+
+def _save_upload(stream: IO[bytes], destination: Path) -> bool:
+    """Write an uploaded file to disk in one blocking call.
+
+    Werkzeug spools large uploads to a temporary file, which is copied by
+    the kernel with ``os.sendfile``; small in-memory uploads (or platforms
+    where sendfile can't target a file) are copied in 1 MiB blocks. Quart's
+    ``FileStorage.save`` instead hops to a thread for every 16 KiB block.
+
+    Args:
+        stream: Uploaded file stream, positioned at the start of the data
+        destination: Path to write to
+
+    Returns:
+        True if this call created ``destination``, False if it already existed
+    """
+    partial_path = destination.with_name(f".{uuid.uuid4().hex}.part")
+    try:
+        _copy_upload(stream, partial_path)
+        return _claim_file(partial_path, destination)
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+
+def _copy_upload(stream: IO[bytes], destination: Path) -> None:
+    """Copy an upload stream to a new file (see :func:`_save_upload`)."""
+    with destination.open("wb") as out:
+        try:
+            in_fd = stream.fileno()
+            offset = stream.tell()
+            size = os.fstat(in_fd).st_size
+            while offset < size:
+                sent = os.sendfile(out.fileno(), in_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            # No file descriptor (BytesIO) or sendfile unsupported; sendfile
+            # leaves the stream position alone, so start over through Python
+            out.seek(0)
+            out.truncate()
+            shutil.copyfileobj(stream, out, UPLOAD_COPY_BUFFER)
+
+
+async def _page_batches(
+    pages: Iterator[OCRResult], batch_size: int
+) -> AsyncIterator[list[OCRResult]]:
+    """Yield batches of OCR pages as they are recognized.
+
+    The blocking page iterator is advanced in a worker thread, one page
+    ahead of the consumer, so recognition of the next page overlaps with
+    whatever the consumer does with the current batch.
+
+    Args:
+        pages: Page iterator, e.g. from ``OCRProcessor.iter_pages``
+        batch_size: Maximum pages per batch
+    """
+    batch: list[OCRResult] = []
+    next_page = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+    try:
+        while (page := await next_page) is not None:
+            next_page = asyncio.ensure_future(asyncio.to_thread(next, pages, None))
+            batch.append(page)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        next_page.cancel()
+
+
+@dataclass
+class UploadOptions:
+    """Processing options sent along with an uploaded file."""
+
+    engine: str
+    azure_key: str | None
+    azure_endpoint: str | None
+    openai_key: str | None
+    document_type: str | None
+    family_name: str | None
+    family_side: str | None
+
+    @classmethod
+    def from_values(cls, values: Mapping[str, str]) -> "UploadOptions":
+        """Read the options from form fields or query parameters.
+
+        Credentials that aren't sent fall back to the app configuration.
+
+        Args:
+            values: Submitted form or query string values
+
+        Returns:
+            UploadOptions for the request
+        """
+        config = current_app.config
+        return cls(
+            engine=values.get("engine", "tesseract"),
+            azure_key=values.get("azure_key") or config.get("AZURE_DOCUMENT_INTELLIGENCE_KEY"),
+            azure_endpoint=values.get("azure_endpoint")
+            or config.get("AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT"),
+            openai_key=values.get("openai_key") or config.get("OPENAI_API_KEY"),
+            document_type=values.get("document_type"),
+            family_name=values.get("family_name"),
+            family_side=values.get("family_side"),
+        )
+
+
+def _file_type_error() -> tuple[Response, int]:
+    """Build the response for an upload with a disallowed extension."""
+    return jsonify(
+        {
+            "error": f"File type not allowed. Supported: {current_app.config['ALLOWED_EXTENSIONS_STR']}"
+        }
+    ), 400
+
+
+def _upload_folder() -> Path:
+    """Return the configured upload folder, creating it if needed."""
+    upload_folder = Path(current_app.config.get("UPLOAD_FOLDER", "./originals"))
+    upload_folder.mkdir(parents=True, exist_ok=True)
+    return upload_folder
+
+
+def _stored_filename(original_filename: str, content_tag: str) -> str:
+    """Make an upload's file name unique by adding its content tag.
+
+    Args:
+        original_filename: Secured client-side file name
+        content_tag: Content hash prefix of the file
+
+    Returns:
+        File name to store the upload under
+    """
+    filename_parts = original_filename.rsplit(".", 1)
+
+    if len(filename_parts) == 2:
+        # Has extension
+        return f"{filename_parts[0]}_{content_tag}.{filename_parts[1]}"
+    # No extension
+    return f"{original_filename}_{content_tag}"
+
+
+def _duplicate_response(
+    existing_ids: list[int], original_filename: str, options: UploadOptions
+) -> tuple[Response, int]:
+    """Build the response for content that was already processed.
+
+    Args:
+        existing_ids: Document IDs of the earlier upload, in page order
+        original_filename: Secured client-side file name
+        options: Processing options sent with the upload
+
+    Returns:
+        Success response pointing at the existing documents
+    """
+    return jsonify(
+        {
+            "success": True,
+            "duplicate": True,
+            "document_ids": existing_ids,
+            "filename": original_filename,
+            "page_count": len(existing_ids),
+            "document_type": options.document_type,
+            "family_name": options.family_name,
+            "family_side": options.family_side,
+            "entities_extracted": {"people": 0, "events": 0, "relationships": 0},
+            "duplicates_merged": 0,
+            "chunks_stored": 0,
+            "message": "File was already uploaded; returning the existing document",
+        }
+    ), 200
 
 
 @upload_bp.route("/api/upload", methods=["POST"])
@@ -48,7 +313,9 @@ async def upload_file() -> Response | tuple[Response, int]:
         - family_side: Family side - "maternal" or "paternal" (optional)
 
     Returns:
-        JSON response with document ID and status
+        202 JSON response with the processing job's ID (the running job's if
+        the same content is still being processed), or 200 with the existing
+        document IDs if the same content was uploaded before
     """
     files = await request.files
     form = await request.form
@@ -57,177 +324,396 @@ async def upload_file() -> Response | tuple[Response, int]:
         return jsonify({"error": "No file provided"}), 400
 
     file = files["file"]
-    engine = form.get("engine", "tesseract")
-    azure_key = form.get("azure_key") or current_app.config.get("AZURE_DOCUMENT_INTELLIGENCE_KEY")
-    azure_endpoint = form.get("azure_endpoint") or current_app.config.get(
-        "AZURE_DOCUMENT_INTELLIGENCE_ENDPOINT"
-    )
-    openai_key = form.get("openai_key") or current_app.config.get("OPENAI_API_KEY")
-    document_type = form.get("document_type")
-    family_name = form.get("family_name")
-    family_side = form.get("family_side")
+    options = UploadOptions.from_values(form)
 
     if not file.filename:
         return jsonify({"error": "No file selected"}), 400
 
     if not allowed_file(file.filename):
-        return jsonify(
-            {
-                "error": f"File type not allowed. Supported: {', '.join(current_app.config.get('ALLOWED_EXTENSIONS', set()))}"
-            }
-        ), 400
+        return _file_type_error()
 
-    # Secure the filename and make it unique to avoid conflicts
-    import time
+    # Tag the file with a hash of its content: identical bytes always get
+    # the same tag, so a repeat upload can be recognized before OCR
+    content_hash = await asyncio.to_thread(hashlib.file_digest, file.stream, "sha256")
+    content_tag = content_hash.hexdigest()[:CONTENT_TAG_LENGTH]
+    file.stream.seek(0)
 
     original_filename = secure_filename(file.filename)
-    filename_parts = original_filename.rsplit(".", 1)
-    timestamp = str(int(time.time() * 1000))  # Millisecond timestamp
+    in_flight = _uploads_in_flight()
+    if content_tag in in_flight:
+        return _job_response(in_flight[content_tag], original_filename)
+    job_id = in_flight[content_tag] = create_job(filename=original_filename)
 
-    if len(filename_parts) == 2:
-        # Has extension
-        unique_filename = f"{filename_parts[0]}_{timestamp}.{filename_parts[1]}"
-    else:
-        # No extension
-        unique_filename = f"{original_filename}_{timestamp}"
+    try:
+        db = await asyncio.to_thread(get_db)
+        existing_ids = await asyncio.to_thread(_find_upload, db, content_tag)
+        if existing_ids:
+            _release_upload(content_tag)
+            return _duplicate_response(existing_ids, original_filename, options)
+
+        file_path = _upload_folder() / _stored_filename(original_filename, content_tag)
+        owns_file = await asyncio.to_thread(_save_upload, file.stream, file_path)
+    except BaseException:
+        _release_upload(content_tag)
+        raise
+
+    return _start_upload_job(
+        job_id, content_tag, db, file_path, owns_file, original_filename, options
+    )
 
-    upload_folder = Path(current_app.config.get("UPLOAD_FOLDER", "./originals"))
-    upload_folder.mkdir(parents=True, exist_ok=True)
 
-    # Save the file with unique name
-    file_path = upload_folder / unique_filename
-    await file.save(str(file_path))
+@upload_bp.route("/api/upload/stream", methods=["POST"])
+async def upload_stream() -> Response | tuple[Response, int]:
+    """Upload and process a document sent as the raw request body.
+
+    Skips multipart parsing: the body is written to disk (and hashed) chunk
+    by chunk as it arrives, so memory use doesn't grow with the file size.
+
+    Headers:
+        - X-Filename: Original file name, used for the file type (required)
+
+    Query parameters:
+        Same as the form parameters of ``/api/upload``, except ``file``
+
+    Returns:
+        Same as ``/api/upload``
+    """
+    filename = request.headers.get("X-Filename", "")
+    if not filename:
+        return jsonify({"error": "No filename provided (X-Filename header)"}), 400
+
+    if not allowed_file(filename):
+        return _file_type_error()
+
+    options = UploadOptions.from_values(request.args)
+    original_filename = secure_filename(filename)
+    upload_folder = _upload_folder()
+    partial_path = upload_folder / f".{uuid.uuid4().hex}.part"
+
+    try:
+        # Writes of body-sized chunks only reach the page cache, so they are
+        # done inline rather than hopping to a thread per chunk
+        content_hash = hashlib.sha256()
+        with partial_path.open("wb") as out:
+            async for chunk in request.body:
+                content_hash.update(chunk)
+                out.write(chunk)
+        content_tag = content_hash.hexdigest()[:CONTENT_TAG_LENGTH]
+
+        in_flight = _uploads_in_flight()
+        if content_tag in in_flight:
+            return _job_response(in_flight[content_tag], original_filename)
+        job_id = in_flight[content_tag] = create_job(filename=original_filename)
+
+        try:
+            db = await asyncio.to_thread(get_db)
+            existing_ids = await asyncio.to_thread(_find_upload, db, content_tag)
+            if existing_ids:
+                _release_upload(content_tag)
+                return _duplicate_response(existing_ids, original_filename, options)
+
+            file_path = upload_folder / _stored_filename(original_filename, content_tag)
+            owns_file = _claim_file(partial_path, file_path)
+        except BaseException:
+            _release_upload(content_tag)
+            raise
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+    return _start_upload_job(
+        job_id, content_tag, db, file_path, owns_file, original_filename, options
+    )
+
 
+@upload_bp.route("/api/upload/jobs/<job_id>", methods=["GET"])
+async def get_upload_job(job_id: str) -> Response | tuple[Response, int]:
+    """Get the status of an upload being processed in the background.
+
+    Args:
+        job_id: Job ID returned by the upload endpoint
+
+    Returns:
+        JSON with the job status ("pending", "processing", "completed" or
+        "failed"), plus the processing result or error once finished
+    """
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job), 200
+
+
+def _release_upload(content_tag: str) -> None:
+    """Drop the reservation of an upload whose job was never started.
+
+    Args:
+        content_tag: Content tag reserved in :func:`_uploads_in_flight`
+    """
+    discard_job(_uploads_in_flight().pop(content_tag))
+
+
+def _start_upload_job(
+    job_id: str,
+    content_tag: str,
+    db: GenealogyDatabase,
+    file_path: Path,
+    owns_file: bool,
+    original_filename: str,
+    options: UploadOptions,
+) -> tuple[Response, int]:
+    """Queue a saved upload for background processing.
+
+    OCR, extraction and reconciliation can take minutes for long documents,
+    longer than clients and proxies wait for a response.
+
+    Args:
+        job_id: Job reserved for the upload's content tag
+        content_tag: Content tag the job is reserved under; released when it ends
+        db: Database to store documents and entities in
+        file_path: Saved upload
+        owns_file: The upload created ``file_path``, so may delete it on failure
+        original_filename: Secured client-side file name
+        options: Processing options sent with the upload
+
+    Returns:
+        202 response with the job ID to poll
+    """
+    current_app.add_background_task(
+        _run_upload_job, job_id, content_tag, db, file_path, owns_file, original_filename, options
+    )
+    return _job_response(job_id, original_filename)
+
+
+def _job_response(job_id: str, original_filename: str) -> tuple[Response, int]:
+    """Build the response pointing a client at an upload's processing job.
+
+    Args:
+        job_id: Job processing the upload (or identical content sent earlier)
+        original_filename: Secured client-side file name
+
+    Returns:
+        202 response with the job ID to poll
+    """
+    return jsonify(
+        {
+            "success": True,
+            "job_id": job_id,
+            "status": PENDING,
+            "filename": original_filename,
+            "status_url": f"/api/upload/jobs/{job_id}",
+            "message": "File uploaded; processing in the background",
+        }
+    ), 202
+
+
+async def _run_upload_job(
+    job_id: str,
+    content_tag: str,
+    db: GenealogyDatabase,
+    file_path: Path,
+    owns_file: bool,
+    original_filename: str,
+    options: UploadOptions,
+) -> None:
+    """Process a saved upload, recording the outcome on its job.
+
+    Args:
+        job_id: Job to report progress on
+        content_tag: Content tag the job is reserved under
+        db: Database to store documents and entities in
+        file_path: Saved upload
+        owns_file: The upload created ``file_path``, so may delete it on failure
+        original_filename: Secured client-side file name
+        options: Processing options sent with the upload
+    """
+    update_job(job_id, status=PROCESSING)
+    try:
+        result = await _process_upload(db, file_path, owns_file, original_filename, options)
+    except Exception as e:
+        logger.exception("Failed to process file")
+        update_job(job_id, status=FAILED, error=f"Failed to process file: {e!s}")
+    else:
+        update_job(job_id, status=COMPLETED, result=result)
+    finally:
+        # The documents are stored (or the file is gone), so a repeat upload
+        # is now found, or processed afresh, without the reservation
+        _uploads_in_flight().pop(content_tag, None)
+
+
+async def _process_upload(
+    db: GenealogyDatabase,
+    file_path: Path,
+    owns_file: bool,
+    original_filename: str,
+    options: UploadOptions,
+) -> dict[str, Any]:
+    """Run a saved upload through the full ingestion pipeline.
+
+    Args:
+        db: Database to store documents and entities in
+        file_path: Saved upload
+        owns_file: Delete ``file_path`` again if processing fails (only when
+            this upload created it)
+        original_filename: Client-side file name (secured), for the response
+        options: Processing options sent with the upload
+
+    Returns:
+        Document IDs and processing counts
+    """
     # Process with full pipeline: OCR → Extract → Reconcile → Vector DB
     try:
         # Step 1: OCR Processing
         ocr_output_dir = Path(current_app.config.get("OCR_OUTPUT_DIR", "./ocr_output"))
         ocr_processor = OCRProcessor(
             output_dir=ocr_output_dir,
-            engine=engine,
-            azure_key=azure_key,
-            azure_endpoint=azure_endpoint,
+            engine=options.engine,
+            azure_key=options.azure_key,
+            azure_endpoint=options.azure_endpoint,
+            page_workers=current_app.config["OCR_CONCURRENCY"],
         )
-        ocr_results = ocr_processor.process_document(file_path)
-
-        # Step 2: Save to database (one record per page)
-        db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
-        db = GenealogyDatabase(db_path=db_path)
-
-        document_ids = []
-        for ocr_result in ocr_results:
-            doc = db.add_document(
-                source=str(ocr_result.source_path),
-                page=ocr_result.page_number,
-                ocr_text=ocr_result.text,
-            )
-            if doc:
-                document_ids.append(doc.id)
-
-                # Set document type if provided
-                if document_type and doc.id:
-                    db.update_document_type(document_id=doc.id, document_type=document_type)
 
-        # Step 3: Entity Extraction
         total_people = 0
         total_events = 0
         total_relationships = 0
 
+        # Extract entities from pages concurrently as they are recognized
+        # (pages are independent), bounded to stay within API rate limits
         try:
-            extractor = EntityExtractor(api_key=openai_key)
+            extractor = EntityExtractor(api_key=options.openai_key)
+        except Exception:
+            # Log extraction error but don't fail the upload
+            logger.exception("Entity extraction failed")
+            extractor = None
+        extraction_slots = asyncio.Semaphore(current_app.config["EXTRACTION_CONCURRENCY"])
 
-            for ocr_result, doc_id in zip(ocr_results, document_ids, strict=True):
-                # Extract entities from this page
-                extraction_result = extractor.extract(
+        async def extract_page(ocr_result: OCRResult) -> ExtractionResult:
+            async with extraction_slots:
+                return await extractor.aextract(
                     text=ocr_result.text,
                     source=str(ocr_result.source_path),
                     page=ocr_result.page_number,
                 )
 
-                # Store extraction results
+        # Steps 1-3 are pipelined: OCR runs page by page in a worker thread
+        # while recognized pages are saved to the database in batches (Step 2,
+        # one record per page) and queued for entity extraction (Step 3)
+        ocr_results: list[OCRResult] = []
+        document_ids: list[int] = []
+        extraction_tasks: list[asyncio.Task[ExtractionResult]] = []
+        try:
+            async with aclosing(
+                _page_batches(ocr_processor.iter_pages(file_path), UPLOAD_PAGE_BATCH)
+            ) as batches:
+                async for batch in batches:
+                    # Set document type if provided, in the same transaction
+                    docs = await asyncio.to_thread(
+                        db.add_documents_bulk,
+                        [(str(r.source_path), r.page_number, r.text) for r in batch],
+                        document_type=options.document_type or None,
+                    )
+                    ocr_results.extend(batch)
+                    document_ids.extend(doc.id for doc in docs)
+                    if extractor is not None:
+                        extraction_tasks.extend(
+                            asyncio.create_task(extract_page(ocr_result)) for ocr_result in batch
+                        )
+        except BaseException:
+            # Don't leave a partially ingested document behind
+            for task in extraction_tasks:
+                task.cancel()
+            if document_ids:
+                await asyncio.to_thread(db.delete_document, document_ids[0])
+            raise
+
+        try:
+            extraction_results = await asyncio.gather(*extraction_tasks, return_exceptions=True)
+
+            # Store extraction results in page order
+            for extraction_result, doc_id in zip(extraction_results, document_ids, strict=False):
+                if isinstance(extraction_result, BaseException):
+                    # Log extraction error but keep the other pages
+                    logger.error(
+                        "Entity extraction failed for document %s",
+                        doc_id,
+                        exc_info=extraction_result,
+                    )
+                    continue
+
                 if not extraction_result.is_empty():
-                    counts = db.store_extraction(
+                    counts = await asyncio.to_thread(
+                        db.store_extraction,
                         extraction_result,
                         doc_id,
-                        family_name=family_name,
-                        family_side=family_side,
+                        family_name=options.family_name,
+                        family_side=options.family_side,
                     )
                     total_people += counts["people"]
                     total_events += counts["events"]
                     total_relationships += counts["relationships"]
 
-        except Exception as e:
+        except Exception:
             # Log extraction error but don't fail the upload
-            import traceback
-
-            traceback.print_exc()
-            print(f"Entity extraction failed: {e!s}")
+            logger.exception("Entity extraction failed")
 
         # Step 4: Reconciliation (auto-approve 100% matches)
         duplicates_merged = 0
         try:
             agent = ReconciliationAgent(db=db, min_confidence=0.6)
-            candidates = agent.find_duplicates()
-
-            # Auto-merge exact matches (100% confidence)
-            for candidate in candidates:
-                if candidate.confidence >= 1.0:
-                    db.merge_people(keep_id=candidate.person1_id, merge_id=candidate.person2_id)
-                    duplicates_merged += 1
+            candidates = await asyncio.to_thread(agent.find_duplicates)
+
+            # Auto-merge exact matches (100% confidence) in one transaction
+            duplicates_merged = await asyncio.to_thread(
+                db.merge_people_bulk,
+                [
+                    (candidate.person1_id, candidate.person2_id)
+                    for candidate in candidates
+                    if candidate.confidence >= 1.0
+                ],
+            )
 
-        except Exception as e:
+        except Exception:
             # Log reconciliation error but don't fail the upload
-            import traceback
+            logger.exception("Reconciliation failed")
 
-            traceback.print_exc()
-            print(f"Reconciliation failed: {e!s}")
+        # People may have been added or merged, even if a step above failed
+        bump_tree_version()
 
         # Step 5: Chunk and add to vector database
         total_chunks = 0
         try:
             chunker = DocumentChunker(chunk_size=1000, chunk_overlap=200)
-            chunks = chunker.chunk_ocr_results(ocr_results)
+            chunks = await asyncio.to_thread(chunker.chunk_ocr_results, ocr_results)
 
-            chroma_dir = Path(current_app.config.get("CHROMA_DIR", "./chroma_db"))
-            chroma_store = ChromaStore(persist_directory=chroma_dir)
-            chroma_store.add_chunks(chunks)
+            chroma_store = await asyncio.to_thread(get_chroma_store)
+            await asyncio.to_thread(chroma_store.add_chunks, chunks)
+            get_semantic_cache().clear()
 
             total_chunks = len(chunks)
 
-        except Exception as e:
+        except Exception:
             # Log vector storage error but don't fail the upload
-            import traceback
-
-            traceback.print_exc()
-            print(f"Vector storage failed: {e!s}")
-
-        return jsonify(
-            {
-                "success": True,
-                "document_ids": document_ids,
-                "filename": original_filename,
-                "page_count": len(ocr_results),
-                "document_type": document_type,
-                "family_name": family_name,
-                "family_side": family_side,
-                "entities_extracted": {
-                    "people": total_people,
-                    "events": total_events,
-                    "relationships": total_relationships,
-                },
-                "duplicates_merged": duplicates_merged,
-                "chunks_stored": total_chunks,
-                "message": "File uploaded and fully processed successfully",
-            }
-        ), 201
-
-    except Exception as e:
-        # Clean up the file if processing failed
-        if file_path.exists():
-            file_path.unlink()
-
-        # Log full traceback for debugging
-        import traceback
-
-        traceback.print_exc()
-        return jsonify({"error": f"Failed to process file: {e!s}"}), 500
+            logger.exception("Vector storage failed")
+
+        return {
+            "success": True,
+            "document_ids": document_ids,
+            "filename": original_filename,
+            "page_count": len(ocr_results),
+            "document_type": options.document_type,
+            "family_name": options.family_name,
+            "family_side": options.family_side,
+            "entities_extracted": {
+                "people": total_people,
+                "events": total_events,
+                "relationships": total_relationships,
+            },
+            "duplicates_merged": duplicates_merged,
+            "chunks_stored": total_chunks,
+            "message": "File uploaded and fully processed successfully",
+        }
+
+    except Exception:
+        # Clean up the file if processing failed, unless another upload
+        # saved it and may still be reading it
+        if owns_file:
+            file_path.unlink(missing_ok=True)
+        raise
@@ -1,5 +1,10 @@
 """Main Quart application for Genealogy AI backend."""
 
+import asyncio
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 from quart import Quart, jsonify, send_from_directory
@@ -11,6 +16,7 @@ from src.backend.api.management import management_bp
 from src.backend.api.tree import tree_bp
 from src.backend.api.upload import upload_bp
 from src.backend.config import get_config
+from src.backend.json_provider import ORJSONProvider
 
 
 def create_app(config_name: str = "development") -> Quart:
@@ -23,6 +29,7 @@ def create_app(config_name: str = "development") -> Quart:
         Configured Quart app
     """
     app = Quart(__name__, static_folder="static", static_url_path="")
+    app.json = ORJSONProvider(app)
 
     # Load configuration
     config = get_config(config_name)
@@ -41,6 +48,17 @@ def create_app(config_name: str = "development") -> Quart:
     Path(config.UPLOAD_FOLDER).mkdir(parents=True, exist_ok=True)
     Path(config.OCR_OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
 
+    # Resolved once so file requests don't re-resolve it on every call
+    app.config["UPLOAD_FOLDER_RESOLVED"] = str(Path(config.UPLOAD_FOLDER).resolve())
+
+    # Normalized once so uploads check extensions without rebuilding anything
+    allowed_extensions = frozenset(ext.lower() for ext in config.ALLOWED_EXTENSIONS)
+    app.config["ALLOWED_EXTENSIONS"] = allowed_extensions
+    app.config["ALLOWED_EXTENSIONS_STR"] = ", ".join(sorted(allowed_extensions))
+
+    configure_logging(app)
+    configure_worker_threads(app)
+
     # Register blueprints
     app.register_blueprint(upload_bp)
     app.register_blueprint(documents_bp)
@@ -54,6 +72,58 @@ def create_app(config_name: str = "development") -> Quart:
     return app
 
 
+def configure_logging(app: Quart) -> None:
+    """Route backend log records through a queue.
+
+    Request handlers only enqueue records; a listener thread formats them
+    and writes to stderr, so logging an exception never blocks the event
+    loop on I/O.
+
+    Args:
+        app: Quart application
+    """
+    backend_logger = logging.getLogger("src.backend")
+    if any(isinstance(handler, QueueHandler) for handler in backend_logger.handlers):
+        return  # Already configured by an earlier create_app() call
+
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+    )
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+
+    backend_logger.addHandler(QueueHandler(log_queue))
+    backend_logger.setLevel(logging.INFO)
+    backend_logger.propagate = False
+
+    @app.after_serving
+    async def stop_log_listener() -> None:
+        """Flush queued log records on shutdown."""
+        listener.stop()
+
+
+def configure_worker_threads(app: Quart) -> None:
+    """Size the thread pool that handlers offload blocking work to.
+
+    OCR, database access, reconciliation and embedding all run through
+    ``asyncio.to_thread``, which uses the event loop's default executor.
+
+    Args:
+        app: Quart application
+    """
+
+    @app.before_serving
+    async def start_worker_threads() -> None:
+        """Install the default executor on the serving event loop."""
+        executor = ThreadPoolExecutor(
+            max_workers=app.config["WORKER_THREADS"], thread_name_prefix="worker"
+        )
+        asyncio.get_running_loop().set_default_executor(executor)
+
+
 def register_routes(app: Quart) -> None:
     """Register API routes.
 
@@ -83,6 +153,7 @@ def register_routes(app: Quart) -> None:
                     "health": "/api/health",
                     "info": "/api/info",
                     "upload": "/api/upload",
+                    "upload_stream": "/api/upload/stream",
                     "documents": "/api/documents",
                     "chat": "/api/chat",
                     "tree": "/api/tree (coming soon)",
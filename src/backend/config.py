@@ -26,7 +26,9 @@ class Config:
     # File upload settings
     MAX_CONTENT_LENGTH = 100 * 1024 * 1024  # 100MB max file size
     UPLOAD_FOLDER = Path("./originals")
-    ALLOWED_EXTENSIONS = {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".txt"}
+    ALLOWED_EXTENSIONS = frozenset(
+        {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".txt"}
+    )
 
     # Database paths
     DB_PATH = Path("./genealogy.db")
@@ -44,6 +46,26 @@ class Config:
     CHUNK_SIZE = 1000
     CHUNK_OVERLAP = 200
     MIN_CONFIDENCE = 0.6
+    # Threads for blocking work offloaded from request handlers
+    WORKER_THREADS = int(os.environ.get("WORKER_THREADS", "0")) or min(
+        32, (os.cpu_count() or 1) * 2 + 4
+    )
+    # PDF pages OCR'd at the same time during an upload (default: one per CPU)
+    OCR_CONCURRENCY = int(os.environ.get("OCR_CONCURRENCY", "0")) or os.cpu_count() or 1
+    # Pages sent to the entity extraction model at the same time during an upload
+    EXTRACTION_CONCURRENCY = int(os.environ.get("EXTRACTION_CONCURRENCY", "8"))
+
+    # Vector store batching: chunks embedded and written per add_chunks batch,
+    # and sentences per embedding forward pass (unset: scaled to the CPU count)
+    EMBEDDING_BATCH_SIZE = int(os.environ.get("EMBEDDING_BATCH_SIZE", "256"))
+    EMBEDDING_ENCODE_BATCH_SIZE = int(os.environ.get("EMBEDDING_ENCODE_BATCH_SIZE", "0")) or None
+    # Run the embedding model in int8 on CPUs with VNNI (faster, slightly
+    # different vectors than the FP32 model that indexed existing chunks)
+    EMBEDDING_QUANTIZE = os.environ.get("EMBEDDING_QUANTIZE", "").lower() in ("1", "true", "yes")
+
+    # Chat answer cache (reuse answers for near-identical questions)
+    CHAT_CACHE_THRESHOLD = 0.95  # Minimum cosine similarity between questions
+    CHAT_CACHE_SIZE = 256
 
 
 class DevelopmentConfig(Config):
@@ -0,0 +1,142 @@
+"""Response cache for entity extraction.
+
+Genealogical documents repeat a lot of text verbatim (form templates, register
+headers, re-uploaded pages). This module caches ExtractionResults on disk keyed
+by a hash of the normalized page text so identical inputs skip the LLM call.
+"""
+
+import asyncio
+import hashlib
+import logging
+import uuid
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import Runnable
+
+from src.backend.genealogy_ai.schemas import ExtractionResult
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so OCR layout differences don't defeat the cache.
+
+    Args:
+        text: Raw document text
+
+    Returns:
+        Text with all whitespace runs collapsed to single spaces
+    """
+    return " ".join(text.split())
+
+
+class CachedChain:
+    """Exact-match cache in front of an extraction chain.
+
+    Entries are keyed on (namespace, normalized text). The namespace should
+    identify the model and prompt version, so changing either invalidates the
+    cache without having to delete any files.
+    """
+
+    def __init__(self, chain: Runnable[Any, Any], cache_dir: Path, namespace: str):
+        """Initialize the cached chain.
+
+        Args:
+            chain: The underlying extraction chain
+            cache_dir: Directory where cached results are stored
+            namespace: Cache namespace (e.g. model name + prompt version)
+        """
+        self.chain = chain
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+
+    def cache_key(self, text: str) -> str:
+        """Compute the cache key for a document text.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Hex digest identifying the cache entry
+        """
+        payload = f"{self.namespace}\0{normalize_text(text)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> ExtractionResult | None:
+        """Look up a cached result.
+
+        Args:
+            key: Cache key from :meth:`cache_key`
+
+        Returns:
+            Cached ExtractionResult, or None on a miss
+        """
+        path = self.cache_dir / f"{key}.json"
+        try:
+            return ExtractionResult.model_validate_json(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Corrupt or outdated entry - treat as a miss and overwrite later
+            return None
+
+    def set(self, key: str, result: ExtractionResult) -> None:
+        """Store a result in the cache.
+
+        A failed write is logged rather than raised: the result is still
+        valid, only the next lookup will miss.
+
+        Args:
+            key: Cache key from :meth:`cache_key`
+            result: Extraction result to store
+        """
+        path = self.cache_dir / f"{key}.json"
+        # Unique per call: threads in one process may store the same key at once
+        tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            tmp_path.write_text(result.model_dump_json(), encoding="utf-8")
+            tmp_path.replace(path)
+        except OSError:
+            logger.warning("Failed to cache extraction result %s", key, exc_info=True)
+            tmp_path.unlink(missing_ok=True)
+
+    def invoke(self, inputs: dict[str, Any]) -> ExtractionResult:
+        """Return the cached result for ``inputs["text"]``, calling the chain on a miss.
+
+        Args:
+            inputs: Chain inputs (must include "text")
+
+        Returns:
+            ExtractionResult for the input text
+        """
+        key = self.cache_key(inputs["text"])
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        result: ExtractionResult = self.chain.invoke(inputs)
+        self.set(key, result)
+        return result
+
+    async def ainvoke(self, inputs: dict[str, Any]) -> ExtractionResult:
+        """Async variant of :meth:`invoke`.
+
+        Cache files are read and written in a worker thread, so many pages
+        can be checked concurrently without blocking the event loop.
+
+        Args:
+            inputs: Chain inputs (must include "text")
+
+        Returns:
+            ExtractionResult for the input text
+        """
+        key = self.cache_key(inputs["text"])
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            return cached
+
+        result: ExtractionResult = await self.chain.ainvoke(inputs)
+        await asyncio.to_thread(self.set, key, result)
+        return result
@@ -4,15 +4,63 @@ This module uses an LLM to extract structured genealogical data
 (people, events, relationships) from OCR'd document text.
 """
 
+import asyncio
+import hashlib
+import logging
 from pathlib import Path
+from typing import Any
 
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from pydantic import SecretStr
 
+from src.backend.genealogy_ai.agents.cache import CachedChain
 from src.backend.genealogy_ai.config import settings
 from src.backend.genealogy_ai.schemas import ExtractionResult
 
+logger = logging.getLogger(__name__)
+
+# Only the per-page fields go in the human message; all instructions and
+# examples live in the static system prompt so they form a cacheable prefix
+HUMAN_TEMPLATE = "Text from {source} p.{page}:\n{text}"
+
+# Prompts shorter than this can never reach a provider's minimum cacheable prefix
+PROMPT_CACHE_MIN_BYTES = 1024
+
+
+def _strict_json_schema(node: Any) -> Any:
+    """Adapt a Pydantic JSON schema to OpenAI's strict structured-output rules.
+
+    Strict mode requires every property to be listed as required and
+    ``additionalProperties`` to be false; optional fields stay nullable.
+
+    Args:
+        node: JSON schema (or sub-schema) to convert
+
+    Returns:
+        Converted copy of the schema
+    """
+    if isinstance(node, list):
+        return [_strict_json_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    converted = {key: _strict_json_schema(value) for key, value in node.items() if key != "default"}
+    if "properties" in converted:
+        converted["required"] = list(converted["properties"])
+        converted["additionalProperties"] = False
+    return converted
+
+
+# Built once so every request sends the identical schema
+EXTRACTION_RESPONSE_FORMAT = {
+    "name": "ExtractionResult",
+    "description": ExtractionResult.__doc__,
+    "schema": _strict_json_schema(ExtractionResult.model_json_schema()),
+    "strict": True,
+}
+
 
 class EntityExtractor:
     """Extract genealogical entities from text using an LLM."""
@@ -22,6 +70,7 @@ class EntityExtractor:
         model_name: str | None = None,
         temperature: float = 0.0,
         api_key: str | None = None,
+        use_cache: bool = True,
     ):
         """Initialize the entity extractor.
 
@@ -29,8 +78,8 @@ class EntityExtractor:
             model_name: Optional model name override
             temperature: LLM temperature (0.0 for deterministic, higher for creative)
             api_key: Optional API key override
+            use_cache: Reuse stored results for previously seen document text
         """
-        self.model_name = model_name or settings.openai_model
         self.temperature = temperature
 
         # Load extraction prompt from genealogy_ai/prompts/
@@ -38,37 +87,129 @@ class EntityExtractor:
         with prompt_path.open() as f:
             self.system_prompt = f.read()
 
+        if len(self.system_prompt.encode("utf-8")) < PROMPT_CACHE_MIN_BYTES:
+            logger.warning(
+                "Extraction system prompt is under %d bytes and will not be prompt-cached",
+                PROMPT_CACHE_MIN_BYTES,
+            )
+
+        # The prompt file escapes literal braces for template formatting; messages
+        # are built directly, so unescape them once here
+        rendered_prompt = self.system_prompt.replace("{{", "{").replace("}}", "}")
+
         # Initialize LLM based on provider
         if settings.llm_provider == "openai":
+            # OpenAI caches static prefixes (>= 1024 tokens) automatically
+            self.model_name = model_name or settings.openai_model
             final_api_key = api_key or settings.get_api_key()
             self.llm = ChatOpenAI(
                 model=self.model_name,
                 temperature=self.temperature,
                 api_key=SecretStr(final_api_key),
             )
+            system_message = SystemMessage(content=rendered_prompt)
+        elif settings.llm_provider == "anthropic":
+            from langchain_anthropic import ChatAnthropic
+
+            # Anthropic only caches prefixes explicitly marked with cache_control
+            self.model_name = model_name or settings.anthropic_model
+            final_api_key = api_key or settings.get_api_key()
+            self.llm = ChatAnthropic(  # type: ignore[call-arg]
+                model=self.model_name,
+                temperature=self.temperature,
+                api_key=SecretStr(final_api_key),
+            )
+            system_message = SystemMessage(
+                content=[
+                    {
+                        "type": "text",
+                        "text": rendered_prompt,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ]
+            )
         else:
             raise NotImplementedError(
                 f"LLM provider {settings.llm_provider} not yet implemented. "
-                "Currently only 'openai' is supported."
+                "Currently 'openai' and 'anthropic' are supported."
             )
 
         # Create prompt template
-        self.prompt = ChatPromptTemplate.from_messages(
-            [
-                ("system", self.system_prompt),
-                (
-                    "human",
-                    "Extract genealogical information from the following document text:\n\n"
-                    "Source: {source}\n"
-                    "Page: {page}\n\n"
-                    "Text:\n{text}\n\n"
-                    "Return structured JSON following the format in the system prompt.",
-                ),
-            ]
+        # Built once: the system prompt must stay the first message and
+        # byte-identical across calls so providers can serve it from their
+        # prompt cache, and only the human message varies per page
+        self.system_message = system_message
+
+        # Create extraction chain with structured output. include_raw keeps the
+        # provider response so prompt-cache usage can be logged.
+        if settings.llm_provider == "openai":
+            # Native JSON-schema responses avoid tool-call scaffolding, and the
+            # fixed schema is cached server-side
+            structured_llm = self.llm.with_structured_output(
+                EXTRACTION_RESPONSE_FORMAT, method="json_schema", strict=True, include_raw=True
+            )
+        else:
+            structured_llm = self.llm.with_structured_output(ExtractionResult, include_raw=True)
+        self.chain = (
+            RunnableLambda(self._make_messages)
+            | structured_llm
+            | RunnableLambda(self._unwrap_structured_output)
         )
 
-        # Create extraction chain with structured output
-        self.chain = self.prompt | self.llm.with_structured_output(ExtractionResult)
+        # Cache results by page text; any prompt edit changes the version and
+        # invalidates previous entries
+        self.prompt_version = hashlib.sha256(
+            f"{self.system_prompt}\0{HUMAN_TEMPLATE}".encode()
+        ).hexdigest()[:16]
+        if use_cache:
+            self.chain = CachedChain(  # type: ignore[assignment]
+                self.chain,
+                cache_dir=settings.extraction_cache_dir,
+                namespace=f"{self.model_name}:{self.prompt_version}",
+            )
+
+    def _make_messages(self, inputs: dict[str, Any]) -> list[BaseMessage]:
+        """Build the message list for one page.
+
+        Args:
+            inputs: Chain inputs with "text", "source" and "page"
+
+        Returns:
+            The shared system message followed by the page's human message
+        """
+        return [self.system_message, HumanMessage(content=HUMAN_TEMPLATE.format(**inputs))]
+
+    @staticmethod
+    def _unwrap_structured_output(output: dict[str, Any]) -> ExtractionResult:
+        """Log prompt-cache usage and return the parsed extraction.
+
+        Args:
+            output: Structured output with "raw", "parsed" and "parsing_error" keys
+
+        Returns:
+            The parsed ExtractionResult
+
+        Raises:
+            Exception: The parsing error, if the response could not be parsed
+        """
+        usage = getattr(output["raw"], "usage_metadata", None)
+        if usage:
+            details = usage.get("input_token_details") or {}
+            logger.debug(
+                "Extraction usage: %s input tokens (%s cached, %s cache writes)",
+                usage.get("input_tokens"),
+                details.get("cache_read", 0),
+                details.get("cache_creation", 0),
+            )
+
+        if output.get("parsing_error"):
+            raise output["parsing_error"]
+
+        parsed = output["parsed"]
+        if isinstance(parsed, ExtractionResult):
+            return parsed
+        # JSON-schema responses come back as plain dicts
+        return ExtractionResult.model_validate(parsed)
 
     def extract(self, text: str, source: str, page: int) -> ExtractionResult:
         """Extract entities from document text.
@@ -94,17 +235,65 @@ class EntityExtractor:
             print(f"Extraction error for {source} page {page}: {e}")
             return ExtractionResult()
 
-    def extract_batch(self, documents: list[tuple[str, str, int]]) -> list[ExtractionResult]:
+    async def aextract(self, text: str, source: str, page: int) -> ExtractionResult:
+        """Extract entities from document text without blocking the event loop.
+
+        Args:
+            text: The OCR'd text to extract from
+            source: Source document path (for context)
+            page: Page number (for context)
+
+        Returns:
+            ExtractionResult containing people, events, and relationships
+        """
+        if not text or not text.strip():
+            return ExtractionResult()
+
+        try:
+            result: ExtractionResult = await self.chain.ainvoke(
+                {"text": text, "source": source, "page": page}
+            )  # type: ignore[assignment]
+            return result
+        except Exception as e:
+            # Log error and return empty result
+            print(f"Extraction error for {source} page {page}: {e}")
+            return ExtractionResult()
+
+    async def aextract_batch(
+        self, documents: list[tuple[str, str, int]], concurrency: int | None = None
+    ) -> list[ExtractionResult]:
+        """Extract entities from multiple documents concurrently.
+
+        LLM calls are network-bound, so pages are dispatched in parallel with at
+        most ``concurrency`` requests in flight at once.
+
+        Args:
+            documents: List of (text, source, page) tuples
+            concurrency: Maximum in-flight requests (default: settings.extract_concurrency)
+
+        Returns:
+            List of ExtractionResult objects, in the same order as ``documents``
+        """
+        semaphore = asyncio.Semaphore(concurrency or settings.extract_concurrency)
+
+        async def _bounded(text: str, source: str, page: int) -> ExtractionResult:
+            async with semaphore:
+                return await self.aextract(text, source, page)
+
+        return await asyncio.gather(*(_bounded(*document) for document in documents))
+
+    def extract_batch(
+        self, documents: list[tuple[str, str, int]], concurrency: int | None = None
+    ) -> list[ExtractionResult]:
         """Extract entities from multiple documents.
 
+        Synchronous wrapper around :meth:`aextract_batch` for non-async callers.
+
         Args:
             documents: List of (text, source, page) tuples
+            concurrency: Maximum in-flight requests (default: settings.extract_concurrency)
 
         Returns:
             List of ExtractionResult objects
         """
-        results = []
-        for text, source, page in documents:
-            result = self.extract(text, source, page)
-            results.append(result)
-        return results
+        return asyncio.run(self.aextract_batch(documents, concurrency=concurrency))
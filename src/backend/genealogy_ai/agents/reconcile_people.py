@@ -6,12 +6,18 @@ using fuzzy name matching, date/place comparison, and vector similarity.
 
 import re
 from dataclasses import dataclass
-from typing import cast
+from typing import Any, cast
 
-from rapidfuzz import fuzz
-from sqlalchemy.orm import Session
+import numpy as np
+from rapidfuzz import fuzz, process
+from sqlalchemy import delete, insert, or_, select
+from sqlalchemy.orm import Session, selectinload
 
-from src.backend.genealogy_ai.storage.sqlite import Event, GenealogyDatabase, Person
+from src.backend.genealogy_ai.storage.sqlite import DuplicatePair, Event, GenealogyDatabase, Person
+
+# Name variants scored against all others per cdist call; bounds the score
+# matrix to this many rows (float32) however many people there are
+NAME_MATRIX_ROWS = 1024
 
 
 def normalize_name(name: str) -> str:
@@ -88,140 +94,294 @@ class ReconciliationAgent:
     def find_duplicates(self) -> list[DuplicateCandidate]:
         """Find all potential duplicate people.
 
+        Only people added or changed since the last run (``reconciled_at``
+        unset) are compared, against everyone; their scored pairs replace
+        any stored ones, and the result is read from the stored pairs.
+
         Returns:
             List of duplicate candidates sorted by confidence (highest first)
         """
-        session = self.db.get_session()
-        try:
-            people = session.query(Person).all()
-            candidates = []
-
-            # Compare each pair of people
-            for i, person1 in enumerate(people):
-                for person2 in people[i + 1 :]:
-                    candidate = self._compare_people(person1, person2, session)
-                    if candidate and candidate.confidence >= self.min_confidence:
-                        candidates.append(candidate)
-
-            # Sort by confidence (highest first)
-            candidates.sort(key=lambda x: x.confidence, reverse=True)
-            return candidates
-        finally:
-            session.close()
-
-    def _compare_people(
-        self, person1: Person, person2: Person, session: Session
-    ) -> DuplicateCandidate | None:
-        """Compare two people for potential duplication.
+        with self.db.session_scope() as session:
+            people = (
+                session.query(Person).options(selectinload(Person.names)).order_by(Person.id).all()
+            )
+            pending = [index for index, person in enumerate(people) if person.reconciled_at is None]
+            if pending:
+                self._reconcile(session, people, pending)
+
+            names = {cast(int, person.id): cast(str, person.primary_name) for person in people}
+            pairs = session.execute(
+                select(
+                    DuplicatePair.person1_id,
+                    DuplicatePair.person2_id,
+                    DuplicatePair.confidence,
+                    DuplicatePair.reasons,
+                )
+                .where(DuplicatePair.confidence >= self.min_confidence)
+                .order_by(
+                    DuplicatePair.confidence.desc(),
+                    DuplicatePair.person1_id,
+                    DuplicatePair.person2_id,
+                )
+            )
+            return [
+                DuplicateCandidate(
+                    person1_id=pair.person1_id,
+                    person1_name=names[pair.person1_id],
+                    person2_id=pair.person2_id,
+                    person2_name=names[pair.person2_id],
+                    confidence=pair.confidence,
+                    reasons=list(pair.reasons),
+                )
+                for pair in pairs
+                if pair.person1_id in names and pair.person2_id in names
+            ]
+
+    def _reconcile(self, session: Session, people: list[Person], pending: list[int]) -> None:
+        """Score the pending people against everyone and store their pairs.
+
+        All name-matching pairs are stored whatever their confidence, so
+        agents with different ``min_confidence`` settings share the results.
 
         Args:
-            person1: First person
-            person2: Second person
             session: Database session
-
-        Returns:
-            DuplicateCandidate if match found, None otherwise
+            people: Everyone, with their names loaded
+            pending: Indices into ``people`` of those not yet reconciled
         """
-        reasons = []
-        scores = []
-
-        # Compare primary names (with normalization)
-        norm_name1 = normalize_name(cast(str, person1.primary_name))
-        norm_name2 = normalize_name(cast(str, person2.primary_name))
-        name_score = fuzz.ratio(norm_name1, norm_name2) / 100.0
-
-        if name_score >= self.name_threshold:
-            reasons.append(f"name match: {name_score:.2f}")
-            scores.append(name_score)
-        else:
-            # Check alternate names (also normalized)
-            person1_names = {normalize_name(cast(str, person1.primary_name))}
-            person1_names.update(normalize_name(n.name) for n in person1.names)
-
-            person2_names = {normalize_name(cast(str, person2.primary_name))}
-            person2_names.update(normalize_name(n.name) for n in person2.names)
-
-            # Check if any names match
-            max_variant_score = 0.0
-            for n1 in person1_names:
-                for n2 in person2_names:
-                    score = fuzz.ratio(n1, n2) / 100.0
-                    max_variant_score = max(max_variant_score, score)
-
-            if max_variant_score >= self.name_threshold:
-                reasons.append(f"name variant match: {max_variant_score:.2f}")
-                scores.append(max_variant_score)
-            else:
-                # Names don't match - unlikely to be duplicate
-                return None
-
-        # Compare birth dates if both exist
-        person1_birth = self._get_event(cast(int, person1.id), "birth", session)
-        person2_birth = self._get_event(cast(int, person2.id), "birth", session)
-
-        if person1_birth and person2_birth:
-            birth1_date = cast(str | None, person1_birth.date)
-            birth2_date = cast(str | None, person2_birth.date)
-            if birth1_date and birth2_date:
-                if birth1_date == birth2_date:
-                    reasons.append("same birth date")
-                    scores.append(1.0)
-                else:
-                    # Different birth dates - strong signal they're different people
-                    reasons.append("different birth dates")
-                    scores.append(0.0)
-
-        # Compare birth places if both exist
-        if person1_birth and person2_birth:
-            birth1_place = cast(str | None, person1_birth.place)
-            birth2_place = cast(str | None, person2_birth.place)
-            if birth1_place and birth2_place:
-                place_score = (
-                    fuzz.ratio(person1_birth.place.lower(), person2_birth.place.lower()) / 100.0
+        life_events = self._load_life_events(session)
+
+        # Only pairs whose names can match need scoring
+        first, second, variant_scores = self._name_matches(people, pending)
+        rows = self._score_pairs(people, life_events, first, second, variant_scores)
+
+        # Replace the pending people's pairs, and drop any left by deleted people
+        pending_ids = [cast(int, people[index].id) for index in pending]
+        person_ids = select(Person.id)
+        session.execute(
+            delete(DuplicatePair)
+            .where(
+                or_(
+                    DuplicatePair.person1_id.in_(pending_ids),
+                    DuplicatePair.person2_id.in_(pending_ids),
+                    DuplicatePair.person1_id.not_in(person_ids),
+                    DuplicatePair.person2_id.not_in(person_ids),
                 )
-                if place_score >= 0.8:
-                    reasons.append(f"similar birth place: {place_score:.2f}")
-                    scores.append(place_score * 0.8)  # Weight place less than name
-
-        # Compare death dates if both exist
-        person1_death = self._get_event(cast(int, person1.id), "death", session)
-        person2_death = self._get_event(cast(int, person2.id), "death", session)
-
-        if person1_death and person2_death:
-            death1_date = cast(str | None, person1_death.date)
-            death2_date = cast(str | None, person2_death.date)
-            if death1_date and death2_date and death1_date == death2_date:
-                reasons.append("same death date")
-                scores.append(1.0)
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if rows:
+            session.execute(insert(DuplicatePair), rows)
+        self.db.mark_reconciled(session, pending_ids)
 
-        # Calculate overall confidence
-        if not scores:
-            return None
+    def _load_life_events(self, session: Session) -> dict[tuple[int, str], Any]:
+        """Load everyone's first birth and death events in one query.
 
-        confidence = sum(scores) / len(scores)
+        Args:
+            session: Database session
 
-        return DuplicateCandidate(
-            person1_id=cast(int, person1.id),
-            person1_name=cast(str, person1.primary_name),
-            person2_id=cast(int, person2.id),
-            person2_name=cast(str, person2.primary_name),
-            confidence=confidence,
-            reasons=reasons,
+        Returns:
+            Rows with ``date`` and ``place``, keyed by (person ID, event type)
+        """
+        rows = session.execute(
+            select(Event.person_id, Event.event_type, Event.date, Event.place)
+            .where(Event.event_type.in_(["birth", "death"]))
+            .order_by(Event.id)
         )
+        life_events: dict[tuple[int, str], Any] = {}
+        for row in rows:
+            life_events.setdefault((row.person_id, row.event_type), row)
+        return life_events
+
+    def _name_matches(
+        self, people: list[Person], pending: list[int]
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Find the pairs involving pending people with names similar enough to match.
 
-    def _get_event(self, person_id: int, event_type: str, session: Session) -> Event | None:
-        """Get an event for a person.
+        The pending people's normalized name variants (primary and alternate
+        names) are scored against everyone's with rapidfuzz's multithreaded
+        ``cdist`` kernel instead of one ``fuzz.ratio`` call per pair in Python.
 
         Args:
-            person_id: Person ID
-            event_type: Event type (birth, death, etc.)
-            session: Database session
+            people: Everyone, with their names loaded
+            pending: Indices into ``people`` of those to pair up with everyone
 
         Returns:
-            Event if found, None otherwise
+            Index arrays (first, second) into ``people`` with first < second,
+            in ascending pair order, and each pair's best name variant score
+            (0-1)
         """
-        return (
-            session.query(Event)
-            .filter(Event.person_id == person_id, Event.event_type == event_type)
-            .first()
+        variants: list[str] = []
+        owners: list[int] = []
+        for index, person in enumerate(people):
+            names = {normalize_name(cast(str, person.primary_name))}
+            names.update(normalize_name(n.name) for n in person.names)
+            variants.extend(names)
+            owners.extend([index] * len(names))
+
+        owner_of = np.asarray(owners, dtype=np.int64)
+        # Rows of the score matrix: the pending people's variants
+        is_pending = np.zeros(len(people), dtype=bool)
+        is_pending[pending] = True
+        pending_variants = np.flatnonzero(is_pending[owner_of])
+        query_variants = [variants[v] for v in pending_variants.tolist()]
+
+        # A little below the threshold; _score_pairs applies the exact one
+        cutoff = self.name_threshold * 100 - 0.01
+        firsts, seconds, scores = [], [], []
+        for start in range(0, len(query_variants), NAME_MATRIX_ROWS):
+            matrix = process.cdist(
+                query_variants[start : start + NAME_MATRIX_ROWS],
+                variants,
+                scorer=fuzz.ratio,
+                score_cutoff=cutoff,
+                dtype=np.float64,
+                workers=-1,
+            )
+            rows, cols = np.nonzero(matrix >= cutoff)
+            row_owner = owner_of[pending_variants[rows + start]]
+            col_owner = owner_of[cols]
+            # Two pending people match each other in both orders; the
+            # dedup below keeps one
+            keep = row_owner != col_owner
+            firsts.append(np.minimum(row_owner, col_owner)[keep])
+            seconds.append(np.maximum(row_owner, col_owner)[keep])
+            scores.append(matrix[rows[keep], cols[keep]])
+
+        if not firsts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty, np.empty(0, dtype=np.float64)
+
+        first = np.concatenate(firsts)
+        second = np.concatenate(seconds)
+        score = np.concatenate(scores)
+
+        # One entry per pair: sort by pair, best score first, keep the first
+        pair_key = first * len(people) + second
+        order = np.lexsort((-score, pair_key))
+        sorted_keys = pair_key[order]
+        best = order[np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))]
+        return first[best], second[best], score[best] / 100.0
+
+    def _score_pairs(
+        self,
+        people: list[Person],
+        life_events: dict[tuple[int, str], Any],
+        first: np.ndarray,
+        second: np.ndarray,
+        variant_scores: np.ndarray,
+    ) -> list[dict[str, Any]]:
+        """Score candidate pairs of people for potential duplication.
+
+        Each signal is computed for all pairs at once over per-person arrays;
+        Python objects are only built for pairs whose names match.
+
+        Args:
+            people: People the pair indices refer to
+            life_events: Birth and death events from :meth:`_load_life_events`
+            first: Index of each pair's first person
+            second: Index of each pair's second person
+            variant_scores: Each pair's best name variant score (0-1)
+
+        Returns:
+            ``DuplicatePair`` rows for the name-matching pairs, in pair order
+        """
+        if len(first) == 0:
+            return []
+
+        def life_event_field(event_type: str, field: str) -> np.ndarray:
+            values = [
+                getattr(life_events.get((cast(int, person.id), event_type)), field, None)
+                for person in people
+            ]
+            return np.asarray(values, dtype=object)
+
+        # Per-person columns
+        primary_names = np.asarray(
+            [normalize_name(cast(str, person.primary_name)) for person in people], dtype=object
+        )
+        birth_dates = life_event_field("birth", "date")
+        birth_places = life_event_field("birth", "place")
+        death_dates = life_event_field("death", "date")
+
+        # Names: the primary names' score if it matches, else the best variant
+        primary_scores = (
+            process.cpdist(
+                primary_names[first].tolist(),
+                primary_names[second].tolist(),
+                scorer=fuzz.ratio,
+                dtype=np.float64,
+                workers=-1,
+            )
+            / 100.0
+        )
+        primary_match = primary_scores >= self.name_threshold
+        name_scores = np.where(primary_match, primary_scores, variant_scores)
+        name_match = primary_match | (variant_scores >= self.name_threshold)
+
+        # Birth dates: same date is a strong match, different dates a strong
+        # signal they're different people
+        has_birth_date = birth_dates.astype(bool)
+        birth_compared = has_birth_date[first] & has_birth_date[second]
+        same_birth = birth_compared & (birth_dates[first] == birth_dates[second])
+
+        # Birth places: fuzzy match, weighted less than names
+        has_birth_place = birth_places.astype(bool)
+        place_compared = has_birth_place[first] & has_birth_place[second]
+        place_scores = np.zeros(len(first), dtype=np.float64)
+        if place_compared.any():
+            lower_places = np.asarray(
+                [place.lower() if place else place for place in birth_places], dtype=object
+            )
+            place_scores[place_compared] = (
+                process.cpdist(
+                    lower_places[first[place_compared]].tolist(),
+                    lower_places[second[place_compared]].tolist(),
+                    scorer=fuzz.ratio,
+                    dtype=np.float64,
+                    workers=-1,
+                )
+                / 100.0
+            )
+        similar_place = place_compared & (place_scores >= 0.8)
+
+        # Death dates: only a match counts
+        has_death_date = death_dates.astype(bool)
+        same_death = (
+            has_death_date[first]
+            & has_death_date[second]
+            & (death_dates[first] == death_dates[second])
         )
+
+        # Overall confidence is the mean of the signals present for each pair
+        total = (
+            name_scores
+            + np.where(same_birth, 1.0, 0.0)
+            + np.where(similar_place, place_scores * 0.8, 0.0)
+            + np.where(same_death, 1.0, 0.0)
+        )
+        signals = 1 + birth_compared.astype(np.int64) + similar_place + same_death
+        confidence = total / signals
+
+        pairs = []
+        for k in np.flatnonzero(name_match).tolist():
+            reasons = [
+                f"name match: {name_scores[k]:.2f}"
+                if primary_match[k]
+                else f"name variant match: {name_scores[k]:.2f}"
+            ]
+            if birth_compared[k]:
+                reasons.append("same birth date" if same_birth[k] else "different birth dates")
+            if similar_place[k]:
+                reasons.append(f"similar birth place: {place_scores[k]:.2f}")
+            if same_death[k]:
+                reasons.append("same death date")
+
+            pairs.append(
+                {
+                    "person1_id": people[first[k]].id,
+                    "person2_id": people[second[k]].id,
+                    "confidence": float(confidence[k]),
+                    "reasons": reasons,
+                }
+            )
+        return pairs
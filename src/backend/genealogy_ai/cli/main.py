@@ -3,30 +3,89 @@
 This module provides the command-line interface for the Genealogy AI project.
 """
 
+import os
+import queue
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from functools import cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TaskID, TextColumn
 from rich.table import Table
 
-from src.backend.genealogy_ai.ingestion.chunking import DocumentChunker
-from src.backend.genealogy_ai.ingestion.ocr import OCRProcessor
-from src.backend.genealogy_ai.storage.chroma import ChromaStore
-from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+# OCR, LangChain, Chroma and the embedding stack take seconds to import, so
+# each command imports only the components it uses
+if TYPE_CHECKING:
+    from src.backend.genealogy_ai.ingestion.chunking import TextChunk
+    from src.backend.genealogy_ai.ingestion.ocr import OCRResult
+    from src.backend.genealogy_ai.storage.chroma import ChromaStore
+    from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
 
 app = typer.Typer(
     name="geneai",
     help="Genealogy AI - Extract genealogical information from historical documents",
     add_completion=False,
+    no_args_is_help=True,
 )
 console = Console()
 
+# File types the OCR processor can ingest (lowercase)
+SUPPORTED_EXTS: frozenset[str] = frozenset(
+    {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".txt"}
+)
+
+
+@cache
+def _open_db(db_path: Path) -> "GenealogyDatabase":
+    from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+
+    return GenealogyDatabase(db_path=db_path)
+
+
+@cache
+def _open_chroma(persist_directory: Path, quantize: bool) -> "ChromaStore":
+    from src.backend.genealogy_ai.storage.chroma import ChromaStore
+
+    return ChromaStore(persist_directory=persist_directory, quantize=quantize)
+
+
+def open_db(db_path: Path) -> "GenealogyDatabase":
+    """Return the database for a path, opening it at most once per process.
+
+    Args:
+        db_path: Path to SQLite database
+
+    Returns:
+        Shared GenealogyDatabase for the resolved path
+    """
+    return _open_db(db_path.resolve())
+
+
+def open_chroma(persist_directory: Path, quantize: bool = False) -> "ChromaStore":
+    """Return the vector store for a directory, opening it at most once per process.
+
+    Loading the embedding model and Chroma index dominates store start-up, so
+    commands invoked repeatedly in one process (scripts, tests) share it.
+
+    Args:
+        persist_directory: Directory for Chroma vector database
+        quantize: Quantize the embedding model to int8 on VNNI-capable CPUs
+
+    Returns:
+        Shared ChromaStore for the resolved directory
+    """
+    return _open_chroma(persist_directory.resolve(), quantize)
+
 
 @app.command()
 def ingest(
     paths: list[Path] = typer.Argument(
-        ..., help="Paths to PDF, image, or text files to ingest (or directories with --recursive)", exists=True
+        ...,
+        help="Paths to PDF, image, or text files to ingest (or directories with --recursive)",
+        exists=True,
     ),
     recursive: bool = typer.Option(
         False, "--recursive", "-r", help="Recursively search directories for supported files"
@@ -38,12 +97,30 @@ def ingest(
     chroma_dir: Path = typer.Option(
         Path("./chroma_db"), "--chroma-dir", help="Directory for Chroma vector database"
     ),
-    chunk_size: int = typer.Option(1000, "--chunk-size", help="Maximum characters per chunk"),
+    chunk_size: int = typer.Option(
+        None, "--chunk-size", help="Maximum characters (or tokens) per chunk"
+    ),
     chunk_overlap: int = typer.Option(
-        200, "--chunk-overlap", help="Character overlap between chunks"
+        None, "--chunk-overlap", help="Character (or token) overlap between chunks"
+    ),
+    token_chunking: bool = typer.Option(
+        False,
+        "--token-chunking",
+        help="Measure chunks in embedding-model tokens so they fit its input window",
     ),
     save_images: bool = typer.Option(False, "--save-images", help="Save extracted page images"),
     dpi: int = typer.Option(300, "--dpi", help="DPI for PDF to image conversion"),
+    workers: int = typer.Option(
+        None, "--workers", "-w", help="Number of parallel OCR processes (default: CPU count)"
+    ),
+    embed_batch_size: int = typer.Option(
+        256, "--embed-batch-size", help="Chunks to accumulate before each vector DB write"
+    ),
+    quantize_embeddings: bool = typer.Option(
+        False,
+        "--quantize-embeddings",
+        help="Run the embedding model in int8 on CPUs with VNNI (faster, slightly different vectors)",
+    ),
 ) -> None:
     """Ingest documents using OCR and store in vector database.
 
@@ -53,19 +130,29 @@ def ingest(
 
     Supported file types: .pdf, .png, .jpg, .jpeg, .tiff, .tif, .bmp, .txt
     """
+    from src.backend.genealogy_ai.ingestion.chunking import (
+        TOKEN_CHUNK_OVERLAP,
+        TOKEN_CHUNK_SIZE,
+        DocumentChunker,
+    )
+    from src.backend.genealogy_ai.ingestion.ocr import OCRProcessor
+
     console.print("\n[bold cyan]Genealogy AI - Document Ingestion[/bold cyan]\n")
 
     # Collect all files to process
     files_to_process: list[Path] = []
-    supported_extensions = {".pdf", ".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp", ".txt"}
 
     for path in paths:
         if path.is_file():
             files_to_process.append(path)
         elif path.is_dir() and recursive:
-            # Recursively find all supported files
-            for ext in supported_extensions:
-                files_to_process.extend(path.rglob(f"*{ext}"))
+            # Recursively find all supported files in a single tree walk
+            for root, _, names in os.walk(path):
+                root_path = Path(root)
+                for name in sorted(names):
+                    file_path = root_path / name
+                    if file_path.suffix.lower() in SUPPORTED_EXTS:
+                        files_to_process.append(file_path)
         elif path.is_dir():
             console.print(
                 f"[yellow]Skipping directory {path} (use --recursive to process directories)[/yellow]"
@@ -79,55 +166,141 @@ def ingest(
 
     # Initialize components
     ocr_processor = OCRProcessor(output_dir=output_dir, save_images=save_images)
-    chunker = DocumentChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
-    chroma_store = ChromaStore(persist_directory=chroma_dir)
-    db = GenealogyDatabase(db_path=db_path)
+    chroma_store = open_chroma(chroma_dir, quantize=quantize_embeddings)
+    if token_chunking:
+        chunker = DocumentChunker(
+            chunk_size=chunk_size or TOKEN_CHUNK_SIZE,
+            chunk_overlap=chunk_overlap if chunk_overlap is not None else TOKEN_CHUNK_OVERLAP,
+            tokenizer_model=chroma_store.embedding_model,
+        )
+    else:
+        chunker = DocumentChunker(
+            chunk_size=chunk_size or 1000,
+            chunk_overlap=chunk_overlap if chunk_overlap is not None else 200,
+        )
+    db = open_db(db_path)
 
     total_chunks = 0
     total_pages = 0
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        for doc_path in files_to_process:
-            task = progress.add_task(f"Processing {doc_path.name}...", total=None)
+    # Vector storage runs on its own thread so OCR of later documents overlaps
+    # with embedding of earlier ones. The bounded queue applies backpressure
+    # when embedding falls behind.
+    embed_queue: queue.Queue[tuple[TaskID, Path, int, list[TextChunk]] | None] = queue.Queue(
+        maxsize=4
+    )
 
+    # Pipeline stages post status changes here instead of updating the progress
+    # display directly; one renderer thread applies the latest status per task
+    status_queue: queue.SimpleQueue[tuple[TaskID, str]] = queue.SimpleQueue()
+    stop_rendering = threading.Event()
+
+    def _set_status(task: TaskID, description: str) -> None:
+        status_queue.put_nowait((task, description))
+
+    def _apply_statuses(progress: Progress) -> None:
+        latest: dict[TaskID, str] = {}
+        while True:
             try:
-                # OCR processing
-                progress.update(task, description="[yellow]OCR: {doc_path.name}")
-                ocr_results = ocr_processor.process_document(doc_path)
-                total_pages += len(ocr_results)
-
-                # Store documents in SQLite
-                progress.update(task, description="[blue]Storing in database...")
-                for ocr_result in ocr_results:
-                    db.add_document(
-                        source=str(ocr_result.source_path),
-                        page=ocr_result.page_number,
-                        ocr_text=ocr_result.text,
+                task, description = status_queue.get_nowait()
+            except queue.Empty:
+                break
+            latest[task] = description
+        for task, description in latest.items():
+            progress.update(task, description=description)
+
+    def _render_statuses(progress: Progress) -> None:
+        while not stop_rendering.wait(0.1):
+            _apply_statuses(progress)
+        _apply_statuses(progress)
+
+    def _store_vectors() -> None:
+        # Chunks are accumulated across documents so each vector DB write embeds
+        # a full batch instead of one small document at a time
+        pending_chunks: list[TextChunk] = []
+        pending_docs: list[tuple[TaskID, Path, int, int]] = []
+
+        def _flush() -> None:
+            try:
+                chroma_store.add_chunks(pending_chunks)
+                for task, doc_path, page_count, chunk_count in pending_docs:
+                    _set_status(
+                        task,
+                        f"[bold green]✓ {doc_path.name} ({page_count} pages, {chunk_count} chunks)",
                     )
+            except Exception as e:
+                for task, doc_path, _, _ in pending_docs:
+                    _set_status(task, f"[bold red]✗ {doc_path.name}: {e!s}")
+                    console.print(f"[red]Error processing {doc_path}: {e!s}[/red]")
+            pending_chunks.clear()
+            pending_docs.clear()
+
+        while (item := embed_queue.get()) is not None:
+            task, doc_path, page_count, chunks = item
+            pending_chunks.extend(chunks)
+            pending_docs.append((task, doc_path, page_count, len(chunks)))
+            if len(pending_chunks) >= embed_batch_size:
+                _flush()
+
+        if pending_docs:
+            _flush()
+
+    with (
+        Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+        ) as progress,
+        ProcessPoolExecutor(max_workers=workers) as ocr_pool,
+        # Only started once a document is long enough to chunk in parallel
+        ProcessPoolExecutor(max_workers=workers) as chunk_pool,
+    ):
+        render_thread = threading.Thread(target=_render_statuses, args=(progress,), daemon=True)
+        render_thread.start()
+        embed_thread = threading.Thread(target=_store_vectors, daemon=True)
+        embed_thread.start()
+
+        # OCR is CPU-bound, so documents are processed in parallel worker processes
+        ocr_futures: dict[Future[list[OCRResult]], tuple[Path, TaskID]] = {}
+        for doc_path in files_to_process:
+            task = progress.add_task(f"[yellow]OCR: {doc_path.name}", total=None)
+            ocr_futures[ocr_pool.submit(ocr_processor.process_document, doc_path)] = (
+                doc_path,
+                task,
+            )
 
-                # Chunk text
-                progress.update(task, description="[magenta]Chunking text...")
-                chunks = chunker.chunk_ocr_results(ocr_results)
-                total_chunks += len(chunks)
+        try:
+            for future in as_completed(ocr_futures):
+                doc_path, task = ocr_futures[future]
 
-                # Store in Chroma
-                progress.update(task, description="[green]Storing in vector DB...")
-                chroma_store.add_chunks(chunks)
+                try:
+                    ocr_results = future.result()
+                    total_pages += len(ocr_results)
 
-                progress.update(
-                    task,
-                    description=f"[bold green]✓ {doc_path.name} "
-                    f"({len(ocr_results)} pages, {len(chunks)} chunks)",
-                )
+                    # Store documents in SQLite
+                    _set_status(task, f"[blue]Storing {doc_path.name}...")
+                    db.add_documents_bulk(
+                        (str(r.source_path), r.page_number, r.text) for r in ocr_results
+                    )
 
-            except Exception as e:
-                progress.update(task, description=f"[bold red]✗ {doc_path.name}: {e!s}")
-                console.print(f"[red]Error processing {doc_path}: {e!s}[/red]")
-                continue
+                    # Chunk text
+                    _set_status(task, f"[magenta]Chunking {doc_path.name}...")
+                    chunks = chunker.chunk_ocr_results_parallel(ocr_results, executor=chunk_pool)
+                    total_chunks += len(chunks)
+
+                    # Hand off to the vector storage thread
+                    _set_status(task, f"[green]Queued {doc_path.name} for vector DB...")
+                    embed_queue.put((task, doc_path, len(ocr_results), chunks))
+
+                except Exception as e:
+                    _set_status(task, f"[bold red]✗ {doc_path.name}: {e!s}")
+                    console.print(f"[red]Error processing {doc_path}: {e!s}[/red]")
+                    continue
+        finally:
+            embed_queue.put(None)
+            embed_thread.join()
+            stop_rendering.set()
+            render_thread.join()
 
     # Display summary
     console.print("\n[bold green]Ingestion Complete![/bold green]\n")
@@ -158,7 +331,7 @@ def stats(
     console.print("\n[bold cyan]Genealogy AI - Database Statistics[/bold cyan]\n")
 
     # SQLite stats
-    db = GenealogyDatabase(db_path=db_path)
+    db = open_db(db_path)
     db_stats = db.get_stats()
 
     table = Table(show_header=True, header_style="bold cyan", title="SQLite Database")
@@ -173,7 +346,7 @@ def stats(
 
     # Chroma stats
     try:
-        chroma_store = ChromaStore(persist_directory=chroma_dir)
+        chroma_store = open_chroma(chroma_dir)
         chroma_stats = chroma_store.get_stats()
 
         table = Table(show_header=True, header_style="bold cyan", title="Vector Database (Chroma)")
@@ -197,11 +370,16 @@ def search(
     chroma_dir: Path = typer.Option(
         Path("./chroma_db"), "--chroma-dir", help="Directory for Chroma vector database"
     ),
+    quantize_embeddings: bool = typer.Option(
+        False,
+        "--quantize-embeddings",
+        help="Run the embedding model in int8 on CPUs with VNNI (faster, slightly different vectors)",
+    ),
 ) -> None:
     """Search the vector database for similar text chunks."""
     console.print(f"\n[bold cyan]Searching for:[/bold cyan] {query}\n")
 
-    chroma_store = ChromaStore(persist_directory=chroma_dir)
+    chroma_store = open_chroma(chroma_dir, quantize=quantize_embeddings)
     results = chroma_store.search(query, k=k)
 
     if not results:
@@ -234,6 +412,7 @@ def extract(
     Requires: OPENAI_API_KEY in .env file
     """
     from src.backend.genealogy_ai.agents.extract_entities import EntityExtractor
+    from src.backend.genealogy_ai.storage.sqlite import Document
 
     console.print("\n[bold cyan]Genealogy AI - Entity Extraction[/bold cyan]\n")
 
@@ -244,21 +423,17 @@ def extract(
         settings.get_api_key()
     except ValueError as e:
         console.print(f"[red]Error: {e}[/red]")
-        console.print(
-            "\n[yellow]Please create a .env file with your OPENAI_API_KEY.[/yellow]"
-        )
+        console.print("\n[yellow]Please create a .env file with your OPENAI_API_KEY.[/yellow]")
         console.print("[dim]Copy .env.example to .env and add your API key.[/dim]\n")
         raise typer.Exit(1) from e
 
     # Initialize components
-    db = GenealogyDatabase(db_path=db_path)
+    db = open_db(db_path)
     extractor = EntityExtractor(model_name=model)
 
     # Get all documents from database
     session = db.get_session()
     try:
-        from src.backend.genealogy_ai.storage.sqlite import Document
-
         query = session.query(Document)
         if limit:
             query = query.limit(limit)
@@ -282,14 +457,17 @@ def extract(
         TextColumn("[progress.description]{task.description}"),
         console=console,
     ) as progress:
-        for doc in documents:
-            task = progress.add_task(f"Extracting from {Path(doc.source).name}...", total=None)
+        # Extract entities from all documents concurrently
+        task = progress.add_task(f"[yellow]Analyzing {len(documents)} document(s)...", total=None)
+        results = extractor.extract_batch(
+            [(doc.ocr_text, doc.source, doc.page) for doc in documents]
+        )
+        progress.update(task, description=f"[bold green]✓ Analyzed {len(documents)} document(s)")
 
-            try:
-                # Extract entities
-                progress.update(task, description=f"[yellow]Analyzing {Path(doc.source).name}...")
-                result = extractor.extract(doc.ocr_text, doc.source, doc.page)
+        for doc, result in zip(documents, results, strict=True):
+            task = progress.add_task(f"Storing {Path(doc.source).name}...", total=None)
 
+            try:
                 if result.is_empty():
                     progress.update(
                         task, description=f"[dim]✓ {Path(doc.source).name} (no entities found)"
@@ -312,9 +490,7 @@ def extract(
                 )
 
             except Exception as e:
-                progress.update(
-                    task, description=f"[bold red]✗ {Path(doc.source).name}: {e!s}"
-                )
+                progress.update(task, description=f"[bold red]✗ {Path(doc.source).name}: {e!s}")
                 console.print(f"[red]Error processing {doc.source}: {e!s}[/red]")
                 continue
 
@@ -342,7 +518,9 @@ def reconcile(
         False, "--auto-approve", help="Automatically approve matches above threshold"
     ),
     auto_threshold: float = typer.Option(
-        1.0, "--auto-threshold", help="Confidence threshold for auto-approval (0.0-1.0, default: 1.0)"
+        1.0,
+        "--auto-threshold",
+        help="Confidence threshold for auto-approval (0.0-1.0, default: 1.0)",
     ),
     min_confidence: float = typer.Option(
         0.6, "--min-confidence", help="Minimum confidence score to show (0.0-1.0)"
@@ -362,7 +540,7 @@ def reconcile(
 
     console.print("\n[bold cyan]Genealogy AI - Duplicate Reconciliation[/bold cyan]\n")
 
-    db = GenealogyDatabase(db_path=db_path)
+    db = open_db(db_path)
     agent = ReconciliationAgent(db=db, min_confidence=min_confidence)
 
     # Find duplicates
@@ -382,15 +560,21 @@ def reconcile(
 
     for i, candidate in enumerate(candidates, 1):
         console.print(f"\n[bold cyan]Duplicate {i}/{len(candidates)}:[/bold cyan]")
-        console.print(f"  Person 1: [blue]{candidate.person1_name}[/blue] (ID: {candidate.person1_id})")
-        console.print(f"  Person 2: [blue]{candidate.person2_name}[/blue] (ID: {candidate.person2_id})")
+        console.print(
+            f"  Person 1: [blue]{candidate.person1_name}[/blue] (ID: {candidate.person1_id})"
+        )
+        console.print(
+            f"  Person 2: [blue]{candidate.person2_name}[/blue] (ID: {candidate.person2_id})"
+        )
         console.print(f"  Confidence: [yellow]{candidate.confidence:.2%}[/yellow]")
         console.print(f"  Reasons: {', '.join(candidate.reasons)}")
 
         # Auto-approve matches at or above threshold if enabled
         is_auto_approved = auto_approve and candidate.confidence >= auto_threshold
         if is_auto_approved:
-            console.print(f"  [green]Auto-approving (confidence {candidate.confidence:.2%} >= {auto_threshold:.2%})...[/green]")
+            console.print(
+                f"  [green]Auto-approving (confidence {candidate.confidence:.2%} >= {auto_threshold:.2%})...[/green]"
+            )
             approve = True
         else:
             # Ask user
@@ -398,9 +582,7 @@ def reconcile(
 
         if approve:
             try:
-                db.merge_people(
-                    keep_id=candidate.person1_id, merge_id=candidate.person2_id
-                )
+                db.merge_people(keep_id=candidate.person1_id, merge_id=candidate.person2_id)
                 console.print(f"  [bold green]✓ Merged into {candidate.person1_name}[/bold green]")
                 merged_count += 1
                 if is_auto_approved:
@@ -432,7 +614,9 @@ def reconcile(
 
 @app.command()
 def tree(
-    person: str = typer.Option(..., "--person", "-p", help="Name of person to show family tree for"),
+    person: str = typer.Option(
+        ..., "--person", "-p", help="Name of person to show family tree for"
+    ),
     db_path: Path = typer.Option(Path("./genealogy.db"), "--db", help="Path to SQLite database"),
 ) -> None:
     """Display family tree for a specific person.
@@ -445,7 +629,7 @@ def tree(
 
     console.print(f"\n[bold cyan]Family Tree for:[/bold cyan] {person}\n")
 
-    db = GenealogyDatabase(db_path=db_path)
+    db = open_db(db_path)
     session = db.get_session()
 
     try:
@@ -469,15 +653,17 @@ def tree(
             target_person = people[0]
 
         # Get events for this person
-        birth_event = session.query(Event).filter(
-            Event.person_id == target_person.id,
-            Event.event_type == "birth"
-        ).first()
+        birth_event = (
+            session.query(Event)
+            .filter(Event.person_id == target_person.id, Event.event_type == "birth")
+            .first()
+        )
 
-        death_event = session.query(Event).filter(
-            Event.person_id == target_person.id,
-            Event.event_type == "death"
-        ).first()
+        death_event = (
+            session.query(Event)
+            .filter(Event.person_id == target_person.id, Event.event_type == "death")
+            .first()
+        )
 
         # Build person info string
         person_info = f"[bold blue]{target_person.primary_name}[/bold blue]"
@@ -494,10 +680,14 @@ def tree(
         tree_root = Tree(person_info)
 
         # Add parents
-        parent_rels = session.query(Relationship).filter(
-            Relationship.source_person_id == target_person.id,
-            Relationship.relationship_type == "parent"
-        ).all()
+        parent_rels = (
+            session.query(Relationship)
+            .filter(
+                Relationship.source_person_id == target_person.id,
+                Relationship.relationship_type == "parent",
+            )
+            .all()
+        )
 
         if parent_rels:
             parents_branch = tree_root.add("[yellow]Parents[/yellow]")
@@ -507,10 +697,14 @@ def tree(
                     parents_branch.add(f"[dim]{parent.primary_name}[/dim]")
 
         # Add spouse(s)
-        spouse_rels = session.query(Relationship).filter(
-            Relationship.source_person_id == target_person.id,
-            Relationship.relationship_type == "spouse"
-        ).all()
+        spouse_rels = (
+            session.query(Relationship)
+            .filter(
+                Relationship.source_person_id == target_person.id,
+                Relationship.relationship_type == "spouse",
+            )
+            .all()
+        )
 
         if spouse_rels:
             spouse_branch = tree_root.add("[magenta]Spouse(s)[/magenta]")
@@ -520,10 +714,14 @@ def tree(
                     spouse_branch.add(f"[dim]{spouse.primary_name}[/dim]")
 
         # Add children
-        child_rels = session.query(Relationship).filter(
-            Relationship.target_person_id == target_person.id,
-            Relationship.relationship_type == "parent"
-        ).all()
+        child_rels = (
+            session.query(Relationship)
+            .filter(
+                Relationship.target_person_id == target_person.id,
+                Relationship.relationship_type == "parent",
+            )
+            .all()
+        )
 
         if child_rels:
             children_branch = tree_root.add("[green]Children[/green]")
@@ -538,9 +736,11 @@ def tree(
 
         # Show source citation
         if target_person.source_document_id:
-            doc = session.query(Document).filter(
-                Document.id == target_person.source_document_id
-            ).first()
+            doc = (
+                session.query(Document)
+                .filter(Document.id == target_person.source_document_id)
+                .first()
+            )
             if doc:
                 console.print(f"[dim]Source: {Path(doc.source).name}, Page {doc.page}[/dim]\n")
 
@@ -567,7 +767,7 @@ def export(
 
     from src.backend.genealogy_ai.storage.sqlite import Event, Person, Relationship
 
-    db = GenealogyDatabase(db_path=db_path)
+    db = open_db(db_path)
     session = db.get_session()
 
     try:
@@ -673,7 +873,7 @@ def export(
 @app.command()
 def version() -> None:
     """Display version information."""
-    from genealogy_ai import __version__
+    from src.backend.genealogy_ai import __version__
 
     console.print(f"\n[bold cyan]Genealogy AI[/bold cyan] version {__version__}\n")
 
@@ -3,15 +3,13 @@
 Loads settings from environment variables and provides validated configuration.
 """
 
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
-# Load .env file if it exists
-load_dotenv()
-
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -40,10 +38,14 @@ class Settings(BaseSettings):
     ollama_base_url: str = "http://localhost:11434"
     ollama_model: str = "llama2"
 
+    # Entity Extraction
+    extract_concurrency: int = 8
+
     # Database Paths
     db_path: Path = Path("./genealogy.db")
     chroma_dir: Path = Path("./chroma_db")
     ocr_output_dir: Path = Path("./ocr_output")
+    extraction_cache_dir: Path = Path("./extraction_cache")
 
     class Config:
         """Pydantic configuration."""
@@ -82,5 +84,17 @@ class Settings(BaseSettings):
         raise ValueError(f"Unknown LLM provider: {self.llm_provider}")
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load the .env file and build the settings, once per process.
+
+    Returns:
+        Shared Settings instance
+    """
+    # Load .env file if it exists
+    load_dotenv()
+    return Settings()
+
+
 # Global settings instance
-settings = Settings()
+settings = get_settings()
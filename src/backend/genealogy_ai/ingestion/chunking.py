@@ -4,18 +4,97 @@ This module chunks OCR text into manageable pieces for embedding and vector stor
 Chunks maintain references to their source documents for traceability.
 """
 
+import hashlib
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-
 from src.backend.genealogy_ai.ingestion.ocr import OCRResult
+from src.backend.genealogy_ai.ingestion.splitter import RecursiveTextSplitter
+
+# Below this many pages, process start-up costs more than chunking in-process
+PARALLEL_CHUNK_THRESHOLD = 8
+
+# Default maximum length of the page summary attached to chunks
+PAGE_SUMMARY_LENGTH = 500
+
+# Token-mode defaults sized for all-MiniLM-L6-v2, which embeds at most 256
+# tokens (including its two special tokens) and silently truncates the rest
+TOKEN_CHUNK_SIZE = 250
+TOKEN_CHUNK_OVERLAP = 32
+
+
+@lru_cache(maxsize=4)
+def token_length_function(model_name: str) -> Callable[[str], int]:
+    """Return a function that measures text in the embedding model's tokens.
+
+    Args:
+        model_name: Sentence-transformers model name (e.g. all-MiniLM-L6-v2)
+
+    Returns:
+        Function returning the token count of a string
+    """
+    from transformers import AutoTokenizer
+
+    repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    tokenizer = AutoTokenizer.from_pretrained(repo_id)
+
+    def _length(text: str) -> int:
+        return len(tokenizer.encode(text, add_special_tokens=False))
+
+    return _length
+
 
+@lru_cache(maxsize=16)
+def _get_text_splitter(
+    chunk_size: int,
+    chunk_overlap: int,
+    separators: tuple[str, ...],
+    tokenizer_model: str | None = None,
+) -> RecursiveTextSplitter:
+    """Return a shared text splitter for the given settings.
 
-@dataclass
+    Splitting keeps no per-call state, so one instance per configuration can be
+    reused by every chunker (and every thread) instead of being rebuilt.
+
+    Args:
+        chunk_size: Maximum characters per chunk
+        chunk_overlap: Number of characters to overlap between chunks
+        separators: Separators to split on, in priority order
+        tokenizer_model: Measure length in this model's tokens instead of characters
+
+    Returns:
+        Configured RecursiveTextSplitter
+    """
+    return RecursiveTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        separators=list(separators),
+        length_function=token_length_function(tokenizer_model) if tokenizer_model else len,
+    )
+
+
+def content_hash(text: str) -> str:
+    """Hash chunk text so identical chunks can share one embedding.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Hex digest of the text
+    """
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass(slots=True)
 class TextChunk:
-    """A chunk of text with source metadata."""
+    """A chunk of text with source metadata.
+
+    Uses ``__slots__`` since large ingests hold one instance per chunk.
+    """
 
     text: str
     source_path: Path
@@ -42,16 +121,20 @@ class DocumentChunker:
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
         separators: list[str] | None = None,
+        tokenizer_model: str | None = None,
     ):
         """Initialize document chunker.
 
         Args:
-            chunk_size: Maximum characters per chunk
-            chunk_overlap: Number of characters to overlap between chunks
+            chunk_size: Maximum characters (or tokens) per chunk
+            chunk_overlap: Number of characters (or tokens) to overlap between chunks
             separators: List of separators to use for splitting (default: paragraph/sentence)
+            tokenizer_model: Embedding model whose tokenizer measures chunk length;
+                when None, length is measured in characters
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.tokenizer_model = tokenizer_model
 
         # Default separators prioritize logical breaks in genealogical documents
         self.separators = separators or [
@@ -63,12 +146,11 @@ class DocumentChunker:
             "",  # Character breaks (fallback)
         ]
 
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            separators=self.separators,
-            length_function=len,
-            is_separator_regex=False,
+    @property
+    def text_splitter(self) -> RecursiveTextSplitter:
+        """Shared splitter for this chunker's settings."""
+        return _get_text_splitter(
+            self.chunk_size, self.chunk_overlap, tuple(self.separators), self.tokenizer_model
         )
 
     def chunk_ocr_result(self, ocr_result: OCRResult) -> list[TextChunk]:
@@ -97,6 +179,7 @@ class DocumentChunker:
                 metadata={
                     "confidence": ocr_result.confidence,
                     "total_chunks": len(chunks),
+                    "content_hash": content_hash(chunk_text),
                     **ocr_result.metadata,
                 },
             )
@@ -120,7 +203,43 @@ class DocumentChunker:
 
         return all_chunks
 
-    def create_page_summary(self, ocr_result: OCRResult, max_length: int = 500) -> str:
+    def chunk_ocr_results_parallel(
+        self,
+        ocr_results: list[OCRResult],
+        workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> list[TextChunk]:
+        """Chunk multiple OCR results across worker processes.
+
+        Chunking is pure-Python CPU work, so threads would serialize on the GIL;
+        large documents are fanned out to processes instead. Small inputs fall
+        back to :meth:`chunk_ocr_results`.
+
+        Args:
+            ocr_results: List of OCR results to chunk
+            workers: Number of worker processes (default: CPU count)
+            executor: Process pool to reuse across calls (default: a new pool
+                of ``workers`` processes for this call)
+
+        Returns:
+            List of all TextChunks from all results, in input order
+        """
+        if len(ocr_results) <= PARALLEL_CHUNK_THRESHOLD:
+            return self.chunk_ocr_results(ocr_results)
+
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                return self.chunk_ocr_results_parallel(ocr_results, executor=pool)
+
+        all_chunks = []
+        for chunks in executor.map(self.chunk_ocr_result, ocr_results):
+            all_chunks.extend(chunks)
+
+        return all_chunks
+
+    def create_page_summary(
+        self, ocr_result: OCRResult, max_length: int = PAGE_SUMMARY_LENGTH
+    ) -> str:
         """Create a summary of a page for context.
 
         Args:
@@ -130,8 +249,22 @@ class DocumentChunker:
         Returns:
             Summary text
         """
-        text = ocr_result.text.strip()
+        return self._summarize(ocr_result.text.strip(), max_length)
 
+    @staticmethod
+    def _summarize(text: str, max_length: int = PAGE_SUMMARY_LENGTH) -> str:
+        """Truncate stripped page text to a summary, preferring a sentence end.
+
+        Only the first ``max_length`` characters of ``text`` are read, so any
+        prefix of the page that is longer than that gives the same summary.
+
+        Args:
+            text: Stripped page text (or a prefix of it)
+            max_length: Maximum length of summary
+
+        Returns:
+            Summary text
+        """
         if len(text) <= max_length:
             return text
 
@@ -161,8 +294,16 @@ class DocumentChunker:
         for ocr_result in ocr_results:
             chunks = self.chunk_ocr_result(ocr_result)
 
-            if include_page_context:
-                page_summary = self.create_page_summary(ocr_result)
+            if include_page_context and chunks:
+                # The first chunk is a prefix of the stripped page, so it gives
+                # the same summary without another pass over the whole page
+                # when it is the whole page or longer than the summary itself
+                first = chunks[0].text
+                if len(chunks) == 1 or len(first) > PAGE_SUMMARY_LENGTH:
+                    page_summary = self._summarize(first)
+                else:
+                    page_summary = self.create_page_summary(ocr_result)
+                # Every chunk references the same string object
                 for chunk in chunks:
                     chunk.metadata["page_summary"] = page_summary
 
@@ -4,18 +4,20 @@ This module handles OCR extraction from PDFs and images using Tesseract.
 It preserves original documents and saves raw OCR output for traceability.
 """
 
-import json
 import logging
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
 import cv2
 import numpy as np
+import orjson
 import pytesseract
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.ai.documentintelligence.models import AnalyzeDocumentRequest, AnalyzeResult
 from azure.core.credentials import AzureKeyCredential
-from pdf2image import convert_from_path
+from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image
 
 logger = logging.getLogger(__name__)
@@ -80,6 +82,7 @@ class OCRProcessor:
         engine: str = "tesseract",
         azure_endpoint: str | None = None,
         azure_key: str | None = None,
+        page_workers: int = 1,
     ):
         """Initialize OCR processor.
 
@@ -90,12 +93,15 @@ class OCRProcessor:
             engine: OCR engine to use ('tesseract' or 'azure')
             azure_endpoint: Azure AI Document Intelligence endpoint
             azure_key: Azure AI Document Intelligence key
+            page_workers: PDF pages rendered and recognized at the same time
+                with Tesseract (each page runs its own tesseract process)
         """
         self.output_dir = output_dir or Path("./ocr_output")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.tesseract_config = tesseract_config
         self.save_images = save_images
         self.engine = engine.lower()
+        self.page_workers = max(1, page_workers)
 
         # Initialize Azure client if needed
         self.azure_client = None
@@ -280,51 +286,98 @@ class OCRProcessor:
         Returns:
             List of OCRResult, one per page
         """
+        return list(self.iter_pdf_pages(pdf_path, dpi=dpi))
+
+    def iter_pdf_pages(self, pdf_path: Path, dpi: int = 300) -> Iterator[OCRResult]:
+        """Extract text from a PDF one page at a time.
+
+        Pages are rendered individually, so only ``page_workers`` page images
+        are held in memory however long the PDF is.
+
+        Args:
+            pdf_path: Path to the PDF file
+            dpi: DPI for PDF to image conversion (higher = better quality)
+
+        Yields:
+            OCRResult for each page, in page order
+        """
         if self.engine == "azure" and self.azure_client:
-            return self._process_azure(pdf_path, [])
+            yield from self._process_azure(pdf_path, [])
+            return
 
-        # Convert PDF pages to images
-        images = convert_from_path(pdf_path, dpi=dpi)
+        total_pages = pdfinfo_from_path(pdf_path)["Pages"]
+        page_numbers = range(1, total_pages + 1)
 
-        results = []
-        for page_num, image in enumerate(images, start=1):
-            # Optionally save the page image
-            if self.save_images:
-                image_output_path = self.output_dir / f"{pdf_path.stem}_page_{page_num}.png"
-                image.save(image_output_path)
-
-            # Preprocess for Tesseract
-            processed_image = self.preprocess_image(image)
-
-            # Extract text with detailed data
-            ocr_data = pytesseract.image_to_data(
-                processed_image, config=self.tesseract_config, output_type=pytesseract.Output.DICT
+        if self.page_workers == 1 or total_pages == 1:
+            for page_num in page_numbers:
+                yield self._process_pdf_page(pdf_path, page_num, total_pages, dpi)
+            return
+
+        # Rendering and Tesseract both run in subprocesses, so worker threads
+        # recognize several pages at once; map still yields in page order
+        pool = ThreadPoolExecutor(
+            max_workers=min(self.page_workers, total_pages), thread_name_prefix="ocr-page"
+        )
+        try:
+            yield from pool.map(
+                lambda page_num: self._process_pdf_page(pdf_path, page_num, total_pages, dpi),
+                page_numbers,
             )
+        finally:
+            # Don't recognize the rest of the PDF if the caller stopped early
+            pool.shutdown(cancel_futures=True)
 
-            # Get full text
-            text = pytesseract.image_to_string(processed_image, config=self.tesseract_config)
+    def _process_pdf_page(
+        self, pdf_path: Path, page_num: int, total_pages: int, dpi: int
+    ) -> OCRResult:
+        """Render and recognize one PDF page with Tesseract.
 
-            # Calculate average confidence
-            confidences = [c for c in ocr_data["conf"] if c != -1]
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        Args:
+            pdf_path: Path to the PDF file
+            page_num: 1-based page number
+            total_pages: Page count of the PDF (recorded in the metadata)
+            dpi: DPI for PDF to image conversion
 
-            result = OCRResult(
-                source_path=pdf_path,
-                page_number=page_num,
-                text=text.strip(),
-                confidence=avg_confidence,
-                metadata={
-                    "image_width": image.size[0],
-                    "image_height": image.size[1],
-                    "total_pages": len(images),
-                    "dpi": dpi,
-                    "engine": "tesseract",
-                    "preprocessed": True,
-                },
-            )
-            results.append(result)
+        Returns:
+            OCRResult for the page
+        """
+        # Convert just this PDF page to an image
+        (image,) = convert_from_path(pdf_path, dpi=dpi, first_page=page_num, last_page=page_num)
+
+        # Optionally save the page image
+        if self.save_images:
+            image_output_path = self.output_dir / f"{pdf_path.stem}_page_{page_num}.png"
+            image.save(image_output_path)
+
+        # Preprocess for Tesseract
+        processed_image = self.preprocess_image(image)
+
+        # Extract text with detailed data
+        ocr_data = pytesseract.image_to_data(
+            processed_image, config=self.tesseract_config, output_type=pytesseract.Output.DICT
+        )
+
+        # Get full text
+        text = pytesseract.image_to_string(processed_image, config=self.tesseract_config)
+
+        # Calculate average confidence
+        confidences = [c for c in ocr_data["conf"] if c != -1]
+        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
 
-        return results
+        return OCRResult(
+            source_path=pdf_path,
+            page_number=page_num,
+            text=text.strip(),
+            confidence=avg_confidence,
+            metadata={
+                "image_width": image.size[0],
+                "image_height": image.size[1],
+                "total_pages": total_pages,
+                "dpi": dpi,
+                "engine": "tesseract",
+                "preprocessed": True,
+            },
+        )
 
     def process_document(self, doc_path: Path) -> list[OCRResult]:
         """Process a document (PDF or image) and save OCR output.
@@ -335,6 +388,23 @@ class OCRProcessor:
         Returns:
             List of OCRResult objects
 
+        Raises:
+            ValueError: If file type is not supported
+        """
+        return list(self.iter_pages(doc_path))
+
+    def iter_pages(self, doc_path: Path) -> Iterator[OCRResult]:
+        """Process a document page by page, saving the OCR output at the end.
+
+        Lets callers start work on early pages while later ones are still
+        being recognized.
+
+        Args:
+            doc_path: Path to the document
+
+        Yields:
+            OCRResult for each page, in page order
+
         Raises:
             ValueError: If file type is not supported
         """
@@ -347,22 +417,25 @@ class OCRProcessor:
         suffix = doc_path.suffix.lower()
 
         if suffix == ".pdf":
-            results = self.process_pdf(doc_path)
+            pages = self.iter_pdf_pages(doc_path)
         elif suffix in {".png", ".jpg", ".jpeg", ".tiff", ".tif", ".bmp"}:
-            results = [self.process_image(doc_path)]
+            pages = iter([self.process_image(doc_path)])
         elif suffix == ".txt":
-            results = [self.process_text_file(doc_path)]
+            pages = iter([self.process_text_file(doc_path)])
         else:
             raise ValueError(
                 f"Unsupported file type: {suffix}. "
                 "Supported types: .pdf, .png, .jpg, .jpeg, .tiff, .tif, .bmp, .txt"
             )
 
+        results = []
+        for result in pages:
+            results.append(result)
+            yield result
+
         # Save raw OCR output as JSON
         self._save_ocr_json(doc_path, results)
 
-        return results
-
     def _save_ocr_json(self, source_path: Path, results: list[OCRResult]) -> Path:
         """Save OCR results to JSON file.
 
@@ -382,8 +455,8 @@ class OCRProcessor:
             "pages": [result.to_dict() for result in results],
         }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Serialize up front and hand the file a single UTF-8 buffer
+        output_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
 
         return output_path
 
@@ -396,7 +469,6 @@ class OCRProcessor:
         Returns:
             List of OCRResult objects
         """
-        with open(json_path, encoding="utf-8") as f:
-            data = json.load(f)
+        data = orjson.loads(Path(json_path).read_bytes())
 
         return [OCRResult.from_dict(page_data) for page_data in data["pages"]]
@@ -0,0 +1,132 @@
+"""Recursive text splitter for chunking OCR output.
+
+This is a drop-in replacement for LangChain's RecursiveCharacterTextSplitter
+(with ``keep_separator=True`` and whitespace stripping) that produces the same
+chunks. Separator patterns are compiled once per splitter, and the merge step
+keeps piece lengths in a deque so the overlap window never re-measures or
+re-slices the pieces it has already seen.
+"""
+
+import re
+from collections import deque
+from collections.abc import Callable
+
+
+class RecursiveTextSplitter:
+    """Split text on a prioritized list of literal separators."""
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 200,
+        separators: list[str] | None = None,
+        length_function: Callable[[str], int] = len,
+    ):
+        """Initialize the splitter.
+
+        Args:
+            chunk_size: Maximum length per chunk
+            chunk_overlap: Length of text shared between consecutive chunks
+            separators: Literal separators in priority order ("" splits characters)
+            length_function: Function used to measure text length
+
+        Raises:
+            ValueError: If chunk_overlap is larger than chunk_size
+        """
+        if chunk_overlap > chunk_size:
+            raise ValueError(
+                f"Got a larger chunk overlap ({chunk_overlap}) than chunk size ({chunk_size})"
+            )
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators or ["\n\n", "\n", " ", ""]
+        self.length_function = length_function
+
+        # Capturing group keeps each separator so it can be re-attached
+        self._patterns = [
+            re.compile(f"({re.escape(sep)})") if sep else None for sep in self.separators
+        ]
+
+    def split_text(self, text: str) -> list[str]:
+        """Split text into chunks.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            List of chunks, each at most chunk_size long where possible
+        """
+        return self._split(text, 0)
+
+    def _split(self, text: str, level: int) -> list[str]:
+        """Recursively split text starting at the given separator level."""
+        # Use the first separator that actually occurs in the text
+        index = len(self.separators) - 1
+        for i in range(level, len(self.separators)):
+            separator = self.separators[i]
+            if not separator or separator in text:
+                index = i
+                break
+
+        splits = self._split_on(text, index)
+
+        final_chunks: list[str] = []
+        good_splits: list[str] = []
+        for split in splits:
+            if self.length_function(split) < self.chunk_size:
+                good_splits.append(split)
+                continue
+
+            if good_splits:
+                final_chunks.extend(self._merge(good_splits))
+                good_splits = []
+            if self.separators[index] and index + 1 < len(self.separators):
+                final_chunks.extend(self._split(split, index + 1))
+            else:
+                final_chunks.append(split)
+
+        if good_splits:
+            final_chunks.extend(self._merge(good_splits))
+
+        return final_chunks
+
+    def _split_on(self, text: str, index: int) -> list[str]:
+        """Split text on one separator, attaching it to the start of the next piece."""
+        pattern = self._patterns[index]
+        if pattern is None:
+            return list(text)
+
+        parts = pattern.split(text)
+        # parts alternates text, separator, text, ...
+        splits = [parts[0]]
+        splits.extend(parts[i] + parts[i + 1] for i in range(1, len(parts) - 1, 2))
+        if len(parts) % 2 == 0:
+            splits.append(parts[-1])
+
+        return [s for s in splits if s]
+
+    def _merge(self, splits: list[str]) -> list[str]:
+        """Greedily merge small pieces into chunks with a sliding overlap."""
+        chunks: list[str] = []
+        window: deque[tuple[str, int]] = deque()
+        total = 0
+
+        for split in splits:
+            length = self.length_function(split)
+            if total + length > self.chunk_size and window:
+                chunk = "".join(piece for piece, _ in window).strip()
+                if chunk:
+                    chunks.append(chunk)
+                # Drop pieces from the front until only the overlap remains
+                while window and (total > self.chunk_overlap or total + length > self.chunk_size):
+                    total -= window.popleft()[1]
+
+            window.append((split, length))
+            total += length
+
+        chunk = "".join(piece for piece, _ in window).strip()
+        if chunk:
+            chunks.append(chunk)
+
+        return chunks
@@ -17,30 +17,22 @@ class PersonExtraction(BaseModel):
     confidence: float = Field(
         ge=0.0, le=1.0, description="Confidence score for this person (0.0-1.0)"
     )
-    notes: str | None = Field(
-        default=None, description="Additional context about this person"
-    )
+    notes: str | None = Field(default=None, description="Additional context about this person")
 
 
 class EventExtraction(BaseModel):
     """A genealogical event (birth, death, marriage, etc.)."""
 
     person_name: str = Field(description="Name of the person this event relates to")
-    event_type: str = Field(
-        description="Type of event: birth, death, marriage, immigration, etc."
-    )
+    event_type: str = Field(description="Type of event: birth, death, marriage, immigration, etc.")
     date: str | None = Field(
         default=None, description="Date as written in the document (not normalized)"
     )
-    place: str | None = Field(
-        default=None, description="Place as written in the document"
-    )
+    place: str | None = Field(default=None, description="Place as written in the document")
     confidence: float = Field(
         ge=0.0, le=1.0, description="Confidence score for this event (0.0-1.0)"
     )
-    notes: str | None = Field(
-        default=None, description="Additional context about this event"
-    )
+    notes: str | None = Field(default=None, description="Additional context about this event")
 
 
 class RelationshipExtraction(BaseModel):
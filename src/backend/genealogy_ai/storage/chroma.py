@@ -4,15 +4,104 @@ This module handles storage and retrieval of document chunks in ChromaDB.
 Used for semantic search over OCR text and genealogical information.
 """
 
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections.abc import Iterable
+from contextlib import closing
 from pathlib import Path
 from typing import Any
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from langchain_chroma import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
 
-from src.backend.genealogy_ai.ingestion.chunking import TextChunk
+from src.backend.genealogy_ai.ingestion.chunking import TextChunk, content_hash
+
+logger = logging.getLogger(__name__)
+
+# Side index of which sources each collection holds, kept next to Chroma's
+# own files so get_stats doesn't have to scan every chunk's metadata. It also
+# holds each collection's write generation, shared by every process using it,
+# and one chunk ID per content hash for reusing stored embeddings.
+SOURCE_INDEX_FILENAME = "source_index.sqlite3"
+SOURCE_INDEX_BACKFILL_PAGE = 5000
+
+
+def cpu_supports_vnni() -> bool:
+    """Check whether the CPU has VNNI instructions for fast int8 matrix math.
+
+    Returns:
+        True if /proc/cpuinfo reports avx512_vnni or avx_vnni
+    """
+    try:
+        cpuinfo = Path("/proc/cpuinfo").read_text()
+    except OSError:
+        return False
+    return "avx512_vnni" in cpuinfo or "avx_vnni" in cpuinfo
+
+
+def chunk_id(chunk: TextChunk) -> str:
+    """Build a deterministic Chroma ID for a chunk.
+
+    Hashes the full source path rather than using its stem, so files with the
+    same name in different directories don't overwrite each other's chunks.
+
+    Args:
+        chunk: Chunk to identify
+
+    Returns:
+        32-character hex digest of (source path, page, chunk index)
+    """
+    digest = hashlib.blake2b(str(chunk.source_path).encode("utf-8"), digest_size=16)
+    digest.update(chunk.page_number.to_bytes(4, "little"))
+    digest.update(chunk.chunk_index.to_bytes(4, "little"))
+    return digest.hexdigest()
+
+
+def default_embedding_device() -> str:
+    """Pick the fastest available device for the embedding model.
+
+    Returns:
+        "cuda" or "mps" when available, otherwise "cpu"
+    """
+    import torch
+
+    if torch.cuda.is_available():
+        return "cuda"
+    if torch.backends.mps.is_available():
+        return "mps"
+    return "cpu"
+
+
+def use_all_cpu_threads() -> None:
+    """Let torch's intra-op pool use every core unless the user configured it.
+
+    Set on torch directly rather than through ``OMP_NUM_THREADS``, so the
+    process environment (inherited by subprocesses such as tesseract) is
+    left alone.
+    """
+    if "OMP_NUM_THREADS" in os.environ:
+        return
+
+    import torch
+
+    torch.set_num_threads(os.cpu_count() or 1)
+
+
+def default_encode_batch_size() -> int:
+    """Pick a SentenceTransformer encode batch size for this machine.
+
+    Larger batches amortize per-call Python overhead; the gain levels off
+    around 64-128 for MiniLM-sized models on CPU.
+
+    Returns:
+        Eight sentences per CPU core, clamped to [32, 128]
+    """
+    return max(32, min(128, (os.cpu_count() or 1) * 8))
 
 
 class ChromaStore:
@@ -23,6 +112,10 @@ class ChromaStore:
         persist_directory: Path | None = None,
         collection_name: str = "genealogy_documents",
         embedding_model: str = "all-MiniLM-L6-v2",
+        batch_size: int = 256,
+        quantize: bool = False,
+        encode_batch_size: int | None = None,
+        device: str | None = None,
     ):
         """Initialize Chroma vector store.
 
@@ -30,17 +123,38 @@ class ChromaStore:
             persist_directory: Directory to persist the database (default: ./chroma_db)
             collection_name: Name of the Chroma collection
             embedding_model: Name of the HuggingFace embedding model
+            batch_size: Maximum chunks embedded and written per batch in add_chunks
+            quantize: Quantize the embedding model's linear layers to int8 when running
+                on a CPU with VNNI support (faster encoding, slightly different vectors)
+            encode_batch_size: Sentences per forward pass of the embedding model
+                (default: scaled to the CPU count)
+            device: Torch device for the embedding model (default: CUDA or MPS
+                when available, otherwise CPU). On CUDA the model runs in FP16.
         """
         self.persist_directory = persist_directory or Path("./chroma_db")
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         self.collection_name = collection_name
+        self.embedding_model = embedding_model
+        self.batch_size = batch_size
+        self.encode_batch_size = encode_batch_size or default_encode_batch_size()
+        self.device = device or default_embedding_device()
+        if self.device == "cpu":
+            use_all_cpu_threads()
 
         # Initialize embeddings
         self.embeddings = HuggingFaceEmbeddings(
             model_name=embedding_model,
-            model_kwargs={"device": "cpu"},
-            encode_kwargs={"normalize_embeddings": True},
+            model_kwargs={"device": self.device},
+            encode_kwargs={
+                "normalize_embeddings": True,
+                "batch_size": self.encode_batch_size,
+            },
         )
+        if self.device == "cuda":
+            # Half precision roughly doubles GPU throughput for MiniLM
+            self.embeddings._client.half()
+        elif quantize and self.device == "cpu":
+            self._quantize_embeddings()
 
         # Initialize Chroma client
         self.client = chromadb.PersistentClient(
@@ -51,48 +165,240 @@ class ChromaStore:
             ),
         )
 
-        # Initialize LangChain Chroma wrapper
-        self.vectorstore = Chroma(
-            client=self.client,
-            collection_name=self.collection_name,
-            embedding_function=self.embeddings,
+        # Embeddings are always computed here, so the collection needs no
+        # embedding function of its own
+        self.collection = self.client.get_or_create_collection(
+            self.collection_name, embedding_function=None
+        )
+        self._init_source_index()
+
+    def _connect_source_index(self) -> sqlite3.Connection:
+        """Open the source index database."""
+        return sqlite3.connect(self.persist_directory / SOURCE_INDEX_FILENAME)
+
+    def _init_source_index(self) -> None:
+        """Create the source index, backfilling it once from an existing collection."""
+        with closing(self._connect_source_index()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunk_sources ("
+                "collection TEXT NOT NULL, source TEXT NOT NULL, "
+                "PRIMARY KEY (collection, source))"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS indexed_collections (collection TEXT PRIMARY KEY)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS collection_generations ("
+                "collection TEXT PRIMARY KEY, generation INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS chunk_hashes ("
+                "collection TEXT NOT NULL, content_hash TEXT NOT NULL, chunk_id TEXT NOT NULL, "
+                "PRIMARY KEY (collection, content_hash))"
+            )
+            indexed = conn.execute(
+                "SELECT 1 FROM indexed_collections WHERE collection = ?",
+                (self.collection_name,),
+            ).fetchone()
+            if indexed:
+                return
+
+            # Collections created before the index existed: scan metadata once
+            offset = 0
+            while True:
+                page = self.collection.get(
+                    include=["metadatas"], limit=SOURCE_INDEX_BACKFILL_PAGE, offset=offset
+                )
+                metadatas = page["metadatas"] or []
+                conn.executemany(
+                    "INSERT OR IGNORE INTO chunk_sources VALUES (?, ?)",
+                    {(self.collection_name, str(meta.get("source", ""))) for meta in metadatas},
+                )
+                if len(page["ids"]) < SOURCE_INDEX_BACKFILL_PAGE:
+                    break
+                offset += SOURCE_INDEX_BACKFILL_PAGE
+
+            conn.execute("INSERT INTO indexed_collections VALUES (?)", (self.collection_name,))
+
+    def _bump_generation(self, conn: sqlite3.Connection) -> None:
+        """Record a write to the collection, in the caller's transaction."""
+        conn.execute(
+            "INSERT INTO collection_generations VALUES (?, 1) "
+            "ON CONFLICT (collection) DO UPDATE SET generation = generation + 1",
+            (self.collection_name,),
+        )
+
+    def generation(self) -> int:
+        """Get the collection's write generation.
+
+        Returns:
+            Counter bumped by every add, delete and reset, from any process
+        """
+        with closing(self._connect_source_index()) as conn:
+            row = conn.execute(
+                "SELECT generation FROM collection_generations WHERE collection = ?",
+                (self.collection_name,),
+            ).fetchone()
+        return row[0] if row else 0
+
+    def _quantize_embeddings(self) -> None:
+        """Dynamically quantize the embedding model to int8 on VNNI-capable CPUs."""
+        if not cpu_supports_vnni():
+            logger.info("CPU lacks VNNI support; keeping FP32 embedding model")
+            return
+
+        import torch
+
+        torch.quantization.quantize_dynamic(
+            self.embeddings._client, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
         )
+        logger.info("Quantized embedding model %s to int8", self.embedding_model)
 
-    def add_chunks(self, chunks: list[TextChunk]) -> list[str]:
+    def add_chunks(self, chunks: list[TextChunk], batch_size: int | None = None) -> list[str]:
         """Add text chunks to the vector store.
 
+        Large inputs are embedded and written in fixed-size batches so memory
+        stays bounded regardless of how many chunks are passed in.
+
         Args:
             chunks: List of TextChunk objects to add
+            batch_size: Chunks per batch (default: the store's batch_size)
 
         Returns:
             List of IDs for the added chunks
         """
-        if not chunks:
-            return []
+        batch_size = batch_size or self.batch_size
+
+        ids: list[str] = []
+        for start in range(0, len(chunks), batch_size):
+            ids.extend(self._add_chunk_batch(chunks[start : start + batch_size]))
+        self._delete_stale_chunks(chunks, set(ids))
+
+        with closing(self._connect_source_index()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO chunk_sources VALUES (?, ?)",
+                {(self.collection_name, str(chunk.source_path)) for chunk in chunks},
+            )
+            self._bump_generation(conn)
+
+        return ids
+
+    def _delete_stale_chunks(self, chunks: list[TextChunk], keep_ids: set[str]) -> None:
+        """Delete chunks of the same pages that an earlier ingest left behind.
+
+        Re-ingesting a page upserts its chunks under the same IDs, but chunks
+        stored under IDs from before ``chunk_id`` hashed the source path, or
+        past the page's new last chunk, would otherwise stay and be retrieved
+        alongside the new ones. Runs after the upsert, so stored embeddings
+        can still be reused for unchanged text.
+
+        Args:
+            chunks: Chunks just added
+            keep_ids: IDs of the chunks just added
+        """
+        pages_by_source: dict[str, set[int]] = {}
+        for chunk in chunks:
+            pages_by_source.setdefault(str(chunk.source_path), set()).add(chunk.page_number)
+
+        stale_ids: list[str] = []
+        for source, pages in pages_by_source.items():
+            existing = self.collection.get(
+                where={"$and": [{"source": source}, {"page": {"$in": sorted(pages)}}]},
+                include=[],
+            )
+            stale_ids.extend(doc_id for doc_id in existing["ids"] if doc_id not in keep_ids)
+        if stale_ids:
+            self.collection.delete(ids=stale_ids)
 
-        # Prepare documents and metadata
+    def _add_chunk_batch(self, chunks: list[TextChunk]) -> list[str]:
+        """Embed and upsert one batch of chunks.
+
+        Args:
+            chunks: Chunks to add
+
+        Returns:
+            List of IDs for the added chunks
+        """
+        # Prepare documents and metadata: gather each field in one pass, then
+        # build the metadata dicts with a single zip
         texts = [chunk.text for chunk in chunks]
+        sources = [str(chunk.source_path) for chunk in chunks]
+        hashes = [content_hash(text) for text in texts]
         metadatas = [
             {
-                "source": str(chunk.source_path),
+                "source": source,
                 "page": chunk.page_number,
                 "chunk_index": chunk.chunk_index,
+                "content_hash": text_hash,
                 **chunk.metadata,
             }
-            for chunk in chunks
+            for chunk, source, text_hash in zip(chunks, sources, hashes, strict=True)
         ]
 
         # Generate IDs based on source, page, and chunk index
-        ids = [
-            f"{chunk.source_path.stem}_p{chunk.page_number}_c{chunk.chunk_index}"
-            for chunk in chunks
-        ]
+        ids = [chunk_id(chunk) for chunk in chunks]
+
+        # Reuse embeddings already stored for identical text (repeated headers,
+        # form fields, re-ingested pages) and only embed what is new
+        embeddings_by_hash = self._stored_embeddings(set(hashes))
 
-        # Add to vector store
-        self.vectorstore.add_texts(texts=texts, metadatas=metadatas, ids=ids)
+        novel = {
+            h: text for h, text in zip(hashes, texts, strict=True) if h not in embeddings_by_hash
+        }
+        if novel:
+            vectors = self.embeddings.embed_documents(list(novel.values()))
+            embeddings_by_hash.update(zip(novel, vectors, strict=True))
+
+        self.collection.upsert(
+            ids=ids,
+            documents=texts,
+            metadatas=metadatas,
+            embeddings=[embeddings_by_hash[h] for h in hashes],
+        )
+
+        with closing(self._connect_source_index()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO chunk_hashes VALUES (?, ?, ?)",
+                [(self.collection_name, h, doc_id) for h, doc_id in zip(hashes, ids, strict=True)],
+            )
 
         return ids
 
+    def _stored_embeddings(self, hashes: set[str]) -> dict[str, list[float]]:
+        """Fetch one stored embedding for each content hash already in the collection.
+
+        Looks up a single chunk per hash in the source index, so the fetch
+        stays bounded however many chunks share the same text. A chunk that
+        has since been deleted or re-stored with different text is skipped,
+        and its hash is embedded again.
+
+        Args:
+            hashes: Content hashes of the texts about to be stored
+
+        Returns:
+            Embedding for each hash that has one stored
+        """
+        with closing(self._connect_source_index()) as conn:
+            rows = conn.execute(
+                "SELECT content_hash, chunk_id FROM chunk_hashes WHERE collection = ? "
+                "AND content_hash IN (SELECT value FROM json_each(?))",
+                (self.collection_name, json.dumps(sorted(hashes))),
+            ).fetchall()
+        if not rows:
+            return {}
+
+        existing = self.collection.get(
+            ids=[doc_id for _, doc_id in rows], include=["metadatas", "embeddings"]
+        )
+        embeddings_by_hash: dict[str, list[float]] = {}
+        existing_embeddings = existing["embeddings"]
+        if existing_embeddings is not None:
+            for metadata, embedding in zip(
+                existing["metadatas"] or [], existing_embeddings, strict=True
+            ):
+                embeddings_by_hash[str(metadata["content_hash"])] = list(embedding)
+        return {h: embeddings_by_hash[h] for h in hashes if h in embeddings_by_hash}
+
     def search(
         self,
         query: str,
@@ -109,17 +415,102 @@ class ChromaStore:
         Returns:
             List of (text, metadata, score) tuples
         """
-        # Use similarity search with score
-        results = self.vectorstore.similarity_search_with_score(
-            query=query, k=k, filter=filter_dict
+        embedding = self.embeddings.embed_query(query)
+        return self.search_by_vector(embedding, k=k, filter_dict=filter_dict)
+
+    def search_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 5,
+        filter_dict: dict[str, Any] | None = None,
+    ) -> list[tuple[str, dict[str, Any], float]]:
+        """Search for chunks similar to an already computed query embedding.
+
+        Args:
+            embedding: Query embedding
+            k: Number of results to return
+            filter_dict: Optional metadata filters
+
+        Returns:
+            List of (text, metadata, distance) tuples, closest first
+        """
+        results = self.collection.query(
+            query_embeddings=[embedding],
+            n_results=k,
+            where=filter_dict,
+            include=["documents", "metadatas", "distances"],
         )
 
-        # Format results
-        formatted_results = [
-            (doc.page_content, doc.metadata, score) for doc, score in results
+        documents = (results["documents"] or [[]])[0]
+        metadatas = (results["metadatas"] or [[]])[0]
+        distances = (results["distances"] or [[]])[0]
+        return [
+            (text or "", dict(metadata or {}), distance)
+            for text, metadata, distance in zip(documents, metadatas, distances, strict=True)
         ]
 
-        return formatted_results
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 5,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        filter_dict: dict[str, Any] | None = None,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Search for chunks that are relevant to the query but not redundant.
+
+        Fetches the fetch_k nearest chunks, then greedily picks the one that
+        best trades off similarity to the query against similarity to the
+        chunks already picked.
+
+        Args:
+            query: Search query
+            k: Number of results to return
+            fetch_k: Number of nearest chunks to choose from
+            lambda_mult: 1.0 ranks purely by relevance, 0.0 purely by diversity
+            filter_dict: Optional metadata filters
+
+        Returns:
+            List of (text, metadata) tuples in selection order
+        """
+        query_vector = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        results = self.collection.query(
+            query_embeddings=[query_vector.tolist()],
+            n_results=fetch_k,
+            where=filter_dict,
+            include=["documents", "metadatas", "embeddings"],
+        )
+
+        candidates = (results["embeddings"] or [[]])[0]
+        if candidates is None or len(candidates) == 0:
+            return []
+        documents = (results["documents"] or [[]])[0]
+        metadatas = (results["metadatas"] or [[]])[0]
+
+        # Normalize once so dot products are cosine similarities, then compute
+        # every similarity MMR needs in a single matrix product
+        matrix = np.ascontiguousarray(candidates, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms > 0, norms, 1.0)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+        sims = matrix @ np.column_stack([query_vector, matrix.T])
+        query_sims, pairwise = sims[:, 0], sims[:, 1:]
+
+        selected: list[int] = []
+        available = np.ones(len(matrix), dtype=bool)
+        max_redundancy = np.full(len(matrix), -np.inf, dtype=np.float32)
+        for _ in range(min(k, len(matrix))):
+            if selected:
+                scores = lambda_mult * query_sims - (1 - lambda_mult) * max_redundancy
+            else:
+                scores = query_sims.copy()
+            scores[~available] = -np.inf
+            best = int(np.argmax(scores))
+            selected.append(best)
+            available[best] = False
+            np.maximum(max_redundancy, pairwise[best], out=max_redundancy)
+
+        return [(documents[i] or "", dict(metadatas[i] or {})) for i in selected]
 
     def search_by_source(
         self, source_path: Path, query: str, k: int = 5
@@ -146,47 +537,66 @@ class ChromaStore:
         Returns:
             List of chunk dictionaries with text and metadata
         """
-        collection = self.client.get_collection(self.collection_name)
-        results = collection.get(where={"source": str(source_path)})
-
-        chunks = []
-        for i, doc_id in enumerate(results["ids"]):
-            chunks.append(
-                {
-                    "id": doc_id,
-                    "text": results["documents"][i] if results["documents"] else "",
-                    "metadata": results["metadatas"][i] if results["metadatas"] else {},
-                }
-            )
+        results = self.collection.get(where={"source": str(source_path)})
+
+        ids = results["ids"]
+        documents = results["documents"] or [""] * len(ids)
+        metadatas = results["metadatas"] or [{}] * len(ids)
 
-        return chunks
+        return [
+            {"id": doc_id, "text": text, "metadata": metadata}
+            for doc_id, text, metadata in zip(ids, documents, metadatas, strict=True)
+        ]
 
-    def delete_by_source(self, source_path: Path) -> int:
-        """Delete all chunks from a specific source document.
+    def delete_by_source(self, source_path: Path, pages: Iterable[int] | None = None) -> int:
+        """Delete chunks from a specific source document.
 
         Args:
             source_path: Path to the source document
+            pages: Only delete chunks from these pages (default: all pages)
 
         Returns:
             Number of chunks deleted
         """
-        collection = self.client.get_collection(self.collection_name)
-        results = collection.get(where={"source": str(source_path)})
+        where: dict[str, Any] = {"source": str(source_path)}
+        if pages is not None:
+            where = {"$and": [where, {"page": {"$in": list(pages)}}]}
+
+        # Only the IDs are needed to delete, so skip fetching documents/metadata
+        results = self.collection.get(where=where, include=[])
 
         if results["ids"]:
-            collection.delete(ids=results["ids"])
-            return len(results["ids"])
+            self.collection.delete(ids=results["ids"])
+
+        with closing(self._connect_source_index()) as conn, conn:
+            if pages is None:
+                conn.execute(
+                    "DELETE FROM chunk_sources WHERE collection = ? AND source = ?",
+                    (self.collection_name, str(source_path)),
+                )
+            if results["ids"]:
+                self._bump_generation(conn)
 
-        return 0
+        return len(results["ids"])
 
     def reset(self) -> None:
         """Reset the entire collection (USE WITH CAUTION)."""
         self.client.delete_collection(self.collection_name)
-        self.vectorstore = Chroma(
-            client=self.client,
-            collection_name=self.collection_name,
-            embedding_function=self.embeddings,
+        self.collection = self.client.get_or_create_collection(
+            self.collection_name, embedding_function=None
         )
+        with closing(self._connect_source_index()) as conn, conn:
+            conn.execute("DELETE FROM chunk_sources WHERE collection = ?", (self.collection_name,))
+            conn.execute("DELETE FROM chunk_hashes WHERE collection = ?", (self.collection_name,))
+            self._bump_generation(conn)
+
+    def count(self) -> int:
+        """Get the number of chunks in the collection.
+
+        Returns:
+            Number of stored chunks
+        """
+        return self.collection.count()
 
     def get_stats(self) -> dict[str, Any]:
         """Get statistics about the vector store.
@@ -194,18 +604,17 @@ class ChromaStore:
         Returns:
             Dictionary with collection statistics
         """
-        collection = self.client.get_collection(self.collection_name)
-        count = collection.count()
+        count = self.collection.count()
 
-        # Get unique sources
-        all_results = collection.get()
-        sources = set()
-        if all_results["metadatas"]:
-            sources = {meta.get("source", "") for meta in all_results["metadatas"]}
+        with closing(self._connect_source_index()) as conn:
+            (unique_sources,) = conn.execute(
+                "SELECT COUNT(*) FROM chunk_sources WHERE collection = ?",
+                (self.collection_name,),
+            ).fetchone()
 
         return {
             "total_chunks": count,
-            "unique_sources": len(sources),
+            "unique_sources": unique_sources,
             "collection_name": self.collection_name,
             "persist_directory": str(self.persist_directory),
         }
@@ -4,27 +4,117 @@ This module defines the database schema and provides access to genealogical fact
 This is the source of truth for extracted information.
 """
 
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from functools import cache
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy import (
+    JSON,
     Column,
+    Engine,
     Float,
     ForeignKey,
+    Index,
     Integer,
+    Select,
     String,
     Text,
     UniqueConstraint,
+    case,
     create_engine,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    or_,
+    select,
+    text,
+    update,
 )
-from sqlalchemy.orm import declarative_base, relationship, sessionmaker
+from sqlalchemy.orm import Session, declarative_base, relationship, selectinload, sessionmaker
 
 if TYPE_CHECKING:
     from src.backend.genealogy_ai.schemas import ExtractionResult
 
 Base = declarative_base()
 
+# Applied to every new SQLite connection. WAL lets readers run alongside the
+# ingest writer, and NORMAL sync only fsyncs at WAL checkpoints.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "temp_store=MEMORY",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+)
+
+# Nullable columns added to existing databases when they are opened. Columns
+# from earlier schema changes are left to migrate_phase1_phase2.py, which
+# tells whether it has run by whether they exist.
+AUTO_ADDED_COLUMNS = (("people", "reconciled_at"),)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, _connection_record: Any) -> None:
+    """Configure a freshly opened SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+    finally:
+        cursor.close()
+
+
+@cache
+def _get_engine(db_path: Path) -> Engine:
+    """Create the engine for a database file, once per process.
+
+    Every GenealogyDatabase for the same file shares this engine and its
+    connection pool, and the schema setup below only runs the first time.
+
+    Args:
+        db_path: Resolved path to the SQLite database file
+
+    Returns:
+        Engine with the schema, columns and indexes in place
+    """
+    # Pooled connections are handed between threads (e.g. asyncio.to_thread
+    # workers), which the sqlite3 module refuses unless told otherwise
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    Base.metadata.create_all(engine)
+    # create_all skips tables that already exist, so add any columns and
+    # indexes introduced since an existing database was created
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table_name, column_name in AUTO_ADDED_COLUMNS:
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            if column_name not in existing:
+                column = Base.metadata.tables[table_name].columns[column_name]
+                column_type = column.type.compile(engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+                )
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for index in table.indexes:
+            # Indexes on columns still awaiting a migration are created by it
+            if all(column.name in existing for column in index.columns):
+                index.create(engine, checkfirst=True)
+    return engine
+
+
+def _utc_now_iso() -> Any:
+    """SQL expression for the current UTC time as an ISO 8601 string.
+
+    Used as a column default so the timestamp is computed inside the INSERT
+    rather than by a Python call per row.
+    """
+    return func.strftime("%Y-%m-%dT%H:%M:%f", "now")
+
 
 class Document(Base):
     """Source document record."""
@@ -36,8 +126,10 @@ class Document(Base):
     source = Column(String, nullable=False)
     page = Column(Integer)
     ocr_text = Column(Text)
-    document_type = Column(String, nullable=True, index=True)  # census, portrait, birth_certificate, etc.
-    created_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    document_type = Column(
+        String, nullable=True, index=True
+    )  # census, portrait, birth_certificate, etc.
+    created_at = Column(String, default=_utc_now_iso())
 
     def __repr__(self) -> str:
         return f"<Document(id={self.id}, source='{self.source}', page={self.page})>"
@@ -53,9 +145,13 @@ class Person(Base):
     notes = Column(Text)
     confidence = Column(Float)
     source_document_id = Column(Integer, ForeignKey("documents.id"))
-    family_name = Column(String, nullable=True, index=True)  # User-defined: "scheldt", "byrnes", etc.
+    family_name = Column(
+        String, nullable=True, index=True
+    )  # User-defined: "scheldt", "byrnes", etc.
     family_side = Column(String, nullable=True)  # Optional: "maternal" or "paternal"
-    created_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    created_at = Column(String, default=_utc_now_iso())
+    # Set once compared for duplicates; cleared when names or events change
+    reconciled_at = Column(String, nullable=True, index=True)
 
     # Relationships
     names = relationship("Name", back_populates="person", cascade="all, delete-orphan")
@@ -71,7 +167,7 @@ class Name(Base):
     __tablename__ = "names"
 
     id = Column(Integer, primary_key=True)
-    person_id = Column(Integer, ForeignKey("people.id"), nullable=False)
+    person_id = Column(Integer, ForeignKey("people.id"), nullable=False, index=True)
     name = Column(String, nullable=False)
     name_type = Column(String)  # birth, married, nickname, variant, etc.
     confidence = Column(Float)
@@ -87,6 +183,8 @@ class Event(Base):
     """Life event (birth, death, marriage, etc.)."""
 
     __tablename__ = "events"
+    # Covers per-person lookups by type (birth/death for the tree views)
+    __table_args__ = (Index("ix_events_person_id_event_type", "person_id", "event_type"),)
 
     id = Column(Integer, primary_key=True)
     person_id = Column(Integer, ForeignKey("people.id"), nullable=False)
@@ -110,8 +208,8 @@ class Relationship(Base):
     __tablename__ = "relationships"
 
     id = Column(Integer, primary_key=True)
-    source_person_id = Column(Integer, ForeignKey("people.id"), nullable=False)
-    target_person_id = Column(Integer, ForeignKey("people.id"), nullable=False)
+    source_person_id = Column(Integer, ForeignKey("people.id"), nullable=False, index=True)
+    target_person_id = Column(Integer, ForeignKey("people.id"), nullable=False, index=True)
     relationship_type = Column(String, nullable=False)  # parent, spouse, child, etc.
     confidence = Column(Float)
     notes = Column(Text)
@@ -136,7 +234,7 @@ class PersonDocument(Base):
     document_id = Column(Integer, ForeignKey("documents.id"), nullable=False)
     link_type = Column(String, nullable=False)  # extracted_from, mentioned_in, portrait_of, etc.
     notes = Column(Text, nullable=True)
-    created_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    created_at = Column(String, default=_utc_now_iso())
 
     def __repr__(self) -> str:
         return (
@@ -147,6 +245,25 @@ class PersonDocument(Base):
         )
 
 
+class DuplicatePair(Base):
+    """Scored pair of possibly duplicate people, kept between reconciliation runs."""
+
+    __tablename__ = "duplicate_candidates"
+
+    id = Column(Integer, primary_key=True)
+    person1_id = Column(Integer, ForeignKey("people.id"), nullable=False, index=True)
+    person2_id = Column(Integer, ForeignKey("people.id"), nullable=False, index=True)
+    confidence = Column(Float, nullable=False)
+    reasons = Column(JSON, nullable=False)  # List of human-readable match reasons
+
+    def __repr__(self) -> str:
+        return (
+            f"<DuplicatePair(person1_id={self.person1_id}, "
+            f"person2_id={self.person2_id}, "
+            f"confidence={self.confidence})>"
+        )
+
+
 class GenealogyDatabase:
     """Database manager for genealogical data."""
 
@@ -157,14 +274,66 @@ class GenealogyDatabase:
             db_path: Path to SQLite database file (default: ./genealogy.db)
         """
         self.db_path = db_path or Path("./genealogy.db")
-        self.engine = create_engine(f"sqlite:///{self.db_path}")
-        Base.metadata.create_all(self.engine)
+        self.engine = _get_engine(self.db_path.resolve())
         self.Session = sessionmaker(bind=self.engine)
 
     def get_session(self):
         """Get a new database session."""
         return self.Session()
 
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Provide a session for a unit of work.
+
+        Commits if the block completes, rolls back if it raises, and always
+        closes the session, returning its connection to the engine's pool.
+
+        Yields:
+            Database session
+        """
+        session = self.Session()
+        try:
+            yield session
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    @staticmethod
+    def mark_unreconciled(session: Session, person_ids: Iterable[int] | Select) -> None:
+        """Queue people for the next reconciliation run.
+
+        Call whenever a person's names or events change, since those are what
+        duplicate detection compares.
+
+        Args:
+            session: Session to run the update in (committed by the caller)
+            person_ids: IDs, or a SELECT of IDs, of the changed people
+        """
+        session.execute(
+            update(Person)
+            .where(Person.id.in_(person_ids), Person.reconciled_at.is_not(None))
+            .values(reconciled_at=None)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def mark_reconciled(session: Session, person_ids: Iterable[int]) -> None:
+        """Record that people have been compared for duplicates.
+
+        Args:
+            session: Session to run the update in (committed by the caller)
+            person_ids: IDs of the people compared
+        """
+        session.execute(
+            update(Person)
+            .where(Person.id.in_(person_ids))
+            .values(reconciled_at=_utc_now_iso())
+            .execution_options(synchronize_session=False)
+        )
+
     def get_document_by_source(self, source: str, page: int | None = None) -> Document | None:
         """Get a document by source path and optional page number.
 
@@ -218,6 +387,63 @@ class GenealogyDatabase:
         finally:
             session.close()
 
+    def add_documents_bulk(
+        self,
+        rows: Iterable[tuple[str, int, str]],
+        skip_if_exists: bool = True,
+        document_type: str | None = None,
+    ) -> list[Document]:
+        """Add many document records in a single transaction.
+
+        Args:
+            rows: (source, page, ocr_text) tuples
+            skip_if_exists: If True, return existing documents instead of re-adding them
+            document_type: Optional type (census, portrait, etc.) to set on every
+                returned document, new or existing
+
+        Returns:
+            Document objects in the same order as ``rows`` (existing or newly created)
+        """
+        rows = list(rows)
+        if not rows:
+            return []
+
+        session = self.Session(expire_on_commit=False)
+        try:
+            existing: dict[tuple[str, int], Document] = {}
+            if skip_if_exists:
+                sources = {source for source, _, _ in rows}
+                for doc in session.query(Document).filter(Document.source.in_(sources)):
+                    existing[(doc.source, doc.page)] = doc
+
+            docs = []
+            existing_ids = set()
+            for source, page, ocr_text in rows:
+                doc = existing.get((source, page))
+                if doc is None:
+                    doc = Document(
+                        source=source, page=page, ocr_text=ocr_text, document_type=document_type
+                    )
+                    session.add(doc)
+                    existing[(source, page)] = doc
+                else:
+                    existing_ids.add(doc.id)
+                docs.append(doc)
+
+            if document_type and existing_ids:
+                # New documents got the type in their INSERT; retype the
+                # existing ones with a single UPDATE
+                session.execute(
+                    update(Document)
+                    .where(Document.id.in_(existing_ids))
+                    .values(document_type=document_type)
+                )
+
+            session.commit()
+            return docs
+        finally:
+            session.close()
+
     def add_person(
         self,
         primary_name: str,
@@ -282,6 +508,7 @@ class GenealogyDatabase:
                 person_id=person_id, name=name, name_type=name_type, confidence=confidence
             )
             session.add(name_obj)
+            self.mark_unreconciled(session, [person_id])
             session.commit()
             session.refresh(name_obj)
             return name_obj
@@ -324,6 +551,7 @@ class GenealogyDatabase:
                 source_document_id=source_document_id,
             )
             session.add(event)
+            self.mark_unreconciled(session, [person_id])
             session.commit()
             session.refresh(event)
             return event
@@ -369,6 +597,100 @@ class GenealogyDatabase:
         finally:
             session.close()
 
+    def _insert_many(
+        self, model: type[Base], rows: list[dict[str, Any]], changes_people: bool = False
+    ) -> int:
+        """Insert many rows of one model with a single executemany and commit.
+
+        Args:
+            model: Mapped class to insert into
+            rows: Column values, one dict per row
+            changes_people: Rows carry a person_id whose person must be
+                reconciled again (names and events)
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        session = self.get_session()
+        try:
+            session.execute(insert(model), rows)
+            if changes_people:
+                self.mark_unreconciled(session, {row["person_id"] for row in rows})
+            session.commit()
+            return len(rows)
+        finally:
+            session.close()
+
+    def add_people_bulk(self, rows: list[dict[str, Any]]) -> list[int]:
+        """Add many person records in a single transaction.
+
+        Args:
+            rows: Person column values (primary_name, notes, confidence, ...)
+
+        Returns:
+            IDs of the new people, in the same order as ``rows``
+        """
+        if not rows:
+            return []
+
+        session = self.get_session()
+        try:
+            ids = session.scalars(
+                insert(Person).returning(Person.id, sort_by_parameter_order=True), rows
+            ).all()
+            session.commit()
+            return list(ids)
+        finally:
+            session.close()
+
+    def add_names_bulk(self, rows: list[dict[str, Any]]) -> int:
+        """Add many alternate names in a single transaction.
+
+        Args:
+            rows: Name column values (person_id, name, name_type, confidence)
+
+        Returns:
+            Number of names added
+        """
+        return self._insert_many(Name, rows, changes_people=True)
+
+    def add_events_bulk(self, rows: list[dict[str, Any]]) -> int:
+        """Add many life events in a single transaction.
+
+        Args:
+            rows: Event column values (person_id, event_type, date, place, ...)
+
+        Returns:
+            Number of events added
+        """
+        return self._insert_many(Event, rows, changes_people=True)
+
+    def add_relationships_bulk(self, rows: list[dict[str, Any]]) -> int:
+        """Add many relationships in a single transaction.
+
+        Args:
+            rows: Relationship column values (source_person_id, target_person_id,
+                relationship_type, ...)
+
+        Returns:
+            Number of relationships added
+        """
+        return self._insert_many(Relationship, rows)
+
+    def add_person_document_links_bulk(self, rows: list[dict[str, Any]]) -> int:
+        """Add many person-document links in a single transaction.
+
+        Args:
+            rows: PersonDocument column values (person_id, document_id, link_type, ...)
+
+        Returns:
+            Number of links added
+        """
+        return self._insert_many(PersonDocument, rows)
+
     def get_person_by_name(self, name: str) -> list[Person]:
         """Search for people by name.
 
@@ -378,18 +700,19 @@ class GenealogyDatabase:
         Returns:
             List of matching Person objects
         """
+        pattern = f"%{name}%"
         session = self.get_session()
         try:
-            # Search both primary names and alternate names
-            people = session.query(Person).filter(Person.primary_name.ilike(f"%{name}%")).all()
-
-            # Also search alternate names
-            name_matches = session.query(Name).filter(Name.name.ilike(f"%{name}%")).all()
-            for name_obj in name_matches:
-                if name_obj.person not in people:
-                    people.append(name_obj.person)
-
-            return people
+            # Search both primary names and alternate names in one query;
+            # primary-name matches come first
+            primary_match = Person.primary_name.ilike(pattern)
+            alternate_match = Person.id.in_(select(Name.person_id).where(Name.name.ilike(pattern)))
+            return (
+                session.query(Person)
+                .filter(or_(primary_match, alternate_match))
+                .order_by(case((primary_match, 0), else_=1), Person.id)
+                .all()
+            )
         finally:
             session.close()
 
@@ -412,44 +735,50 @@ class GenealogyDatabase:
             Dictionary with counts of stored entities
         """
 
-        people_count = 0
-        events_count = 0
-        relationships_count = 0
         name_to_person_id: dict[str, int] = {}
+        # Names, document links, events and relationships are collected and
+        # inserted in bulk
+        name_rows: list[dict[str, Any]] = []
+        link_rows: list[dict[str, Any]] = []
+        event_rows: list[dict[str, Any]] = []
+        relationship_rows: list[dict[str, Any]] = []
+
+        # First pass: Create people and store name mappings. People that may
+        # already exist are created anyway (reconciliation will be Phase 2).
+        person_ids = self.add_people_bulk(
+            [
+                {
+                    "primary_name": person_data.primary_name,
+                    "confidence": person_data.confidence,
+                    "notes": person_data.notes,
+                    "source_document_id": document_id,
+                    "family_name": family_name,
+                    "family_side": family_side,
+                }
+                for person_data in extraction_result.people
+            ]
+        )
+        people_count = len(person_ids)
 
-        # First pass: Create people and store name mappings
-        for person_data in extraction_result.people:
-            # Check if person already exists
-            existing = self.get_person_by_name(person_data.primary_name)
-            if existing:
-                # Person might already exist - for now, create anyway
-                # (reconciliation will be Phase 2)
-                pass
-
-            # Create person with family assignment
-            person = self.add_person(
-                primary_name=person_data.primary_name,
-                confidence=person_data.confidence,
-                notes=person_data.notes,
-                source_document_id=document_id,
-                family_name=family_name,
-                family_side=family_side,
-            )
-            people_count += 1
-            assert person.id is not None  # ID is set after commit
-            person_id = person.id
+        for person_data, person_id in zip(extraction_result.people, person_ids, strict=True):
             name_to_person_id[person_data.primary_name] = person_id
 
             # Create PersonDocument link for this extraction
-            self.add_person_document_link(
-                person_id=person_id,
-                document_id=document_id,
-                link_type="extracted_from",
+            link_rows.append(
+                {
+                    "person_id": person_id,
+                    "document_id": document_id,
+                    "link_type": "extracted_from",
+                }
             )
 
             # Add name variants
-            for variant in person_data.name_variants:
-                self.add_name(person_id, variant)
+            name_rows.extend(
+                {"person_id": person_id, "name": variant} for variant in person_data.name_variants
+            )
+
+        # Variants must be stored before the lookups below can match them
+        self.add_names_bulk(name_rows)
 
         # Second pass: Create events
         for event_data in extraction_result.events:
@@ -474,23 +803,28 @@ class GenealogyDatabase:
                     name_to_person_id[event_data.person_name] = person_id
 
                     # Create PersonDocument link
-                    self.add_person_document_link(
-                        person_id=person_id,
-                        document_id=document_id,
-                        link_type="extracted_from",
+                    link_rows.append(
+                        {
+                            "person_id": person_id,
+                            "document_id": document_id,
+                            "link_type": "extracted_from",
+                        }
                     )
 
             # Create event
-            self.add_event(
-                person_id=person_id,
-                event_type=event_data.event_type,
-                date=event_data.date,
-                place=event_data.place,
-                confidence=event_data.confidence,
-                description=event_data.notes,
-                source_document_id=document_id,
+            event_rows.append(
+                {
+                    "person_id": person_id,
+                    "event_type": event_data.event_type,
+                    "date": event_data.date,
+                    "place": event_data.place,
+                    "confidence": event_data.confidence,
+                    "description": event_data.notes,
+                    "source_document_id": document_id,
+                }
             )
-            events_count += 1
+
+        events_count = self.add_events_bulk(event_rows)
 
         # Third pass: Create relationships
         for rel_data in extraction_result.relationships:
@@ -513,10 +847,12 @@ class GenealogyDatabase:
                     person1_id = person.id
 
                     # Create PersonDocument link
-                    self.add_person_document_link(
-                        person_id=person1_id,
-                        document_id=document_id,
-                        link_type="extracted_from",
+                    link_rows.append(
+                        {
+                            "person_id": person1_id,
+                            "document_id": document_id,
+                            "link_type": "extracted_from",
+                        }
                     )
 
             if not person2_id:
@@ -534,22 +870,28 @@ class GenealogyDatabase:
                     person2_id = person.id
 
                     # Create PersonDocument link
-                    self.add_person_document_link(
-                        person_id=person2_id,
-                        document_id=document_id,
-                        link_type="extracted_from",
+                    link_rows.append(
+                        {
+                            "person_id": person2_id,
+                            "document_id": document_id,
+                            "link_type": "extracted_from",
+                        }
                     )
 
             # Create relationship
-            self.add_relationship(
-                source_person_id=person1_id,
-                target_person_id=person2_id,
-                relationship_type=rel_data.relationship_type,
-                confidence=rel_data.confidence,
-                notes=rel_data.notes,
-                source_document_id=document_id,
+            relationship_rows.append(
+                {
+                    "source_person_id": person1_id,
+                    "target_person_id": person2_id,
+                    "relationship_type": rel_data.relationship_type,
+                    "confidence": rel_data.confidence,
+                    "notes": rel_data.notes,
+                    "source_document_id": document_id,
+                }
             )
-            relationships_count += 1
+
+        relationships_count = self.add_relationships_bulk(relationship_rows)
+        self.add_person_document_links_bulk(link_rows)
 
         return {
             "people": people_count,
@@ -564,69 +906,140 @@ class GenealogyDatabase:
             keep_id: ID of person to keep
             merge_id: ID of person to merge into keep_id (will be deleted)
         """
-        session = self.get_session()
-        try:
-            # Get both people
-            keep_person = session.query(Person).filter(Person.id == keep_id).first()
-            merge_person = session.query(Person).filter(Person.id == merge_id).first()
+        self.merge_people_bulk([(keep_id, merge_id)])
 
-            if not keep_person or not merge_person:
-                raise ValueError("One or both people not found")
+    def merge_people_bulk(self, pairs: Iterable[tuple[int, int]]) -> int:
+        """Merge many pairs of people in a single transaction.
 
-            # Preserve family assignment if keep_person doesn't have one
-            if not keep_person.family_name and merge_person.family_name:
-                keep_person.family_name = merge_person.family_name
-                keep_person.family_side = merge_person.family_side
-
-            # Merge alternate names
-            for name in merge_person.names:
-                # Only add if not already present
-                existing_names = {n.name.lower() for n in keep_person.names}
-                existing_names.add(keep_person.primary_name.lower())
-                if name.name.lower() not in existing_names:
-                    self.add_name(keep_id, name.name)
-
-            # Update all events to point to kept person
-            session.query(Event).filter(Event.person_id == merge_id).update({"person_id": keep_id})
-
-            # Update all relationships
-            session.query(Relationship).filter(Relationship.source_person_id == merge_id).update(
-                {"source_person_id": keep_id}
-            )
+        Chains are followed, so merging (A, B) and then (B, C) folds both B
+        and C into A. Events, relationships and document links are moved
+        with one UPDATE per table, however many pairs there are.
 
-            session.query(Relationship).filter(Relationship.target_person_id == merge_id).update(
-                {"target_person_id": keep_id}
-            )
+        Args:
+            pairs: (keep_id, merge_id) pairs, applied in order
 
-            # Merge PersonDocument links (avoid duplicates)
-            existing_doc_ids = {
-                link.document_id
-                for link in session.query(PersonDocument)
-                .filter(PersonDocument.person_id == keep_id)
-                .all()
+        Returns:
+            Number of people merged away
+
+        Raises:
+            ValueError: If any person in the pairs does not exist
+        """
+        # Resolve each merged person to the person that finally survives
+        survivor: dict[int, int] = {}
+
+        def resolve(person_id: int) -> int:
+            while person_id in survivor:
+                person_id = survivor[person_id]
+            return person_id
+
+        merges: list[tuple[int, int]] = []
+        for keep_id, merge_id in pairs:
+            keep_id, merge_id = resolve(keep_id), resolve(merge_id)
+            if keep_id != merge_id:
+                survivor[merge_id] = keep_id
+                merges.append((keep_id, merge_id))
+
+        if not merges:
+            return 0
+
+        final = {merge_id: resolve(merge_id) for merge_id in survivor}
+        merge_ids = list(final)
+
+        involved_ids = {person_id for pair in merges for person_id in pair}
+
+        with self.session_scope() as session:
+            people = {
+                person.id: person
+                for person in session.query(Person)
+                .options(selectinload(Person.names))
+                .filter(Person.id.in_(involved_ids))
             }
+            if len(people) < len(involved_ids):
+                raise ValueError("One or both people not found")
 
-            merge_links = (
-                session.query(PersonDocument).filter(PersonDocument.person_id == merge_id).all()
+            # Names each surviving person has (lowercased), including ones
+            # copied from people merged into it so far
+            known_names: dict[int, set[str]] = {}
+            for keep_id, merge_id in merges:
+                keep_person, merge_person = people[keep_id], people[merge_id]
+
+                # Preserve family assignment if keep_person doesn't have one
+                if not keep_person.family_name and merge_person.family_name:
+                    keep_person.family_name = merge_person.family_name
+                    keep_person.family_side = merge_person.family_side
+
+                # Copy alternate names to the survivor, skipping ones it
+                # already has
+                target = people[final[merge_id]]
+                existing_names = known_names.setdefault(
+                    target.id,
+                    {n.name.lower() for n in target.names} | {target.primary_name.lower()},
+                )
+                for name in merge_person.names:
+                    if name.name.lower() not in existing_names:
+                        existing_names.add(name.name.lower())
+                        session.add(Name(person_id=target.id, name=name.name))
+
+            # Point events and relationships at the surviving people
+            session.execute(
+                update(Event)
+                .where(Event.person_id.in_(merge_ids))
+                .values(person_id=case(final, value=Event.person_id))
+                .execution_options(synchronize_session=False)
             )
+            for column in (Relationship.source_person_id, Relationship.target_person_id):
+                session.execute(
+                    update(Relationship)
+                    .where(column.in_(merge_ids))
+                    .values({column: case(final, value=column)})
+                    .execution_options(synchronize_session=False)
+                )
 
-            for link in merge_links:
-                if link.document_id not in existing_doc_ids:
-                    # Transfer link to kept person
-                    link.person_id = keep_id
-                else:
-                    # Link already exists for kept person, delete this one
+            # Move document links, dropping ones the survivor already has
+            linked = {
+                (link.person_id, link.document_id)
+                for link in session.query(PersonDocument).filter(
+                    PersonDocument.person_id.in_(set(final.values()))
+                )
+            }
+            for link in session.query(PersonDocument).filter(
+                PersonDocument.person_id.in_(merge_ids)
+            ):
+                key = (final[link.person_id], link.document_id)
+                if key in linked:
                     session.delete(link)
+                else:
+                    link.person_id = key[0]
+                    linked.add(key)
+
+            # Survivors gained names and events; their stored duplicate
+            # pairs are recomputed on the next reconciliation run
+            self.mark_unreconciled(session, set(final.values()))
+
+            # Delete the merged people, their names and duplicate pairs
+            session.flush()
+            session.execute(
+                delete(DuplicatePair)
+                .where(
+                    or_(
+                        DuplicatePair.person1_id.in_(merge_ids),
+                        DuplicatePair.person2_id.in_(merge_ids),
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(
+                delete(Name)
+                .where(Name.person_id.in_(merge_ids))
+                .execution_options(synchronize_session=False)
+            )
+            session.execute(
+                delete(Person)
+                .where(Person.id.in_(merge_ids))
+                .execution_options(synchronize_session=False)
+            )
 
-            # Delete the merged person
-            session.delete(merge_person)
-
-            session.commit()
-        except Exception as e:
-            session.rollback()
-            raise e
-        finally:
-            session.close()
+        return len(merges)
 
     def get_stats(self) -> dict[str, Any]:
         """Get database statistics.
@@ -645,12 +1058,15 @@ class GenealogyDatabase:
         finally:
             session.close()
 
-    def delete_document(self, document_id: int) -> None:
+    def delete_document(self, document_id: int) -> str | None:
         """Delete a document and all entities extracted from it.
 
         Args:
             document_id: ID of the document to delete
 
+        Returns:
+            Source path of the deleted document, or None if it didn't exist
+
         Note:
             This will delete ALL pages of the source document and cascade delete
             people, events, and relationships that reference any page as their source.
@@ -658,16 +1074,17 @@ class GenealogyDatabase:
         session = self.get_session()
         try:
             # Get the document to find its source path
-            doc = session.query(Document).filter(Document.id == document_id).first()
-            if not doc:
+            source = session.query(Document.source).filter(Document.id == document_id).scalar()
+            if source is None:
                 session.commit()
-                return
+                return None
 
-            source_path = str(doc.source)
+            source_path = str(source)
 
             # Get all pages for this document
-            all_pages = session.query(Document).filter(Document.source == source_path).all()
-            all_page_ids = [page.id for page in all_pages]
+            all_page_ids = session.scalars(
+                select(Document.id).where(Document.source == source_path)
+            ).all()
 
             # Delete people that were extracted from ANY page of this document
             people = session.query(Person).filter(Person.source_document_id.in_(all_page_ids)).all()
@@ -676,7 +1093,12 @@ class GenealogyDatabase:
                 # Delete the person (cascades to names and events)
                 session.delete(person)
 
-            # Delete events that reference any page of this document
+            # Delete events that reference any page of this document, first
+            # queueing the people left with fewer events for reconciliation
+            document_events = select(Event.person_id).where(
+                Event.source_document_id.in_(all_page_ids)
+            )
+            self.mark_unreconciled(session, document_events)
             session.query(Event).filter(Event.source_document_id.in_(all_page_ids)).delete()
 
             # Delete relationships that reference any page of this document
@@ -685,10 +1107,12 @@ class GenealogyDatabase:
             ).delete()
 
             # Finally, delete all pages of the document
-            for page in all_pages:
-                session.delete(page)
+            session.query(Document).filter(Document.id.in_(all_page_ids)).delete(
+                synchronize_session=False
+            )
 
             session.commit()
+            return source_path
         except Exception as e:
             session.rollback()
             raise e
@@ -834,6 +1258,24 @@ class GenealogyDatabase:
         finally:
             session.close()
 
+    def tree_fingerprint(self) -> tuple[int | None, ...]:
+        """Fingerprint the family tree tables with cheap aggregates.
+
+        Changes whenever people, names, events or relationships are added or
+        deleted, by any process. Updates in place (e.g. family assignment)
+        leave it unchanged.
+
+        Returns:
+            Row count and highest ID of each table
+        """
+        aggregates = [
+            select(aggregate(model.id)).scalar_subquery()
+            for model in (Person, Name, Event, Relationship)
+            for aggregate in (func.count, func.max)
+        ]
+        with self.session_scope() as session:
+            return tuple(session.execute(select(*aggregates)).one())
+
     def get_people_by_family(self, family_name: str) -> list[Person]:
         """Get all people in a family.
 
@@ -892,6 +1334,7 @@ class GenealogyDatabase:
         session = self.get_session()
         try:
             # Delete in order to respect foreign keys
+            session.query(DuplicatePair).delete()
             session.query(PersonDocument).delete()
             session.query(Relationship).delete()
             session.query(Event).delete()
@@ -0,0 +1,77 @@
+"""App-scoped registry of background processing jobs.
+
+Uploads are processed after the request has returned; handlers record each
+job's progress here and clients poll it by job ID. Jobs are only touched
+from the event loop, so no locking is needed. The registry is in-memory and
+per process.
+"""
+
+import uuid
+from collections import OrderedDict
+from typing import Any
+
+from quart import current_app
+
+# Finished jobs kept for polling; the oldest are dropped beyond this
+JOB_HISTORY = 256
+
+PENDING = "pending"
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+
+def _jobs() -> OrderedDict[str, dict[str, Any]]:
+    """Return the app's job registry, creating it on first use."""
+    return current_app.extensions.setdefault("jobs", OrderedDict())
+
+
+def create_job(**info: Any) -> str:
+    """Register a new pending job.
+
+    Args:
+        **info: Extra fields reported with the job's status (e.g. filename)
+
+    Returns:
+        Job ID
+    """
+    jobs = _jobs()
+    finished = [job_id for job_id, job in jobs.items() if job["status"] in (COMPLETED, FAILED)]
+    for job_id in finished[: max(0, len(finished) - JOB_HISTORY + 1)]:
+        del jobs[job_id]
+
+    job_id = uuid.uuid4().hex
+    jobs[job_id] = {"job_id": job_id, "status": PENDING, **info}
+    return job_id
+
+
+def update_job(job_id: str, **changes: Any) -> None:
+    """Update a job's status fields.
+
+    Args:
+        job_id: Job to update
+        **changes: Fields to set (e.g. status, result, error)
+    """
+    _jobs()[job_id].update(changes)
+
+
+def discard_job(job_id: str) -> None:
+    """Forget a job that was never started.
+
+    Args:
+        job_id: Job to remove
+    """
+    _jobs().pop(job_id, None)
+
+
+def get_job(job_id: str) -> dict[str, Any] | None:
+    """Look up a job.
+
+    Args:
+        job_id: Job ID from :func:`create_job`
+
+    Returns:
+        The job's status fields, or None if unknown (or long finished)
+    """
+    job = _jobs().get(job_id)
+    return dict(job) if job is not None else None
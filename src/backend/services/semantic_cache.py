@@ -0,0 +1,111 @@
+"""Semantic cache for chat answers.
+
+Users often ask the same question again, or a close paraphrase of it. This
+cache keeps the embeddings of recent questions and returns the stored answer
+when a new question is similar enough, skipping retrieval and the LLM call.
+"""
+
+from typing import Any
+
+import numpy as np
+from quart import current_app
+
+
+class SemanticCache:
+    """In-memory LRU cache of answers keyed by question embedding similarity."""
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 256):
+        """Initialize the cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a cached answer to be reused
+            max_entries: Maximum number of cached answers (least recently used evicted)
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors: list[np.ndarray] = []
+        self._payloads: list[dict[str, Any]] = []
+        self._matrix: np.ndarray | None = None
+        self._generation: Any = None
+
+    def clear(self) -> None:
+        """Remove all cached answers."""
+        self._vectors.clear()
+        self._payloads.clear()
+        self._matrix = None
+
+    def lookup(self, embedding: list[float], generation: Any) -> dict[str, Any] | None:
+        """Find a cached answer for a question embedding.
+
+        Args:
+            embedding: Embedding of the incoming question
+            generation: Marker for the current state of the indexed documents;
+                when it changes, every cached answer is discarded
+
+        Returns:
+            Cached payload, or None on a miss
+        """
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+            return None
+
+        if not self._vectors:
+            return None
+
+        if self._matrix is None:
+            self._matrix = np.vstack(self._vectors)
+
+        scores = self._matrix @ self._normalize(embedding)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+
+        # Mark as most recently used
+        self._vectors.append(self._vectors.pop(best))
+        payload = self._payloads.pop(best)
+        self._payloads.append(payload)
+        self._matrix = None
+        return payload
+
+    def add(self, embedding: list[float], payload: dict[str, Any], generation: Any) -> None:
+        """Cache an answer for a question embedding.
+
+        Args:
+            embedding: Embedding of the question
+            payload: Response data to return for similar questions
+            generation: Marker for the state of the indexed documents the answer used
+        """
+        if generation != self._generation:
+            self.clear()
+            self._generation = generation
+
+        self._vectors.append(self._normalize(embedding))
+        self._payloads.append(payload)
+        if len(self._vectors) > self.max_entries:
+            del self._vectors[0]
+            del self._payloads[0]
+        self._matrix = None
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        """Convert an embedding to a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+def get_semantic_cache() -> SemanticCache:
+    """Return the app's shared chat answer cache, creating it on first use.
+
+    Returns:
+        SemanticCache configured from CHAT_CACHE_THRESHOLD and CHAT_CACHE_SIZE
+    """
+    cache = current_app.extensions.get("chat_semantic_cache")
+    if cache is None:
+        cache = SemanticCache(
+            threshold=current_app.config.get("CHAT_CACHE_THRESHOLD", 0.95),
+            max_entries=current_app.config.get("CHAT_CACHE_SIZE", 256),
+        )
+        current_app.extensions["chat_semantic_cache"] = cache
+    return cache
@@ -0,0 +1,87 @@
+"""App-scoped storage instances shared across requests.
+
+Creating a GenealogyDatabase builds a new engine and runs ``create_all``, and
+creating a ChromaStore loads the embedding model, so request handlers fetch
+shared instances from here instead of constructing their own.
+
+Also holds this process's count of in-place family tree updates, which
+cached tree responses are keyed on along with a database fingerprint.
+"""
+
+import threading
+from pathlib import Path
+
+from quart import current_app
+
+from src.backend.genealogy_ai.storage.chroma import ChromaStore
+from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+
+# Handlers may call these from worker threads; only one thread creates each store
+_create_lock = threading.Lock()
+
+
+def get_db() -> GenealogyDatabase:
+    """Return the app's shared database, creating it on first use.
+
+    Returns:
+        GenealogyDatabase for the configured DB_PATH
+    """
+    db = current_app.extensions.get("genealogy_db")
+    if db is None:
+        with _create_lock:
+            db = current_app.extensions.get("genealogy_db")
+            if db is None:
+                db_path = Path(current_app.config.get("DB_PATH", "./genealogy.db"))
+                db = GenealogyDatabase(db_path=db_path)
+                current_app.extensions["genealogy_db"] = db
+    return db
+
+
+def get_chroma_store() -> ChromaStore:
+    """Return the app's shared vector store, creating it on first use.
+
+    Created lazily so the embedding model is only loaded once something needs
+    it, and so handlers can still check whether CHROMA_DIR exists first.
+
+    Returns:
+        ChromaStore for the configured CHROMA_DIR
+    """
+    chroma_store = current_app.extensions.get("chroma_store")
+    if chroma_store is None:
+        with _create_lock:
+            chroma_store = current_app.extensions.get("chroma_store")
+            if chroma_store is None:
+                chroma_dir = Path(current_app.config.get("CHROMA_DIR", "./chroma_db"))
+                chroma_store = ChromaStore(
+                    persist_directory=chroma_dir,
+                    batch_size=current_app.config.get("EMBEDDING_BATCH_SIZE", 256),
+                    encode_batch_size=current_app.config.get("EMBEDDING_ENCODE_BATCH_SIZE"),
+                    quantize=current_app.config.get("EMBEDDING_QUANTIZE", False),
+                )
+                current_app.extensions["chroma_store"] = chroma_store
+    return chroma_store
+
+
+def get_tree_version() -> int:
+    """Return this process's version of the app's family tree data.
+
+    Only covers writes made through this process's handlers. Cached tree
+    responses are also keyed on ``GenealogyDatabase.tree_fingerprint``,
+    which catches inserts and deletes made by the CLI or other server
+    processes, but not their in-place updates.
+
+    Returns:
+        Counter bumped by every handler that writes people, events or
+        relationships
+    """
+    return current_app.extensions.get("tree_version", 0)
+
+
+def bump_tree_version() -> None:
+    """Mark family tree responses cached under the current version as stale.
+
+    Call after the write has been committed, so a response cached in between
+    cannot outlive it.
+    """
+    with _create_lock:
+        current_app.extensions["tree_version"] = get_tree_version() + 1
@@ -37,6 +37,31 @@ interface UploadResponse {
   family_side?: string
 }
 
+interface UploadJob {
+  job_id: string
+  status: 'pending' | 'processing' | 'completed' | 'failed'
+  result?: UploadResponse
+  error?: string
+}
+
+// How often to check on an upload that is processing in the background
+const JOB_POLL_INTERVAL_MS = 1000
+
+// Wait for a background upload job to finish and return its final status
+const waitForJob = async (jobId: string): Promise<UploadJob> => {
+  for (;;) {
+    await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS))
+    const response = await fetch(`/api/upload/jobs/${jobId}`)
+    const job = await response.json()
+    if (!response.ok) {
+      throw new Error(job.error || 'Lost track of upload job')
+    }
+    if (job.status === 'completed' || job.status === 'failed') {
+      return job as UploadJob
+    }
+  }
+}
+
 interface FileProgress {
   name: string
   status: 'pending' | 'uploading' | 'success' | 'error'
@@ -214,7 +239,16 @@ export default function Upload() {
           body: formData,
         })
 
-        const data: UploadResponse = await response.json()
+        let data: UploadResponse = await response.json()
+
+        // New content is processed in the background; wait for the result
+        if (response.status === 202) {
+          const job = await waitForJob((data as any).job_id)
+          if (job.status !== 'completed' || !job.result) {
+            throw new Error(job.error || 'Processing failed')
+          }
+          data = job.result
+        }
 
         if (response.ok && data.success) {
           const stats: string[] = []
@@ -0,0 +1,57 @@
+"""Tests for migrating a phase-1 database opened by the current code."""
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+
+from migrate_phase1_phase2 import migrate_database
+from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+
+# Schema as created before family trees and document linking
+PHASE1_SCHEMA = """
+CREATE TABLE documents (
+    id INTEGER PRIMARY KEY,
+    source VARCHAR NOT NULL,
+    page INTEGER,
+    ocr_text TEXT,
+    created_at VARCHAR,
+    CONSTRAINT _source_page_uc UNIQUE (source, page)
+);
+CREATE TABLE people (
+    id INTEGER PRIMARY KEY,
+    primary_name VARCHAR NOT NULL,
+    notes TEXT,
+    confidence FLOAT,
+    source_document_id INTEGER REFERENCES documents (id),
+    created_at VARCHAR
+);
+INSERT INTO documents (id, source, page, ocr_text) VALUES (1, 'census.pdf', 1, 'text');
+INSERT INTO people (id, primary_name, source_document_id) VALUES (1, 'John Byrne', 1);
+"""
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> set[str]:
+    return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def test_migration_runs_after_opening_phase1_database(tmp_path: Path) -> None:
+    db_path = tmp_path / "genealogy.db"
+    with closing(sqlite3.connect(db_path)) as conn:
+        conn.executescript(PHASE1_SCHEMA)
+
+    # Opening adds only the columns the migration script doesn't manage
+    GenealogyDatabase(db_path)
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert "reconciled_at" in _columns(conn, "people")
+        assert "family_name" not in _columns(conn, "people")
+        assert "document_type" not in _columns(conn, "documents")
+
+    migrate_database(db_path)
+
+    with closing(sqlite3.connect(db_path)) as conn:
+        assert {"family_name", "family_side"} <= _columns(conn, "people")
+        assert "document_type" in _columns(conn, "documents")
+        links = conn.execute(
+            "SELECT person_id, document_id, link_type FROM person_documents"
+        ).fetchall()
+    assert links == [(1, 1, "extracted_from")]
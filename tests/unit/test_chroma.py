@@ -0,0 +1,38 @@
+"""Tests for the Chroma vector store's embedding model setup."""
+
+from types import SimpleNamespace
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.backend.genealogy_ai.storage import chroma  # noqa: E402
+from src.backend.genealogy_ai.storage.chroma import ChromaStore  # noqa: E402
+
+
+def _store_with_model() -> ChromaStore:
+    """Build a store around a tiny model, skipping Chroma and model loading."""
+    store = ChromaStore.__new__(ChromaStore)
+    store.embedding_model = "test-model"
+    store.embeddings = SimpleNamespace(_client=torch.nn.Sequential(torch.nn.Linear(8, 8)))
+    return store
+
+
+def test_quantize_converts_linear_layers_on_vnni_cpu(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(chroma, "cpu_supports_vnni", lambda: True)
+    store = _store_with_model()
+
+    store._quantize_embeddings()
+
+    layer = store.embeddings._client[0]
+    assert isinstance(layer, torch.ao.nn.quantized.dynamic.Linear)
+    assert layer(torch.ones(1, 8)).shape == (1, 8)
+
+
+def test_quantize_keeps_fp32_model_without_vnni(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(chroma, "cpu_supports_vnni", lambda: False)
+    store = _store_with_model()
+
+    store._quantize_embeddings()
+
+    assert type(store.embeddings._client[0]) is torch.nn.Linear
@@ -0,0 +1,97 @@
+"""Tests for reusing stored embeddings of identical chunk text."""
+
+from pathlib import Path
+from typing import Any
+
+import chromadb
+import pytest
+from chromadb.config import Settings
+
+from src.backend.genealogy_ai.ingestion.chunking import TextChunk, content_hash
+from src.backend.genealogy_ai.storage.chroma import ChromaStore
+
+
+class CountingEmbeddings:
+    """Returns a fixed vector per text and records what was embedded."""
+
+    def __init__(self) -> None:
+        self.embedded: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ChromaStore:
+    """Build a store with a real collection, skipping the embedding model."""
+    store = ChromaStore.__new__(ChromaStore)
+    store.persist_directory = tmp_path
+    store.collection_name = "test"
+    store.batch_size = 256
+    store.embeddings = CountingEmbeddings()
+    store.client = chromadb.PersistentClient(
+        path=str(tmp_path), settings=Settings(anonymized_telemetry=False, allow_reset=True)
+    )
+    store.collection = store.client.get_or_create_collection("test", embedding_function=None)
+    store._init_source_index()
+    return store
+
+
+def _chunks(source: str, *texts: str) -> list[TextChunk]:
+    return [
+        TextChunk(text=text, source_path=Path(source), page_number=1, chunk_index=i, metadata={})
+        for i, text in enumerate(texts)
+    ]
+
+
+def test_repeated_text_is_embedded_once(store: ChromaStore) -> None:
+    store.add_chunks(_chunks("a.pdf", "Parish of St. Mary", "John Byrne"))
+    store.add_chunks(_chunks("b.pdf", "Parish of St. Mary", "Mary Byrne"))
+    store.add_chunks(_chunks("c.pdf", "Parish of St. Mary"))
+
+    assert store.embeddings.embedded == ["Parish of St. Mary", "John Byrne", "Mary Byrne"]
+    assert store.count() == 5
+
+
+def test_text_is_embedded_again_after_its_chunk_is_deleted(store: ChromaStore) -> None:
+    store.add_chunks(_chunks("a.pdf", "Parish of St. Mary"))
+    store.delete_by_source(Path("a.pdf"))
+
+    store.add_chunks(_chunks("b.pdf", "Parish of St. Mary"))
+
+    assert store.embeddings.embedded == ["Parish of St. Mary", "Parish of St. Mary"]
+    assert store.count() == 1
+
+
+def test_text_is_embedded_again_after_its_chunk_changes(store: ChromaStore) -> None:
+    store.add_chunks(_chunks("a.pdf", "Parish of St. Mary"))
+    store.add_chunks(_chunks("a.pdf", "Parish of St. Anne"))
+
+    store.add_chunks(_chunks("b.pdf", "Parish of St. Mary"))
+
+    assert store.embeddings.embedded == [
+        "Parish of St. Mary",
+        "Parish of St. Anne",
+        "Parish of St. Mary",
+    ]
+
+
+def test_lookup_fetches_one_row_per_hash(
+    store: ChromaStore, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for i in range(20):
+        store.add_chunks(_chunks(f"{i}.pdf", "Parish of St. Mary"))
+
+    fetched: list[int] = []
+    get = store.collection.get
+
+    def counting_get(*args: Any, **kwargs: Any) -> Any:
+        result = get(*args, **kwargs)
+        fetched.append(len(result["ids"]))
+        return result
+
+    monkeypatch.setattr(store.collection, "get", counting_get)
+    store._stored_embeddings({content_hash("Parish of St. Mary")})
+
+    assert fetched == [1]
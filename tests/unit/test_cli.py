@@ -0,0 +1,44 @@
+"""Tests for CLI options that configure the vector store."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from src.backend.genealogy_ai.cli import main
+from src.backend.genealogy_ai.storage import chroma
+
+
+class FakeChromaStore:
+    """Records how the CLI opens the store instead of loading a model."""
+
+    opened: list[dict[str, Any]] = []
+
+    def __init__(self, **kwargs: Any):
+        self.opened.append(kwargs)
+
+    def search(self, query: str, k: int = 5) -> list[Any]:
+        return []
+
+
+@pytest.fixture
+def fake_store(monkeypatch: pytest.MonkeyPatch) -> Iterator[type[FakeChromaStore]]:
+    monkeypatch.setattr(chroma, "ChromaStore", FakeChromaStore)
+    FakeChromaStore.opened = []
+    main._open_chroma.cache_clear()
+    yield FakeChromaStore
+    main._open_chroma.cache_clear()
+
+
+@pytest.mark.parametrize(("flags", "quantize"), [([], False), (["--quantize-embeddings"], True)])
+def test_search_passes_quantize_option(
+    fake_store: type[FakeChromaStore], tmp_path: Path, flags: list[str], quantize: bool
+) -> None:
+    result = CliRunner().invoke(
+        main.app, ["search", "John Byrne", "--chroma-dir", str(tmp_path), *flags]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert fake_store.opened == [{"persist_directory": tmp_path.resolve(), "quantize": quantize}]
@@ -0,0 +1,67 @@
+"""Tests for how the entity extractor lays out its prompt messages."""
+
+from typing import Any
+
+import langchain_anthropic
+import pytest
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.backend.genealogy_ai.agents import extract_entities
+from src.backend.genealogy_ai.agents.extract_entities import EntityExtractor
+from src.backend.genealogy_ai.config import settings
+from src.backend.genealogy_ai.schemas import ExtractionResult
+
+PAGES = [
+    {"text": "John Byrne, born 1850 in Dublin", "source": "census.pdf", "page": 1},
+    {"text": "Mary Byrne, died 1902", "source": "parish_register.pdf", "page": 7},
+]
+
+
+class StubChatModel:
+    """Records the messages sent for each call instead of calling a provider."""
+
+    def __init__(self, **kwargs: Any):
+        self.calls: list[list[BaseMessage]] = []
+
+    def with_structured_output(self, *args: Any, **kwargs: Any) -> RunnableLambda:
+        def respond(messages: list[BaseMessage]) -> dict[str, Any]:
+            self.calls.append(messages)
+            return {
+                "raw": AIMessage(content=""),
+                "parsed": ExtractionResult(),
+                "parsing_error": None,
+            }
+
+        return RunnableLambda(respond)
+
+
+@pytest.fixture(params=["openai", "anthropic"])
+def extractor(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> EntityExtractor:
+    monkeypatch.setattr(settings, "llm_provider", request.param)
+    monkeypatch.setattr(extract_entities, "ChatOpenAI", StubChatModel)
+    monkeypatch.setattr(langchain_anthropic, "ChatAnthropic", StubChatModel)
+    return EntityExtractor(api_key="test-key", use_cache=False)
+
+
+def test_system_message_is_identical_across_pages(extractor: EntityExtractor) -> None:
+    for page in PAGES:
+        extractor.chain.invoke(page)
+
+    first, second = extractor.llm.calls
+    assert isinstance(first[0], SystemMessage)
+    assert first[0] == second[0]
+    if settings.llm_provider == "anthropic":
+        assert first[0].content[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_page_fields_only_in_human_message(extractor: EntityExtractor) -> None:
+    for page in PAGES:
+        extractor.chain.invoke(page)
+
+    for messages, page in zip(extractor.llm.calls, PAGES, strict=True):
+        system, human = messages
+        assert isinstance(human, HumanMessage)
+        for value in (page["text"], page["source"], f"p.{page['page']}"):
+            assert value in human.content
+            assert value not in str(system.content)
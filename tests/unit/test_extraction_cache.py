@@ -0,0 +1,38 @@
+"""Tests for the on-disk entity extraction cache."""
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from src.backend.genealogy_ai.agents.cache import CachedChain
+from src.backend.genealogy_ai.schemas import ExtractionResult
+
+
+def _cached_chain(cache_dir: Path) -> CachedChain:
+    return CachedChain(RunnableLambda(lambda _: ExtractionResult()), cache_dir, "test")
+
+
+def test_concurrent_writes_of_same_key_all_succeed(tmp_path: Path) -> None:
+    cache = _cached_chain(tmp_path)
+    key = cache.cache_key("John Byrne, born 1850")
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: cache.set(key, ExtractionResult()), range(64)))
+
+    assert cache.get(key) == ExtractionResult()
+    assert [path.name for path in tmp_path.iterdir()] == [f"{key}.json"]
+
+
+def test_failed_write_still_returns_result(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = _cached_chain(tmp_path)
+
+    def fail(*args: Any, **kwargs: Any) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(Path, "replace", fail)
+
+    assert cache.invoke({"text": "John Byrne"}) == ExtractionResult()
+    assert list(tmp_path.iterdir()) == []
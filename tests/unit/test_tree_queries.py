@@ -0,0 +1,85 @@
+"""Tests that family tree queries don't grow with the number of people."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from quart import Quart
+from sqlalchemy import event
+
+from src.backend.api import tree
+from src.backend.genealogy_ai.storage.sqlite import GenealogyDatabase
+
+
+@pytest.fixture(autouse=True)
+def _clear_tree_caches() -> Iterator[None]:
+    tree._full_tree_json.cache_clear()
+    tree._tree_json.cache_clear()
+    yield
+    tree._full_tree_json.cache_clear()
+    tree._tree_json.cache_clear()
+
+
+def _seed(db_path: Path, count: int) -> tuple[GenealogyDatabase, int]:
+    """Create a database of ``count`` people, each the parent of the next.
+
+    Returns:
+        The database and the ID of a person with both a parent and a child
+    """
+    db = GenealogyDatabase(db_path)
+    ids = db.add_people_bulk([{"primary_name": f"Person {i}"} for i in range(count)])
+    db.add_events_bulk(
+        [
+            {"person_id": person_id, "event_type": event_type, "date": "1850"}
+            for person_id in ids
+            for event_type in ("birth", "death")
+        ]
+    )
+    db.add_relationships_bulk(
+        [
+            {"source_person_id": parent, "target_person_id": child, "relationship_type": "parent"}
+            for parent, child in zip(ids, ids[1:], strict=False)
+        ]
+    )
+    return db, ids[1]
+
+
+def _count_statements(db: GenealogyDatabase, build: Any, *args: Any) -> int:
+    statements: list[str] = []
+
+    def record(conn: Any, cursor: Any, statement: str, *_: Any) -> None:
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        assert build(db, ("test",), *args) is not None
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+@pytest.mark.asyncio
+async def test_tree_statement_count_is_constant(tmp_path: Path) -> None:
+    async with Quart(__name__).app_context():
+        small, small_focus = _seed(tmp_path / "small.db", 3)
+        large, large_focus = _seed(tmp_path / "large.db", 50)
+
+        full_counts = [
+            _count_statements(db, tree._full_tree_json, None, None) for db in (small, large)
+        ]
+        focus_counts = [
+            _count_statements(small, tree._tree_json, small_focus, None, None),
+            _count_statements(large, tree._tree_json, large_focus, None, None),
+        ]
+
+    assert full_counts[0] == full_counts[1] <= 3
+    assert focus_counts[0] == focus_counts[1] <= 3
+
+
+@pytest.mark.asyncio
+async def test_tree_for_missing_person_is_none(tmp_path: Path) -> None:
+    async with Quart(__name__).app_context():
+        db, _ = _seed(tmp_path / "genealogy.db", 3)
+
+        assert tree._tree_json(db, ("test",), 999, None, None) is None